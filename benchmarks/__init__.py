@@ -0,0 +1 @@
+"""Offline benchmarks replaying the saved NorthDerbySaves pages. Run from the repo root, e.g. `python -m benchmarks.table_parsing`."""
@@ -0,0 +1,86 @@
+"""
+Benchmark Final.combine_dfs against the previous merge / astype / drop / sort version.
+
+Both run on the parsed NorthDerbySaves classes and on synthetic classes of `--dogs`
+pairs. The previous version is given the results as they used to be parsed (string
+Faults/Time), the current one the typed columns from process_class_df. The last
+column is the typed combine plus the diff of its rows against a previous Final that
+was missing the last `--new` jumping runs, as each refresh does.
+
+Usage:
+    python -m benchmarks.combine
+    python -m benchmarks.combine --dogs 50 200 1000
+"""
+import argparse
+import copy
+import timeit
+from src.core import plaza_R_RO
+from src.core.models import ClassInfo, Final
+from .common import AGILITY_PAGE, JUMPING_PAGE, read_bytes, synthetic_results_page
+
+def merge_combine(jumping_df, agility_df):
+    """The previous combine_dfs: merge on Name, convert with astype, drop columns in place, sort on points."""
+    combined_df = jumping_df.merge(agility_df, on='Name', suffixes=('_jumping', '_agility'))
+    if combined_df['Name'].duplicated().any():
+        raise ValueError("Duplicated names found in combined results")
+    combined_df['Combined_Points'] = combined_df['Rank_jumping'].astype(int) + combined_df['Rank_agility'].astype(int)
+    combined_df['Combined_Faults'] = combined_df['Faults_jumping'].astype(float) + combined_df['Faults_agility'].astype(float)
+    combined_df['Combined_Time'] = combined_df['Time_jumping'].astype(float) + combined_df['Time_agility'].astype(float)
+    combined_df.drop(columns=['Place (mobile)_jumping', 'Place (mobile)_agility', 'KC names_jumping', 'KC names_agility',
+                              'Run Data_jumping', 'Run Data_agility'], inplace=True)
+    return combined_df.sort_values("Combined_Points", ascending=True).reset_index(drop=True)
+
+def parsed_classes(agility_page, jumping_page):
+    agility_class = ClassInfo("Agility", results_url="simulation")
+    jumping_class = ClassInfo("Jumping", results_url="simulation")
+    agility_class.results_df, agility_class.eliminations, agility_class.status = plaza_R_RO.parse_results(agility_page, agility_class)
+    jumping_class.results_df, jumping_class.eliminations, jumping_class.status = plaza_R_RO.parse_results(jumping_page, jumping_class)
+    agility_class.update_order(jumping_class)
+    return agility_class, jumping_class
+
+def as_strings(df):
+    """Results with Faults/Time as text, like the parse stage used to produce."""
+    df = df.copy()
+    df['Faults'] = df['Faults'].map(lambda value: f"{value:g}")
+    df['Time'] = df['Time'].map(lambda value: f"{value:.3f}")
+    return df
+
+def best_ms(func, number=200, repeat=5):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+def report(title, agility_page, jumping_page, new_runs):
+    agility_class, jumping_class = parsed_classes(agility_page, jumping_page)
+    final = Final(jumping_class, agility_class)
+    old_jumping, old_agility = as_strings(jumping_class.results_df), as_strings(agility_class.results_df)
+
+    combined = final.combine_dfs()
+    previous = merge_combine(old_jumping, old_agility)
+    assert sorted(combined['Name']) == sorted(previous['Name']), "combined pairs differ"
+    assert (combined['Combined_Points'].to_numpy() == previous['Combined_Points'].to_numpy()).all(), "points order differs"
+
+    earlier_jumping = copy.copy(jumping_class)
+    earlier_jumping.results_df = jumping_class.results_df.iloc[:-new_runs]
+    earlier = Final(earlier_jumping, agility_class)
+    earlier.combine_dfs()
+    updated = Final(jumping_class, agility_class)
+    assert updated.combine_dfs(earlier).equals(combined), "combine against a previous final differs"
+
+    old = best_ms(lambda: merge_combine(old_jumping, old_agility))
+    new = best_ms(final.combine_dfs)
+    diff = best_ms(lambda: updated.combine_dfs(earlier))
+    print(f"{title:32} {len(combined):6d} {old:9.3f} {new:9.3f} {old / new:8.1f}x {diff:9.3f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dogs", type=int, nargs="*", default=[200, 1000], help="synthetic class sizes")
+    parser.add_argument("--new", type=int, default=3, help="runs new since the previous Final, for the diff")
+    args = parser.parse_args(argv)
+
+    print(f"{'classes':32} {'pairs':>6} {'merge ms':>9} {'typed ms':>9} {'speed-up':>9} {'+diff ms':>9}")
+    report("NorthDerbySaves", read_bytes(AGILITY_PAGE), read_bytes(JUMPING_PAGE), args.new)
+    for dogs in args.dogs:
+        report(f"synthetic, {dogs} dogs", synthetic_results_page(AGILITY_PAGE, dogs, seed=1),
+               synthetic_results_page(JUMPING_PAGE, dogs, seed=2), args.new)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Shared helpers for the benchmarks: timing percentiles, memory measurement and synthetic Plaza pages."""
+import copy
+import gc
+import os
+import random
+import time
+import tracemalloc
+import lxml.html
+
+AGILITY_PAGE = os.path.join("NorthDerbySaves", "NorthDerbyShow_LgeAg_compeleted.html")
+JUMPING_PAGE = os.path.join("NorthDerbySaves", "NorthDerbyShow_LgeJmp_incomplete.html")
+RUNNING_ORDERS_PAGE = os.path.join("NorthDerbySaves", "NorthDerbyRunningOrders_LgeJmp.html")
+SHOW_PAGE = os.path.join("NorthDerbySaves", "NorthDerbyShow_SecondClass.html")
+
+def read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def time_calls(func, iterations, warmup=3):
+    """Call `func` repeatedly and return the latency of each call in milliseconds."""
+    for _ in range(warmup):
+        func()
+    gc.collect()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        func()
+        timings.append((time.perf_counter_ns() - start) / 1e6)
+    return timings
+
+def percentile(timings, pct):
+    """Nearest-rank percentile of a list of timings."""
+    ordered = sorted(timings)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def measure_memory(func):
+    """
+    Run `func` once under tracemalloc.
+
+    Returns:
+        tuple: (peak KiB allocated during the call, number of allocations still live afterwards)
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return peak / 1024, blocks
+
+def stage_report(name, func, iterations):
+    """Time and measure one stage, returning a row for `print_report`."""
+    timings = time_calls(func, iterations)
+    peak_kib, blocks = measure_memory(func)
+    return {
+        "stage": name,
+        "p50": percentile(timings, 50),
+        "p90": percentile(timings, 90),
+        "p99": percentile(timings, 99),
+        "peak_kib": peak_kib,
+        "blocks": blocks,
+    }
+
+def print_report(rows, title=None):
+    if title:
+        print(f"\n== {title} ==")
+    print(f"{'stage':32} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'peak KiB':>10} {'live allocs':>12}")
+    for row in rows:
+        print(f"{row['stage']:32} {row['p50']:9.3f} {row['p90']:9.3f} {row['p99']:9.3f} "
+              f"{row['peak_kib']:10.1f} {row['blocks']:12d}")
+
+def _set_text(cell, text):
+    for child in list(cell):
+        cell.remove(child)
+    cell.text = text
+
+def synthetic_results_page(template_path, dogs, seed=0):
+    """
+    Build a results page with `dogs` placed runs, using a saved page as the template.
+
+    Every page generated for the same number of dogs uses the same pair names
+    ("Handler i & Dog i"), in a different random order for each seed, so an agility
+    and a jumping page combine into a final of `dogs` pairs.
+    """
+    document = lxml.html.fromstring(read_bytes(template_path))
+    table = document.find(".//table")
+    rows = table.xpath(".//tr[count(td) = 7]")
+    template = rows[0]
+    parent = template.getparent()
+    position = parent.index(template)
+    for row in rows:
+        row.getparent().remove(row)
+
+    order = list(range(dogs))
+    random.Random(seed).shuffle(order)
+    for rank, i in enumerate(order, start=1):
+        row = copy.deepcopy(template)
+        faults = (rank * 5 // dogs) * 5
+        texts = [str(rank), str(rank), f"Handler {i} & Dog {i} (Registered Dog {i})",
+                 f"Handler {i} & Dog {i}", "", str(faults), f"{30 + rank * 0.05:.3f}"]
+        for cell, text in zip(row.findall("td"), texts):
+            _set_text(cell, text)
+        parent.insert(position + rank - 1, row)
+    return lxml.html.tostring(document)
+
+def synthetic_running_orders_page(dogs, seed=0):
+    """Running orders page for the pairs of `synthetic_results_page` with the same number of dogs."""
+    document = lxml.html.fromstring(read_bytes(RUNNING_ORDERS_PAGE))
+    table = document.find(".//table")
+    rows = table.xpath(".//tr[count(td) = 2]")
+    template = rows[0]
+    parent = template.getparent()
+    position = parent.index(template)
+    for row in rows:
+        row.getparent().remove(row)
+
+    order = list(range(dogs))
+    random.Random(seed).shuffle(order)
+    for ro, i in enumerate(order, start=1):
+        row = copy.deepcopy(template)
+        for cell, text in zip(row.findall("td"), [str(ro), f"Handler {i} & Dog {i}"]):
+            _set_text(cell, text)
+        parent.insert(position + ro - 1, row)
+    return lxml.html.tostring(document)
@@ -0,0 +1,83 @@
+"""
+Benchmark the cost of debug logging on the update_classInfo path.
+
+Compares the previous inspect-based print_debug with the logging-based one per call,
+then times a full update_classInfo (simulation) with every debug tier enabled (TRACE,
+what the hard-coded flags used to do) against production level (WARNING). Log output
+goes to os.devnull so only the formatting and dispatch cost is measured.
+
+Usage:
+    python -m benchmarks.debug_logging
+"""
+import asyncio
+import contextlib
+import inspect
+import logging
+import os
+import timeit
+import pandas as pd
+from src.core import debug_logger
+from src.core.debug_logger import get_logger, set_level, print_debug3, TRACE
+from src.api import handlers
+from .common import percentile, time_calls
+
+logger = get_logger(__name__)
+
+def inspect_print_debug(*args, **kwargs):
+    """The previous print_debug: resolve the caller module with inspect on every call."""
+    caller_frame = inspect.currentframe().f_back
+    caller_module = inspect.getmodule(caller_frame).__name__
+    print(f"({caller_module})", *args, **kwargs)
+
+@contextlib.contextmanager
+def log_to_devnull():
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        handlers_ = [h for name in debug_logger._ROOT_LOGGERS for h in logging.getLogger(name).handlers]
+        streams = [h.setStream(devnull) for h in handlers_]
+        try:
+            yield
+        finally:
+            for h, stream in zip(handlers_, streams):
+                h.setStream(stream)
+
+def per_call_ns(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e9
+
+def main(iterations=30):
+    df = pd.DataFrame({"Name": [f"Handler {i} & Dog {i}" for i in range(50)], "Place": range(50)})
+    url = "https://www.agilityplaza.com/agilityClass/1263911657/results"
+    # (name, level, call, calls per timing)
+    cases = [
+        ("inspect print_debug", "TRACE", lambda: inspect_print_debug(f"Fetching results from URL: {url}"), 2000),
+        ("print_debug3 shim", "TRACE", lambda: print_debug3(f"Fetching results from URL: {url}"), 2000),
+        ("logger.log", "TRACE", lambda: logger.log(TRACE, "Fetching results from URL: %s", url), 2000),
+        ("print_debug3 shim, DataFrame", "WARNING", lambda: print_debug3("Results DataFrame:\n", df.head()), 2000),
+        ("print_debug3 shim", "WARNING", lambda: print_debug3(f"Fetching results from URL: {url}"), 20000),
+        ("logger.log", "WARNING", lambda: logger.log(TRACE, "Fetching results from URL: %s", url), 20000),
+    ]
+    rows = []
+    with log_to_devnull():
+        for name, level, func, number in cases:
+            set_level(level)
+            rows.append((name, level, per_call_ns(func, number)))
+    print(f"{'call':32} {'level':>8} {'ns/call':>10}")
+    for name, level, ns in rows:
+        print(f"{name:32} {level:>8} {ns:10.0f}")
+
+    loop = asyncio.new_event_loop()
+    update = lambda: loop.run_until_complete(handlers.update_classInfo("1263911657", "1799909160", simulation=True))
+    rows = []
+    for level in ("TRACE", "DEBUG", "WARNING"):
+        set_level(level)
+        with log_to_devnull():
+            timings = time_calls(update, iterations)
+        rows.append((level, percentile(timings, 50), percentile(timings, 90)))
+    loop.close()
+    set_level(debug_logger.LOG_LEVEL)
+
+    print(f"\n{'update_classInfo (simulation)':32} {'p50 ms':>9} {'p90 ms':>9}")
+    for level, p50, p90 in rows:
+        print(f"{'level ' + level:32} {p50:9.3f} {p90:9.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark the hot path of a /api/final refresh, stage by stage, from the saved NorthDerbySaves pages.
+
+Stages: find_champ_classes, import_results, import_running_orders, Final.combine_dfs,
+required_places and the full update_classInfo in simulation mode. Each stage reports latency percentiles, peak
+memory and live allocations. `--dogs` replays synthetic classes of that size built from the
+saved pages instead, so regressions on big classes show up before show day.
+
+Usage:
+    python -m benchmarks.hot_path
+    python -m benchmarks.hot_path --dogs 50 200 1000 2000 --iterations 20
+"""
+import argparse
+import asyncio
+from unittest import mock
+from bs4 import BeautifulSoup
+from src.core import plaza_R_RO, plaza_scraper
+from src.core.models import ClassInfo, Final
+from src.core.requirements import required_places
+from src.api import handlers
+from .common import (
+    AGILITY_PAGE, JUMPING_PAGE, RUNNING_ORDERS_PAGE, SHOW_PAGE,
+    read_bytes, stage_report, print_report,
+    synthetic_results_page, synthetic_running_orders_page,
+)
+
+def load_pages(dogs=None):
+    """Page contents for one run: the saved pages, or synthetic pages of `dogs` pairs."""
+    if dogs is None:
+        return {
+            "Agility": read_bytes(AGILITY_PAGE),
+            "Jumping": read_bytes(JUMPING_PAGE),
+            "running_orders": read_bytes(RUNNING_ORDERS_PAGE),
+        }
+    return {
+        "Agility": synthetic_results_page(AGILITY_PAGE, dogs, seed=1),
+        "Jumping": synthetic_results_page(JUMPING_PAGE, dogs, seed=2),
+        "running_orders": synthetic_running_orders_page(dogs, seed=3),
+    }
+
+def run_stages(pages, iterations):
+    agility_class = ClassInfo("Agility", results_url="simulation")
+    jumping_class = ClassInfo("Jumping", results_url="simulation", running_orders_url="simulation")
+
+    def combine():
+        final = Final(jumping_class, agility_class)
+        return final.combine_dfs()
+
+    agility_class.results_df, agility_class.eliminations, agility_class.status = plaza_R_RO.parse_results(pages["Agility"], agility_class)
+    jumping_class.results_df, jumping_class.eliminations, jumping_class.status = plaza_R_RO.parse_results(pages["Jumping"], jumping_class)
+    agility_class.update_order(jumping_class)
+    running_orders_df = plaza_R_RO.parse_running_orders(pages["running_orders"], jumping_class)
+
+    loop = asyncio.new_event_loop()
+    def update():
+        return loop.run_until_complete(handlers.update_classInfo("1263911657", "1799909160", simulation=True))
+
+    show_soup = BeautifulSoup(read_bytes(SHOW_PAGE), "html.parser")
+    rows = [
+        stage_report("find_champ_classes", lambda: plaza_scraper.find_champ_classes(show_soup, "Lge"), iterations),
+        stage_report("import_results (agility)", lambda: plaza_R_RO.parse_results(pages["Agility"], agility_class), iterations),
+        stage_report("import_results (jumping)", lambda: plaza_R_RO.parse_results(pages["Jumping"], jumping_class), iterations),
+        stage_report("import_running_orders", lambda: plaza_R_RO.parse_running_orders(pages["running_orders"], jumping_class), iterations),
+        stage_report("Final.combine_dfs", combine, iterations),
+        stage_report("required_places", lambda: required_places(agility_class.results_df, jumping_class.results_df,
+                                                                running_orders_df, jumping_class.eliminations), iterations),
+    ]
+    # Serve the pages of this run to the simulation readers used by update_classInfo
+    with mock.patch.object(plaza_R_RO, "_read_results_simulation", lambda show_class: pages[show_class.class_type]), \
+         mock.patch.object(plaza_R_RO, "_read_running_orders_simulation", lambda show_class: pages["running_orders"]):
+        rows.append(stage_report("update_classInfo (simulation)", update, iterations))
+    loop.close()
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dogs", type=int, nargs="*", help="synthetic class sizes to replay instead of the saved pages")
+    parser.add_argument("--iterations", type=int, default=50, help="timed calls per stage")
+    args = parser.parse_args(argv)
+
+    if not args.dogs:
+        print_report(run_stages(load_pages(), args.iterations), "NorthDerbySaves pages")
+    for dogs in args.dogs or []:
+        print_report(run_stages(load_pages(dogs), args.iterations), f"synthetic class, {dogs} dogs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark "where has this dog placed": a pandas scan of the archived runs against the NameIndex.
+
+A synthetic season of `--classes` championship classes of 60 runs each, drawn from a
+pool of pairs, is indexed into a temporary NameIndex. Each query is a prefix of a
+handler or dog name.
+
+Usage:
+    python -m benchmarks.name_search
+    python -m benchmarks.name_search --classes 200 1000 --queries 200
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from src.io.name_index import NameIndex
+from src.core.archive_queries import handler_names
+
+FIRST = ["Max", "Mike", "Sharon", "Anthony", "Caroline", "Becca", "Tracy", "Jessica", "Alice", "Amy", "Helen", "Jo"]
+LAST = ["Glover", "Bendell", "Banks", "Clarke", "Godfrey", "Middleton", "Moerel", "Smith", "Walford", "Challis", "Ross"]
+DOGS = ["Sushi", "Falcon", "Class", "Hustle", "Jude", "Nettle", "Kudos", "Elsie", "Pilot", "Royce", "Neon", "Rex", "Fizz"]
+
+def season_runs(classes, runs_per_class=60, pairs=1500, seed=0):
+    """Archive-format runs of `classes` synthetic classes."""
+    rng = random.Random(seed)
+    pool = [f"{rng.choice(FIRST)} {rng.choice(LAST)}{i % 7 or ''} & {rng.choice(DOGS)}{i % 5 or ''}" for i in range(pairs)]
+    frames = []
+    for c in range(classes):
+        names = rng.sample(pool, runs_per_class)
+        eliminated = np.arange(runs_per_class) >= runs_per_class - 8
+        frames.append(pd.DataFrame({
+            "season": 2025, "height": rng.choice(["Sml", "Med", "Int", "Lge"]), "show": f"show {c // 8}",
+            "date": pd.Timestamp("2025-03-01") + pd.Timedelta(days=int(c // 8)), "class_id": str(10000 + c),
+            "class_type": rng.choice(["Agility", "Jumping"]), "results_url": None,
+            "rank": pd.array([None if e else i + 1 for i, e in enumerate(eliminated)], dtype="Int64"),
+            "name": names, "kc_name": [f"{n} (Kennel {n.split(' & ')[1]})" for n in names],
+            "faults": np.where(eliminated, np.nan, 0.0), "time": np.where(eliminated, np.nan, 35.0),
+            "eliminated": eliminated, "archived_at": pd.Timestamp("2025-12-31"),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classes", type=int, nargs="*", default=[100, 500, 2000], help="archived classes in the season")
+    parser.add_argument("--queries", type=int, default=100, help="searches timed per size")
+    args = parser.parse_args(argv)
+
+    print(f"{'classes':>8} {'runs':>7} {'index s':>8} {'scan ms':>8} {'index ms':>9} {'speed-up':>9}")
+    for classes in args.classes:
+        runs = season_runs(classes)
+        rng = random.Random(1)
+        queries = [rng.choice(LAST)[:4].lower() + " " + rng.choice(DOGS)[:3].lower() for _ in range(args.queries)]
+        with tempfile.TemporaryDirectory() as root:
+            index = NameIndex(os.path.join(root, "name_index.sqlite"))
+            start = time.perf_counter()
+            index.add_runs(runs)
+            built = time.perf_counter() - start
+
+            # Scan: split every name and match each word as a prefix of a handler or dog word
+            start = time.perf_counter()
+            for query in queries:
+                words = query.split()
+                handler = handler_names(runs["name"])
+                dog = runs["name"].str.rsplit(" & ", n=1).str[-1].str.lower()
+                text = handler + " " + dog
+                mask = np.ones(len(runs), dtype=bool)
+                for word in words:
+                    mask &= text.str.contains(rf"\b{word}", regex=True).to_numpy()
+                runs[mask].sort_values("date", ascending=False).head(200)
+            scan = (time.perf_counter() - start) * 1000 / len(queries)
+
+            start = time.perf_counter()
+            for query in queries:
+                index.search(query, season=2025)
+            search = (time.perf_counter() - start) * 1000 / len(queries)
+        print(f"{classes:>8} {len(runs):>7} {built:>8.2f} {scan:>8.2f} {search:>9.2f} {scan / search:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
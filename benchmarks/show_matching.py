@@ -0,0 +1,64 @@
+"""
+Benchmark matching a season of show names: difflib candidate by candidate against one batched ShowMatcher.
+
+Every name of the championship calendar is matched against a synthetic Plaza year
+listing of `--listed` shows (the calendar names, reworded, plus filler shows).
+
+Usage:
+    python -m benchmarks.show_matching
+    python -m benchmarks.show_matching --listed 200 1000 5000
+"""
+import argparse
+import difflib
+import random
+import time
+import pandas as pd
+from src.core.show_matcher import ShowMatcher
+
+CALENDAR = "Champ shows.csv"
+SUFFIXES = ["Dog Training Club", "Agility Club", "DTC", "Dog Agility Society", "Canine Society"]
+
+def difflib_best(target, candidates, threshold=0.7):
+    """The previous approach: lower-case both names and run SequenceMatcher on every candidate."""
+    target = target.strip().lower()
+    best, best_ratio = None, threshold
+    for candidate in candidates:
+        ratio = difflib.SequenceMatcher(None, target, candidate.strip().lower()).ratio()
+        if ratio >= best_ratio:
+            best, best_ratio = candidate, ratio
+    return best
+
+def listing(names, size, seed=0):
+    """Plaza-style listing of `size` shows containing every calendar name with a club suffix."""
+    rng = random.Random(seed)
+    listed = [f"{name.strip().title()} {rng.choice(SUFFIXES)}" for name in names]
+    listed += [f"Show {i} {rng.choice(SUFFIXES)}" for i in range(max(0, size - len(listed)))]
+    rng.shuffle(listed)
+    return listed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--listed", type=int, nargs="*", default=[100, 500, 2000], help="shows in the synthetic listing")
+    args = parser.parse_args(argv)
+
+    names = pd.read_csv(CALENDAR)["Show Name"].tolist()
+    print(f"{len(names)} calendar names")
+    print(f"{'listed':>7} {'difflib ms':>11} {'build ms':>9} {'match ms':>9} {'speed-up':>9}")
+    for size in args.listed:
+        candidates = listing(names, size)
+
+        start = time.perf_counter()
+        for name in names:
+            difflib_best(name, candidates)
+        old = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        matcher = ShowMatcher(candidates)
+        built = (time.perf_counter() - start) * 1000
+        for name in names:
+            matcher.best(name)
+        new = (time.perf_counter() - start) * 1000
+        print(f"{size:7d} {old:11.1f} {built:9.1f} {new - built:9.1f} {old / new:8.1f}x")
+
+if __name__ == "__main__":
+    main()
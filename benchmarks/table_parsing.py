@@ -0,0 +1,42 @@
+"""Benchmark the lxml table extractor against the previous BeautifulSoup row walk on the saved Plaza pages."""
+import os
+import timeit
+from bs4 import BeautifulSoup
+from src.core.table_extract import extract_table
+
+SAVED_PAGES = [
+    os.path.join("NorthDerbySaves", "NorthDerbyShow_LgeAg_compeleted.html"),
+    os.path.join("NorthDerbySaves", "NorthDerbyShow_LgeJmp_incomplete.html"),
+    os.path.join("NorthDerbySaves", "NorthDerbyRunningOrders_LgeJmp.html"),
+]
+
+def bs4_extract(content):
+    """The previous extraction: html.parser soup, then find_all('tr') / find_all('td') cell by cell."""
+    table = BeautifulSoup(content, 'html.parser').find('table')
+    table_data = []
+    for i, row in enumerate(table.find_all('tr')):
+        cells = row.find_all('td')
+        if not cells and i == 0:
+            continue
+        row_data = [cell.get_text().strip() for cell in cells]
+        if row_data:
+            table_data.append(row_data)
+    headers = [header.get_text().strip() for header in table.find_all('th')]
+    return headers, table_data
+
+def best_ms(func, content, number, repeat=5):
+    """Best time of `repeat` runs, in milliseconds per call."""
+    return min(timeit.repeat(lambda: func(content), number=number, repeat=repeat)) / number * 1000
+
+def main(number=20):
+    print(f"{'page':45} {'rows':>5} {'bs4 ms':>9} {'lxml ms':>9} {'speed-up':>9}")
+    for path in SAVED_PAGES:
+        with open(path, "rb") as f:
+            content = f.read()
+        rows = len(extract_table(content)[1][0])
+        old = best_ms(bs4_extract, content, number)
+        new = best_ms(extract_table, content, number)
+        print(f"{os.path.basename(path):45} {rows:5d} {old:9.3f} {new:9.3f} {old / new:8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -1,140 +1,202 @@
-import requests
-from bs4 import BeautifulSoup
-import numpy as np
-from urllib.parse import urljoin
+"""
+Build the championship show calendar ('Champ shows.csv') from the Kennel Club qualifying shows page.
+
+The KC page is parsed once into one row per (height, show) listing. Listings are grouped
+by normalised show name and date with pandas, giving one row per show with a column per
+height. Each show is then resolved to its Plaza competition URL. The year pages needed
+are fetched concurrently, once each, and every show is looked up in the saved show index
+(`src/core/show_directory.py`).
+
+The previous build is kept in `CACHE_DIR/champ_calendar.json`. If the KC page hasn't changed
+the build stops there, otherwise only shows that are new or changed are resolved again.
+
+Usage:
+    python find_champ_show_db.py
+    python find_champ_show_db.py --output "Champ shows.csv" --full
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import lxml.html
 import pandas as pd
-from datetime import datetime
-
-def database():
-    heights = ['Lge', 'Int', 'Med', 'Sml']
-    champ_show_link = "https://www.thekennelclub.org.uk/events-and-activities/agility/already-competing-in-agility/qualifying-shows-for-the-kennel-club-events/"
-    
-    response = requests.get(champ_show_link)
-    champ_soup = BeautifulSoup(response.content, 'html.parser')
-    
-    # print(type(champ_show_link))
-    
-    soup = champ_soup.find_all("details", class_ = "a-details")
-    
-    for event in soup:
-        summaries = event.find_all("summary")
-        for summary in summaries:
-            if "Championship" in summary.get_text():
-                height  = summary.get_text().split(' ')[-1]
-                
-    
-    # Initialize dictionaries to store data
-    data = {'small': [], 'medium': [], 'intermediate': [], 'large': []}
-    
-    # Iterate through events
-    for event in soup:
-        summaries = event.find_all("summary")
-        for summary in summaries:
-            # Find the table after the summary
-            table = summary.find_next("table")
-            if "Championship" in summary.get_text():
-    #             print(summary.get_text())
-    
-                # Find the table after the summary
-                table = summary.find_next("table")
-                
-                #Find the height
-                height  = summary.get_text().split(' ')[-1]
-                if table:
-                    # Extract and process table content
-                    for row in table.find_all("tr"):
-                        cells = row.find_all("td")
-                        if cells:
-                            show_name = [cell.get_text(strip=True) for cell in cells][0].lower()
-                            # Extract date
-                            date = [cell.get_text(strip=True) for cell in cells][1]
-                            # Append show name and date to respective height category
-                            data[height.lower()].append((show_name, date))
-    
-                            
-    # Combine data for all heights
-    combined_data = []
-    
-    # Create set of all show names
-    all_show_names = set()
-    for height_shows in data.values():
-        for show in height_shows:
-            all_show_names.add(show[0])
-    
-    # Iterate through all show names and check if each height is present
-    for show_name in all_show_names:
-        show_info = {'Show Name': show_name}
-        for height, height_shows in data.items():
-            height_present = any(show[0] == show_name for show in height_shows)
-            show_info[height.capitalize()] = height_present
-        combined_data.append(show_info)
-    
-    # Create combined dataframe
-    combined_df = pd.DataFrame(combined_data)
-    
-    # Add date column to combined dataframe
-    for height, height_shows in data.items():
-        for show in height_shows:
-            show_name = show[0]
-            date = show[1]
-            combined_df.loc[combined_df['Show Name'] == show_name, 'Date'] = date
-    
-    
-    # Extracting date and comments
-    dates = []
-    comments = []
-    for item in combined_df['Date']:
-        date_parts = item.split('(')
-        date = date_parts[0].strip()
-        comment = date_parts[1].strip(')') if len(date_parts) > 1 else ''
-        dates.append(date)
-        comments.append(comment)
-    
-    # Creating a DataFrame
-    # data = {'Date': dates, 'Comments': comments}
-    combined_df['Date'] = dates
-    combined_df['Comments'] = comments
-    # Convert 'Date' column to datetime
-    combined_df['Date'] = pd.to_datetime(combined_df['Date'], errors='coerce')
-
-    #Remove "The Agility Club"
-    the_agility_club_df = combined_df[combined_df['Show Name'] == 'the agility club']
-    the_agility_club_df.loc[:, 'Show Name'] = the_agility_club_df['Show Name'].str.replace('^the\s+', '', regex=True)
-
-
-    # Now, remove these rows from the original DataFrame
-    combined_df = combined_df[combined_df['Show Name'] != 'the agility club']
-    
-    
-    remove_words = ['DTC', 'Dog', 'Training', 'Society', 'and', '&', 'Club', 'in', 'In', 'Obedience', '(Dorset)', 'District', '(Lancs)', 'Show', 'Championship', 'agility']
-    remove_words = np.char.lower(remove_words)
-    def clean_title(title):
-        words = title.split()
-        cleaned_words = [word for word in words if word not in remove_words]
-        return ' '.join(cleaned_words)
-    
-    # Apply the cleaning function to the 'Show Name' column
-    combined_df['Show Name'] = combined_df['Show Name'].apply(clean_title)
-    
-    # Group by both 'Show Name' and 'Date' and aggregate with 'any' to combine rows
-    combined_df = combined_df.groupby(['Show Name', 'Date']).any().reset_index()
-
-    # Create 'combined_df' by concatenating 'df' and 'the_agility_club'
-    combined_df = pd.concat([combined_df, the_agility_club_df])
-    
-    # Resetting index if needed
-    combined_df.reset_index(drop=True, inplace=True)
-
-    #Sort by date
-    combined_df = combined_df.sort_values(by='Date')
-    
-    # combined_df.to_csv('Champ shows lowercase.csv')
-
-    return combined_df
+from bs4 import BeautifulSoup
+from src.core.constants import KC_WEBSITE, PLAZA_RESULTS, REMOVED_WORDS, CACHE_DIR, HEIGHT_NAMES
+from src.core.debug_logger import get_logger
+from src.core.http_client import fetch, fetch_async
+from src.core.show_directory import MONTHS, get_show_directory
+from src.core.show_matcher import normalize
+
+logger = get_logger(__name__)
+
+CALENDAR_COLUMNS = ["Show Name", "Date", *HEIGHT_NAMES.values(), "Comments", "Plaza URL"]
+STATE_PATH = os.path.join(CACHE_DIR, "champ_calendar.json")
+
+# Whole words of REMOVED_WORDS, lower-case, anywhere in a show name
+_REMOVED = re.compile(r"(?<!\S)(?:" + "|".join(re.escape(word.lower()) for word in REMOVED_WORDS) + r")(?!\S)")
+
+def parse_kc_page(content):
+    """
+    Listings of the championship sections of the KC qualifying shows page.
+
+    Returns:
+        DataFrame: One row per listed show and height, columns 'Height' (e.g. "Large"),
+            'Name' and 'Date Text' as listed.
+    """
+    document = lxml.html.fromstring(content)
+    listings = []
+    for summary in document.xpath("//details[contains(@class, 'a-details')]//summary"):
+        title = " ".join(summary.text_content().split())
+        if "Championship" not in title:
+            continue
+        height = title.split(" ")[-1].capitalize()
+        table = summary.xpath("following::table[1]")
+        if not table:
+            continue
+        for row in table[0].iter("tr"):
+            cells = [cell.text_content().strip() for cell in row.findall("td")]
+            if len(cells) >= 2:
+                listings.append((height, cells[0], cells[1]))
+    return pd.DataFrame(listings, columns=["Height", "Name", "Date Text"])
+
+def clean_names(names):
+    """Lower-case show names with `REMOVED_WORDS` dropped, e.g. "Wyre (Lancs) DTC" -> "wyre"."""
+    lowered = names.str.lower().str.strip()
+    cleaned = lowered.str.replace(_REMOVED, " ", regex=True).str.split().str.join(" ")
+    # Names made only of removed words (e.g. "The Agility Club") keep their words, without "the"
+    generic = cleaned.isin(["", "the"])
+    return cleaned.where(~generic, lowered.str.replace(r"^the\s+", "", regex=True))
+
+def build_calendar(listings):
+    """
+    One row per show from the KC listings.
+
+    Returns:
+        DataFrame: Columns `CALENDAR_COLUMNS` without 'Plaza URL', sorted by date. The height
+            columns say which heights the show holds a championship for.
+    """
+    if listings.empty:
+        return pd.DataFrame(columns=CALENDAR_COLUMNS[:-1])
+    listings = listings.copy()
+    parts = listings["Date Text"].str.extract(r"^(?P<date>[^(]*)(?:\((?P<comment>[^)]*)\)?)?")
+    listings["Date"] = pd.to_datetime(parts["date"].str.strip(), errors="coerce", dayfirst=True)
+    listings["Comments"] = parts["comment"].fillna("").str.strip()
+    listings["Show Name"] = clean_names(listings["Name"])
+    listings["Key"] = listings["Show Name"].map(normalize)
+    undated = listings["Date"].isna()
+    if undated.any():
+        # A listing without a date has no place in the calendar, say which so they can be added by hand
+        logger.warning("Dropped %s listings with an unreadable date: %s", int(undated.sum()),
+                       ", ".join(f"{name} ({text})" for name, text in listings.loc[undated, ["Name", "Date Text"]].itertuples(index=False)))
+        listings = listings[~undated]
+
+    heights = pd.crosstab([listings["Key"], listings["Date"]], listings["Height"]).gt(0)
+    heights = heights.reindex(columns=list(HEIGHT_NAMES.values()), fill_value=False)
+    first = listings.groupby(["Key", "Date"])[["Show Name", "Comments"]].first()
+    calendar = first.join(heights).reset_index()
+    return calendar.sort_values("Date", kind="stable").reset_index(drop=True)[CALENDAR_COLUMNS[:-1]]
+
+def row_key(row):
+    """Key of a calendar row in the saved build: name, date and heights."""
+    heights = "".join("1" if row[height] else "0" for height in HEIGHT_NAMES.values())
+    return f"{row['Show Name']}|{row['Date']:%Y-%m-%d}|{heights}"
+
+async def resolve_urls(calendar, known, concurrency=4):
+    """
+    Plaza competition URL of each show of the calendar.
+
+    Shows already in `known` reuse their URL. For the others, each year page that could
+    list them is fetched once, all years concurrently (at most `concurrency` at a time),
+    then every show is looked up in its year's show index.
+
+    Returns:
+        list: URL (or None if not found) per calendar row.
+    """
+    keys = [row_key(row) for _, row in calendar.iterrows()]
+    todo = [i for i, key in enumerate(keys) if not known.get(key)]
+    logger.info("%s of %s shows to resolve", len(todo), len(keys))
+
+    # Year pages that could hold a show not in the saved index yet
+    refresh = {}
+    for i in todo:
+        date = calendar.at[i, "Date"]
+        directory = get_show_directory(date.year)
+        if directory.needs_refresh(MONTHS[date.month - 1]):
+            refresh[date.year] = directory
+
+    limit = asyncio.Semaphore(concurrency)
+    async def update(year, directory):
+        async with limit:
+            try:
+                content = await fetch_async(PLAZA_RESULTS + str(year))
+            except Exception as e:
+                logger.warning("Could not fetch the Plaza results page of %s: %s", year, e)
+                return
+        soup = await asyncio.to_thread(BeautifulSoup, content, "html.parser")
+        await asyncio.to_thread(directory.update, soup)
+    await asyncio.gather(*(update(year, directory) for year, directory in refresh.items()))
+
+    urls = [known.get(key) for key in keys]
+    for i in todo:
+        date = calendar.at[i, "Date"]
+        directory = get_show_directory(date.year)
+        month = MONTHS[date.month - 1]
+        urls[i] = directory.find(calendar.at[i, "Show Name"], month) if month in directory.months else None
+        if urls[i] is None:
+            logger.warning("No Plaza show found for %s on %s", calendar.at[i, "Show Name"], f"{date:%d/%m/%Y}")
+    return urls
+
+def load_state(path=STATE_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"digest": None, "urls": {}}
+
+def save_state(state, path=STATE_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+def database(output=None, full=False):
+    """
+    Build the championship show calendar.
+
+    Args:
+        output (str, optional): CSV file to write, in the format `find_closest_shows` reads.
+        full (bool, optional): Ignore the saved build and resolve every show again.
+
+    Returns:
+        DataFrame: The calendar, columns `CALENDAR_COLUMNS`, or None if the KC page is
+            unchanged since the last build and `output` already exists.
+    """
+    state = {"digest": None, "urls": {}} if full else load_state()
+    content = fetch(KC_WEBSITE)
+    digest = hashlib.sha256(content).hexdigest()
+    if digest == state["digest"] and output and os.path.exists(output):
+        logger.info("KC page unchanged since the last build, %s is up to date", output)
+        return None
 
+    calendar = build_calendar(parse_kc_page(content))
+    calendar["Plaza URL"] = asyncio.run(resolve_urls(calendar, state["urls"]))
 
+    state = {
+        "digest": digest,
+        "urls": {row_key(row): row["Plaza URL"] for _, row in calendar.iterrows() if row["Plaza URL"]},
+    }
+    save_state(state)
+    if output:
+        calendar.to_csv(output, date_format="%d/%m/%Y")
+    return calendar
 
 if __name__ == "__main__":
-    combined_df = database()
-    combined_df.to_csv('Champ shows.csv')
-    print(combined_df)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="Champ shows.csv", help="calendar CSV to write")
+    parser.add_argument("--full", action="store_true", help="resolve every show again, ignoring the saved build")
+    args = parser.parse_args()
+    combined_df = database(output=args.output, full=args.full)
+    print(combined_df if combined_df is not None else f"{args.output} is up to date")
@@ -13,38 +13,40 @@ function Final() {
   const [positionBased, setPositionBased] = useState(true);
 
   useEffect(() => {
-    const fetchFinalData = async () => {
-      const queryParams = new URLSearchParams(window.location.search);
-      const agility = queryParams.get("agility");
-      const jumping = queryParams.get("jumping");
+    const queryParams = new URLSearchParams(window.location.search);
+    const agility = queryParams.get("agility");
+    const jumping = queryParams.get("jumping");
 
-      if (!agility || !jumping) {
-        setError(
-          "Either Agility or jumping ID are not provided in the URL params",
-        );
-        setLoading(false);
-        return;
-      }
+    if (!agility || !jumping) {
+      setError(
+        "Either Agility or jumping ID are not provided in the URL params",
+      );
+      setLoading(false);
+      return;
+    }
+
+    // The server pushes a new payload each time the standings change
+    const source = new EventSource(
+      `${import.meta.env.VITE_API_URL}/final/stream?agility=${agility}&jumping=${jumping}`,
+    );
+
+    source.onmessage = (event) => {
+      const data = JSON.parse(event.data);
+      console.log("Final stream update:", data);
+      setFinalData(data);
+      setError(null);
+      setLoading(false);
+    };
 
-      try {
-        const response = await fetch(
-          `${import.meta.env.VITE_API_URL}/final?agility=${agility}&jumping=${jumping}`,
-        );
-        if (!response.ok) throw new Error("Failed to fetch final data");
-        const data = await response.json();
-        console.log("Final API response:", data);
-        setFinalData(data);
-      } catch (err) {
-        const errorMessage =
-          err instanceof Error ? err.message : "Unknown error";
-        setError(errorMessage);
-        console.error("Error fetching final data:", err);
-      } finally {
+    source.onerror = () => {
+      // EventSource reconnects by itself, only give up if the server refused the stream
+      if (source.readyState === EventSource.CLOSED) {
+        setError("Failed to fetch final data");
         setLoading(false);
       }
     };
 
-    fetchFinalData();
+    return () => source.close();
   }, []);
 
   return (
@@ -12,9 +12,17 @@ async def lifespan(app: FastAPI):
     """
     Manage FastAPI app lifespan - startup and shutdown.
     """
-    # Startup
+    from .poller import poller
+    from .handlers import warm_caches
+    from src.core import http_client
+
+    # Startup - serve the results stored before the restart, and keep the finals being viewed refreshed in the background
+    await warm_caches()
+    poller.start()
     yield
-    # Shutdown - no cleanup needed for now
+    # Shutdown - stop polling and close pooled connections to Plaza
+    await poller.stop()
+    http_client.close()
 
 app = FastAPI(
     title="Champ Finals API",
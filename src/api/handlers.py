@@ -3,8 +3,22 @@ import src.api.models as API_models
 import pandas as pd
 import os
 import asyncio
+import time
 from src.core.models import ClassInfo, Final
-from src.api.session import session
+from src.core.debug_logger import get_logger
+from src.api.session import class_states
+from src.core.cache import results_cache, running_orders_cache, show_catalogues
+from src.core.show_catalogue import ShowCatalogue, canonical_height
+from src.core.requirements import required_places
+from src.core.run_queue import still_to_run
+from src.core.run_rate import run_rates
+from src.io.snapshot_store import snapshot_store
+from src.io.results_archive import results_archive, class_runs
+from src.io.name_index import name_index
+from src.core.archive_queries import season_summary, handler_placings
+from src.core.constants import FINAL_CUTOFF, BATCH_MAX_PAIRS, NAME_SEARCH_LIMIT
+
+logger = get_logger(__name__)
 
 async def get_nearby_shows(days_ahead=5, num_shows=5):
     """Fetch shows around the current date."""
@@ -22,45 +36,73 @@ async def get_nearby_shows(days_ahead=5, num_shows=5):
 
 async def initialise_classInfo(show: str, height: str):
     """Initialise ClassInfor objects for a given show height. This is to be called when the webapp moves from '/' to 'finals' route."""
+    # One spelling of the height for the stored class IDs and the archive partitions
+    height = canonical_height(height)
     try:
         # Check if show is in closest shows
         closest_shows_df = KC_ShowProcesser.find_closest_shows()
         matched_show, matched_date = KC_ShowProcesser.check_show_in_closest(show, closest_shows_df)
-        print_debug(f"Matched show: {matched_show} on {matched_date}")
+        logger.debug("Matched show: %s on %s", matched_show, matched_date)
     except Exception as e:
         raise ValueError(f"Error finding show '{show}': {e}")
+
+    # Resolved before (possibly before a restart), no need to fetch the year and show pages
+    stored_ids = await asyncio.to_thread(snapshot_store.class_ids, matched_show, matched_date, height)
+    if stored_ids is not None:
+        logger.debug("Using stored class IDs for %s %s: %s", matched_show, height, stored_ids)
+        return API_models.getClassIDsResponse(agilityID=stored_ids[0], jumpingID=stored_ids[1])
+
     try:
         # Get show URL
-        show_url = plaza_scraper.find_show_url(matched_show, matched_date)
+        show_url = await asyncio.to_thread(plaza_scraper.find_show_url, matched_show, matched_date)
         assert show_url, f"Show URL not found for {matched_show} on {matched_date}"
         assert isinstance(show_url, str), "Expected show_url to be a string"
-        print_debug(f"Found show URL: {show_url}")
+        logger.debug("Found show URL: %s", show_url)
     except Exception as e:
         raise ValueError(f"Error getting show URL: {e}")
 
     try:
-        # Get URLS of the show page
-        show_soup = plaza_scraper.get_soup(show_url) # Soup first
-
-        assert show_soup, "Failed to retrieve show page soup"
-        print_debug(f"Retrieved show page soup for URL: {show_url}")
+        # Classes of the show page, shared by every height
+        catalogue = await fetch_show_catalogue(show_url)
+        logger.debug("Catalogued %s classes for URL: %s", len(catalogue), show_url)
     except Exception as e:
-        raise ValueError(f"Error fetching show page soup: {e}")
+        raise ValueError(f"Error fetching show page: {e}")
     try:
-        agility_class, jumping_class = plaza_scraper.find_champ_classes(show_soup, height)
+        agility_class, jumping_class = catalogue.champ_classes(height)
 
         assert isinstance(agility_class, ClassInfo), "Expected agility_class to be ClassInfo"
         assert isinstance(jumping_class, ClassInfo), "Expected jumping_class to be ClassInfo"
 
-        agilityID = plaza_scraper.extract_class_id(agility_class.results_url)
-        jumpingID = plaza_scraper.extract_class_id(jumping_class.results_url)
+        # From the catalogue, also known for a class that only has a running order so far
+        agilityID = agility_class.classID
+        jumpingID = jumping_class.classID
+        assert agilityID and jumpingID, "Championship agility and jumping classes not both found"
         
-        print_debug(f"agilityID: {agilityID}, jumpingID: {jumpingID}")
+        logger.debug("agilityID: %s, jumpingID: %s", agilityID, jumpingID)
     except Exception as e:
         raise ValueError(f"Error initializing ClassInfo objects: {e}")
 
+    try:
+        await asyncio.to_thread(snapshot_store.save_class_ids, matched_show, matched_date, height, agilityID, jumpingID)
+    except Exception as e:
+        logger.warning("Could not store the class IDs of %s %s: %s", matched_show, height, e)
+
     return API_models.getClassIDsResponse(agilityID=agilityID, jumpingID=jumpingID)
 
+async def fetch_show_catalogue(show_url: str):
+    """Catalogue of every class on a show page, cached per show for `SHOW_CATALOGUE_TTL` seconds.
+
+    Looking up the four heights of a show costs one fetch and parse of its page.
+
+    Returns:
+        ShowCatalogue
+    """
+    async def loader(previous):
+        content = await plaza_scraper.fetch_async(show_url)
+        return await asyncio.to_thread(ShowCatalogue.from_html, content)
+
+    return await show_catalogues.get(show_url, loader)
+
 async def get_class_ids(agility_link: str, jumping_link: str):
     """Extract class IDs from the provided class links."""
     try:
@@ -75,10 +117,151 @@ async def get_class_ids(agility_link: str, jumping_link: str):
 
     return API_models.lookupIDsResponse(agilityID=agility_id, jumpingID=jumping_id)
 
+async def fetch_class_results(show_class: ClassInfo, simulation=False):
+    """Import results for a class, sharing the parsed results between concurrent requests.
+
+    Once the cached results expire they are revalidated with a conditional request,
+    so an unchanged results page is neither downloaded in full nor parsed again.
+    Changed results are saved to the snapshot store, see `warm_caches`, and completed
+    classes are added to the results archive. If the results are stored ones served
+    before revalidation, `show_class.stale_since` is set to when they were fetched.
+
+    Returns:
+        Tuple of (results_df, eliminations, status)
+    """
+    async def loader(previous):
+        if previous is not None:
+            show_class.results_df, show_class.eliminations, show_class.status = previous
+        results = await plaza_R_RO.import_results_async(show_class, simulation=simulation)
+        # Time the runs that appeared since the last fetch, for the run rate of the class
+        results_df, eliminations, status = results
+        if status == "in progress":
+            run_rates.observe(show_class.classID, results_df, eliminations)
+        elif status == "completed":
+            run_rates.discard(show_class.classID)
+        if not simulation and (previous is None or results_df is not previous[0] or status != previous[2]):
+            try:
+                await asyncio.to_thread(snapshot_store.save_results, show_class.classID, results, show_class.results_url)
+            except Exception as e:
+                logger.warning("Could not store the results of class %s: %s", show_class.classID, e)
+        if not simulation and status == "completed":
+            await archive_class(show_class.classID, results, show_class.results_url)
+        return results
+
+    if simulation:
+        # Local save files, nothing to gain from caching
+        return await loader(None)
+    results = await results_cache.get(show_class.classID, loader)
+    show_class.stale_since = results_cache.stale_since(show_class.classID)
+    return results
+
+async def warm_caches():
+    """
+    Prime the results cache with the results stored before the last restart.
+
+    Completed classes are served from the stored results until their cache TTL runs out.
+    The others are served straight away and revalidated against Plaza in the background
+    on first use, see `ResultsCache.prime`.
+
+    Returns:
+        int: Number of classes loaded.
+    """
+    try:
+        stored = await asyncio.to_thread(snapshot_store.load_results)
+        await asyncio.to_thread(snapshot_store.prune)
+    except Exception as e:
+        logger.warning("Could not load stored results: %s", e)
+        return 0
+    now = time.time()
+    for classID, (saved_at, results) in stored.items():
+        results_cache.prime(classID, results, age=now - saved_at)
+        # Completed before the archive existed, or the app stopped before archiving it
+        if results[2] == "completed":
+            await archive_class(classID, results)
+    logger.debug("Warmed the results cache with %s stored classes", len(stored))
+    try:
+        await asyncio.to_thread(name_index.sync, results_archive)
+    except Exception as e:
+        logger.warning("Could not sync the name index with the archive: %s", e)
+    return len(stored)
+
+async def archive_class(classID, results, results_url=None):
+    """
+    Add a completed class to the results archive, if it isn't there yet.
+
+    The show, date and height come from the class IDs stored by `initialise_classInfo`, so
+    classes only looked up by URL aren't archived. Archived runs are added to the name
+    index straight away. Errors are logged, not raised.
+
+    Returns:
+        bool: True if the class was archived now.
+    """
+    try:
+        if results_archive.has(classID):
+            return False
+        meta = await asyncio.to_thread(snapshot_store.class_meta, classID)
+        if meta is None:
+            logger.debug("Class %s wasn't looked up through a show, not archived", classID)
+            return False
+        meta.update(class_id=classID, results_url=results_url)
+        if not await asyncio.to_thread(results_archive.archive_class, meta, results):
+            return False
+    except Exception as e:
+        logger.warning("Could not archive class %s: %s", classID, e)
+        return False
+    try:
+        await asyncio.to_thread(name_index.add_runs, class_runs(meta, results))
+    except Exception as e:
+        # Picked up by `NameIndex.sync` on the next start
+        logger.warning("Could not index the names of class %s: %s", classID, e)
+    return True
+
+def table_payload(df):
+    """Row-oriented, JSON-safe form of a DataFrame: columns and one list of values per row."""
+    return {
+        "columns": df.columns.tolist(),
+        "rows": df.astype(object).where(df.notna(), None).values.tolist(),
+    }
+
+async def get_archive_results(season, height=None, show=None, class_type=None):
+    """
+    Archived championship runs of a season, optionally of one height, show or class type.
+
+    Returns:
+        dict: 'season', 'classes' (number of archived classes matched) and the runs as `table_payload`.
+    """
+    runs = await asyncio.to_thread(results_archive.read, season=season, height=height, show=show, class_type=class_type)
+    return {"season": season, "classes": int(runs["class_id"].nunique()), **table_payload(runs)}
+
+async def get_archive_summary(season, height):
+    """
+    Season record of every pair of a height over the archived championship classes.
+
+    Returns:
+        dict: 'season', 'height', 'classes' and one row per pair as `table_payload`, see `season_summary`.
+    """
+    height = canonical_height(height)
+    runs = await asyncio.to_thread(results_archive.read, season=season, height=height)
+    summary = season_summary(runs)
+    return {"season": season, "height": height, "classes": int(runs["class_id"].nunique()), **table_payload(summary)}
+
+async def get_handler_placings(handler, season=None, height=None):
+    """
+    Archived championship placings of a handler, newest first, see `handler_placings`.
+
+    Returns:
+        dict: 'handler', 'season' and the placings as `table_payload`.
+    """
+    runs = await asyncio.to_thread(results_archive.read, season=season, height=height)
+    placings = handler_placings(runs, handler)
+    return {"handler": handler, "season": season, **table_payload(placings)}
+
 async def update_classInfo(agilityID: str, jumpingID: str, simulation=False):
     """Update ClassInfo object of the qualifying rounds. To be called when finals route is refreshed.
-    
-    
+
+    The result is kept in `class_states` for the pair. If neither class's results changed
+    since then, the stored state is returned as is instead of rebuilding the final.
+
     Returns:
         Tuple of updated ClassInfo objects (agility_class, jumping_class)
     """
@@ -87,27 +270,33 @@ async def update_classInfo(agilityID: str, jumpingID: str, simulation=False):
         agilityURL = f"{PLAZA_BASE}/agilityClass/{agilityID}/results"
         jumpingURL = f"{PLAZA_BASE}/agilityClass/{jumpingID}/results"
 
-        print_debug(f"[START] Updating class info for agility={agilityID}, jumping={jumpingID}")
-        print_debug(f"Agility Results URL: {agilityURL}")
-        print_debug(f"Jumping Results URL: {jumpingURL}")
+        logger.debug("[START] Updating class info for agility=%s, jumping=%s", agilityID, jumpingID)
+        logger.debug("Agility Results URL: %s", agilityURL)
+        logger.debug("Jumping Results URL: %s", jumpingURL)
 
         agility_class = ClassInfo("Agility",results_url=agilityURL)
         jumping_class = ClassInfo("Jumping",results_url=jumpingURL)
         agility_class.classID = agilityID
         jumping_class.classID = jumpingID
-        
-        if not agility_class or not jumping_class:
-            raise ValueError("ClassInfo objects not initialized in session. Please initialise first.")
+        previous = None if simulation else class_states.get(agilityID, jumpingID)
 
-        print_debug(f"[STEP] Importing agility results...")
-        # Import results for agility class
-        agility_results_df, agility_eliminations, agility_status = plaza_R_RO.import_results(agility_class, simulation=simulation)
+        logger.debug("[STEP] Importing agility and jumping results...")
+        # Import results for both classes concurrently
+        (agility_results_df, agility_eliminations, agility_status), (jumping_results_df, jumping_eliminations, jumping_status) = await asyncio.gather(
+            fetch_class_results(agility_class, simulation=simulation),
+            fetch_class_results(jumping_class, simulation=simulation),
+        )
 
-        print_debug(f"[STEP] Importing jumping results...")
-        # Import results for jumping class
-        jumping_results_df, jumping_eliminations, jumping_status = plaza_R_RO.import_results(jumping_class, simulation=simulation)
+        # Neither class changed since the stored state, share it instead of rebuilding the final
+        if (previous is not None
+                and agility_results_df is previous.agilityClass.results_df and agility_status == previous.agilityClass.status
+                and jumping_results_df is previous.jumpingClass.results_df and jumping_status == previous.jumpingClass.status
+                and agility_class.stale_since == previous.agilityClass.stale_since
+                and jumping_class.stale_since == previous.jumpingClass.stale_since):
+            logger.debug("[END] Results unchanged, reusing stored state")
+            return previous
 
-        print_debug(f"[STEP] Updating class info...")
+        logger.debug("[STEP] Updating class info...")
         # Update ClassInfo objects
         agility_class.results_df = agility_results_df
         agility_class.eliminations = agility_eliminations
@@ -125,35 +314,231 @@ async def update_classInfo(agilityID: str, jumpingID: str, simulation=False):
         assert isinstance(jumping_class, ClassInfo), "Expected jumping_class to be ClassInfo"
 
         if jumping_class.status == "in progress":
-            jumping_class.running_orders_url = jumping_RunningOrderURL
+            jumping_class.running_orders_url = f"{PLAZA_BASE}/agilityClass/{jumpingID}/running_orders"
         if agility_class.status == "in progress":
-            agility_class.running_orders_url = agility_RunningOrderURL
+            agility_class.running_orders_url = f"{PLAZA_BASE}/agilityClass/{agilityID}/running_orders"
+
+        logger.debug("[STEP] Updating the queue of pairs still to run...")
+        await asyncio.gather(*(update_queue(show_class, simulation=simulation) for show_class in (agility_class, jumping_class)
+                               if show_class.running_orders_url))
 
-        print_debug(f"[STEP] Creating final class...")
+        logger.debug("[STEP] Creating final class...")
         try:
             final_class = Final(jumping_class, agility_class)
-            final_class.combine_dfs()
+            # Rows changed since the stored final are listed in changed_rows / removed_rows
+            final_class.combine_dfs(previous.finalClass if previous is not None else None)
             final_class.update_status()
         except Exception as e:
-            print_debug(f"Error combining dfs or updating status: {e}")
+            logger.debug("Error combining dfs or updating status: %s", e)
             raise ValueError(f"Error creating final class: {e}")
         
-        print_debug(f"[END] Successfully completed update_classInfo")
-        return API_models.update_classesResponse(agilityClass=agility_class, jumpingClass=jumping_class, finalClass=final_class)
+        response = API_models.update_classesResponse(agilityClass=agility_class, jumpingClass=jumping_class, finalClass=final_class)
+        if not simulation:
+            class_states.put(agilityID, jumpingID, response)
+        logger.debug("[END] Successfully completed update_classInfo")
+        return response
     except Exception as e:
-        print_debug(f"[ERROR] Exception in update_classInfo: {str(e)}")
+        logger.warning("[ERROR] Exception in update_classInfo: %s", e)
         raise
     
 
+async def fetch_running_orders(show_class: ClassInfo, simulation=False):
+    """Import the running orders of a class, shared between concurrent requests like `fetch_class_results`.
+
+    Running orders are kept in `running_orders_cache` for `RUNNING_ORDERS_TTL` seconds and then
+    revalidated with a conditional request, so they aren't downloaded again on every refresh.
+
+    Returns:
+        DataFrame of the running orders, or None if the class has no running orders page.
+    """
+    async def loader(previous):
+        show_class.running_orders_df = previous
+        running_orders_df = await plaza_R_RO.import_running_orders_async(show_class, simulation=simulation)
+        return running_orders_df if isinstance(running_orders_df, pd.DataFrame) else None
+
+    if simulation:
+        return await loader(None)
+    return await running_orders_cache.get(show_class.classID, loader)
+
+async def update_queue(show_class: ClassInfo, simulation=False):
+    """Set the running orders and the queue of pairs still to run of a class in progress.
+
+    A failed running orders fetch (or queue) only leaves the queue unknown, the results are still served.
+    """
+    try:
+        show_class.running_orders_df = await fetch_running_orders(show_class, simulation=simulation)
+    except Exception as e:
+        logger.warning("Could not import the %s running orders: %s", show_class.class_type, e)
+        return
+    if show_class.running_orders_df is None:
+        return
+    try:
+        show_class.queue_df = still_to_run(show_class.running_orders_df, show_class.results_df, show_class.eliminations,
+                                           eta=run_rates.get(show_class.classID).eta)
+    except Exception as e:
+        logger.warning("Could not work out the %s queue: %s", show_class.class_type, e)
+
+def run_queue_payload(snapshot):
+    """
+    Pairs still to run in each class of a snapshot, with their queue position and ETA.
+
+    Returns:
+        dict: class type -> {status, run rate, expected seconds until the class finishes, columns,
+            queue rows}; the queue and finish time are None if the running order isn't known.
+    """
+    payload = {}
+    for show_class in (snapshot.agilityClass, snapshot.jumpingClass):
+        queue_df = show_class.queue_df
+        live = show_class.status == "in progress"
+        estimator = run_rates.get(show_class.classID) if live else None
+        payload[show_class.class_type.lower()] = {
+            "status": show_class.status,
+            "runsPerMinute": estimator.runs_per_minute() if live else None,
+            "finishInSeconds": show_class.finish_eta() if live else None,
+            "columns": queue_df.columns.tolist() if queue_df is not None else None,
+            "queue": queue_df.values.tolist() if queue_df is not None else None,
+        }
+    return payload
+
+async def get_requirements(agilityID: str, jumpingID: str, snapshot=None, simulation=False):
+    """
+    What each pair needs in the round in progress to make the final, see `requirements.required_places`.
+
+    The completed (or first) round is taken from the class order of the latest snapshot, and
+    the running orders of the round in progress decide who is still to run.
+
+    Returns:
+        dict: cutoff, the first/second round class types and the requirement rows.
+    """
+    if snapshot is None:
+        snapshot = await update_classInfo(agilityID, jumpingID, simulation=simulation)
+    agility_class, jumping_class = snapshot.agilityClass, snapshot.jumpingClass
+    if jumping_class.order < agility_class.order:
+        first_class, second_class = jumping_class, agility_class
+    else:
+        first_class, second_class = agility_class, jumping_class
+    if first_class.results_df is None:
+        raise ValueError(f"No results yet for the {first_class.class_type} round")
+
+    running_orders_df = second_class.running_orders_df
+    if running_orders_df is None and second_class.status == "in progress" and second_class.running_orders_url:
+        running_orders_df = await fetch_running_orders(second_class, simulation=simulation)
+
+    requirements_df = required_places(
+        first_class.results_df, second_class.results_df, running_orders_df,
+        second_class.eliminations, cutoff=FINAL_CUTOFF,
+    )
+    return {
+        "cutoff": FINAL_CUTOFF,
+        "firstClass": first_class.class_type,
+        "secondClass": second_class.class_type,
+        "columns": requirements_df.columns.tolist(),
+        "requirements": requirements_df.astype(object).where(requirements_df.notna(), None).values.tolist(),
+    }
+
+def final_payload(response):
+    """Build the `/api/final` payload from an update_classesResponse."""
+    final_results_df = response.finalClass.final_results_df
+    stale = [c.stale_since for c in (response.agilityClass, response.jumpingClass) if c.stale_since is not None]
+    stale_since = min(stale) if stale else None
+    return {
+        "agilityStatus": response.agilityClass.status,
+        "jumpingStatus": response.jumpingClass.status,
+        "finalStatus": response.finalClass.status,
+        "agilityWinner": response.finalClass.agilityWinner,
+        "jumpingWinner": response.finalClass.jumpingWinner,
+        # Results served from storage while Plaza is revalidated, with the oldest fetch time
+        "stale": stale_since is not None,
+        "staleSince": stale_since,
+        "finalResults": final_results_df.to_json() if final_results_df is not None else None,
+    }
+
+def final_rows(response):
+    """
+    Row-oriented form of the final standings, used for versioned diffs.
+
+    Returns:
+        tuple: (columns, rows) where rows maps each pair's Name to its list of
+        JSON-safe values in column order.
+    """
+    final_results_df = response.finalClass.final_results_df
+    if final_results_df is None:
+        return [], {}
+    columns = final_results_df.columns.tolist()
+    values = final_results_df.astype(object).where(final_results_df.notna(), None).values.tolist()
+    name_index = columns.index("Name")
+    return columns, {row[name_index]: row for row in values}
+
+async def get_batch_finals(pairs=None, show=None, heights=HEIGHTS):
+    """
+    Latest final of several class pairs, e.g. every height of a show, in one payload.
+
+    Pairs are resolved (for a show, one show page fetch covers every height) and refreshed
+    concurrently through the poller, at most `BATCH_MAX_PAIRS` at a time, so all the
+    classes are fetched together without flooding Plaza. A pair that fails is reported
+    with its error instead of failing the whole batch.
+
+    Args:
+        pairs (list, optional): dicts with 'agility' and 'jumping' class IDs and an optional 'height'.
+        show (str, optional): Show name whose championship classes to look up, if no pairs are given.
+        heights (list, optional): Heights to look up for `show`. Defaults to all of them.
+
+    Returns:
+        dict: 'finals', one entry per pair with its height, class IDs and either the
+            `/api/final` payload or an 'error'.
+    """
+    from .poller import poller
+    if not pairs:
+        if not show:
+            raise ValueError("Either class pairs or a show is needed")
+        pairs = await asyncio.gather(*(_lookup_pair(show, height) for height in heights))
+
+    limit = asyncio.Semaphore(BATCH_MAX_PAIRS)
+
+    async def final_of(pair):
+        entry = {"height": pair.get("height"), "agilityID": pair.get("agility"), "jumpingID": pair.get("jumping")}
+        if pair.get("error"):
+            entry["error"] = pair["error"]
+            return entry
+        try:
+            async with limit:
+                epoch, version, payload = await poller.get_payload(str(pair["agility"]), str(pair["jumping"]))
+            entry.update(payload, epoch=epoch, version=version)
+        except Exception as e:
+            entry["error"] = str(e)
+        return entry
+
+    finals = await asyncio.gather(*(final_of(pair) for pair in pairs))
+    return {"finals": finals}
+
+async def _lookup_pair(show, height):
+    """Class IDs of a show's championship classes of a height, or the lookup error, for `get_batch_finals`."""
+    try:
+        response = await initialise_classInfo(show, height)
+        return {"height": height, "agility": response.agilityID, "jumping": response.jumpingID}
+    except Exception as e:
+        return {"height": height, "error": str(e)}
+
+async def search_names(query, season=None, height=None, field=None, limit=NAME_SEARCH_LIMIT):
+    """
+    Archived runs of the handlers and dogs matching a name search, see `NameIndex.search`.
+
+    Returns:
+        dict: 'query', 'season', the matching 'pairs' with their number of runs, and the
+            runs (newest first) as `table_payload`.
+    """
+    results = await asyncio.to_thread(name_index.search, query, season=season, height=height, field=field, limit=limit)
+    return {"query": query, "season": season, "pairs": name_index.pairs(results), **table_payload(results)}
+
 if __name__ == "__main__":
     
     agility_id, jumping_id = asyncio.run(initialise_classInfo("lisburn", "lge"))
     
-    print_debug(f"Agility ID: {agility_id}, Jumping ID: {jumping_id}")
+    logger.debug("Agility ID: %s, Jumping ID: %s", agility_id, jumping_id)
 
     agility_class, jumping_class = asyncio.run(update_classInfo(agility_id, jumping_id, simulation=False))
 
-    print_debug(agility_class)
-    print_debug(jumping_class)
+    logger.debug("%s", agility_class)
+    logger.debug("%s", jumping_class)
 
 
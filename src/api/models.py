@@ -1,5 +1,7 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
+from src.core.constants import HEIGHTS, BATCH_MAX_REQUEST_PAIRS
 from src.core.models import ClassInfo, Final
+from src.core.show_catalogue import canonical_height
 
 class getNearShowsResponse(BaseModel):
     """Response model for getting a list of nearby shows & their dates."""
@@ -40,6 +42,28 @@ class IdRequest(BaseModel):
     agility: str = Field(..., pattern=r"^\d+$", description="Agility class ID")
     jumping: str = Field(..., pattern=r"^\d+$", description="Jumping class ID")
 
+class finalPairRequest(IdRequest):
+    """A class pair of a batch finals request, with an optional label such as the height."""
+    height: str | None = None
+
+class batchFinalsRequest(BaseModel):
+    """Request model for several finals at once: explicit class pairs, or a show and its heights."""
+    pairs: list[finalPairRequest] | None = Field(None, max_length=BATCH_MAX_REQUEST_PAIRS)
+    show: str | None = None
+    heights: list[str] = Field(default_factory=lambda: list(HEIGHTS), min_length=1, max_length=len(HEIGHTS))
+
+    @field_validator("heights")
+    @classmethod
+    def check_heights(cls, heights):
+        """Heights in their `HEIGHTS` spelling, each once."""
+        return list(dict.fromkeys(canonical_height(height) for height in heights))
+
+    @model_validator(mode="after")
+    def check_pairs_or_show(self):
+        if not self.pairs and not self.show:
+            raise ValueError("Either class pairs or a show is needed")
+        return self
+
 
 # class initialiseClassInfoResponse(BaseModel):
 #     """Response model for initializing class info."""
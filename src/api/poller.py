@@ -0,0 +1,273 @@
+"""Background poller that keeps the final of every actively viewed class pair up to date."""
+import asyncio
+import math
+import random
+import time
+from collections import OrderedDict
+from src.core.constants import (
+    REFRESH_INTERVAL, RESULTS_CACHE_TTL, POLL_INTERVAL_LIVE, POLL_AFTER_RUN, POLL_JITTER,
+    POLL_CHANGE_SMOOTHING, POLL_IDLE_TIMEOUT, POLL_TICK, FINAL_HISTORY_VERSIONS,
+)
+from src.core.run_rate import run_rates
+from src.core.debug_logger import get_logger
+
+logger = get_logger(__name__)
+
+class PairState:
+    """Polling state of one (agilityID, jumpingID) pair."""
+    def __init__(self, agilityID, jumpingID):
+        self.agilityID = agilityID
+        self.jumpingID = jumpingID
+        self.snapshot = None  # latest update_classesResponse
+        self.payload = None  # latest /api/final payload built from the snapshot
+        self.epoch = f"{random.getrandbits(32):08x}"  # token of this state, so versions of an earlier one (idle drop, restart) don't match
+        self.version = 0  # bumped each time the payload changes
+        self.columns = []  # columns of the standings rows
+        self.rows = {}  # Name -> row values of the latest standings
+        self.history = OrderedDict()  # version -> rows, for the last FINAL_HISTORY_VERSIONS versions
+        self.updated_at = None  # time.monotonic() of the latest snapshot
+        self.subscribers = set()  # asyncio.Queue per streaming client
+        self.last_viewed = time.monotonic()
+        self.next_refresh = 0.0
+        self.refreshing = None  # asyncio.Task of an in-flight refresh
+        self.error = None  # message of the last failed refresh
+        self.failures = 0  # refreshes failed in a row
+        self.last_change = None  # time.monotonic() the standings last changed
+        self.change_interval = None  # moving average of the seconds between standings changes
+
+    def interval(self, now=None):
+        """
+        Seconds until the next refresh, or None once there is nothing left to poll for.
+
+        - both classes completed: None, the final can't change any more
+        - refresh failing (e.g. a class without results yet): backs off from
+          `POLL_INTERVAL_LIVE`, doubling up to `REFRESH_INTERVAL`, so a class that
+          has just started is still noticed within the staleness bound
+        - neither class in progress (e.g. one completed and the other not started):
+          `REFRESH_INTERVAL`
+        - a class in progress: `POLL_AFTER_RUN` seconds after its next run is expected
+          from the observed run rate, else when the standings are next due to change
+          from how often they have, else `POLL_INTERVAL_LIVE`. Kept between
+          `RESULTS_CACHE_TTL` and `REFRESH_INTERVAL` (the staleness bound), with
+          +/- `POLL_JITTER` random jitter.
+        """
+        now = time.monotonic() if now is None else now
+        if self.failures:
+            return min(POLL_INTERVAL_LIVE * 2 ** (self.failures - 1), REFRESH_INTERVAL)
+        if self.snapshot is None:
+            return REFRESH_INTERVAL
+        classes = (self.snapshot.agilityClass, self.snapshot.jumpingClass)
+        if all(show_class.status == "completed" for show_class in classes):
+            return None
+        live = [show_class for show_class in classes if show_class.status == "in progress"]
+        if not live:
+            return REFRESH_INTERVAL
+
+        expected = [run_rates.get(show_class.classID).next_run_in(now) for show_class in live]
+        expected = [delay for delay in expected if delay is not None]
+        if expected:
+            delay = min(expected) + POLL_AFTER_RUN
+        elif self.change_interval is not None:
+            delay = self.last_change + self.change_interval - now + POLL_AFTER_RUN
+        else:
+            delay = POLL_INTERVAL_LIVE
+        delay = min(max(delay, RESULTS_CACHE_TTL), REFRESH_INTERVAL)
+        return delay * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+
+    def publish(self, snapshot, payload, columns, rows):
+        """Store a refreshed snapshot, and push the payload to subscribers if it changed."""
+        self.snapshot = snapshot
+        self.updated_at = time.monotonic()
+        if payload == self.payload:
+            return
+        if self.last_change is not None:
+            gap = self.updated_at - self.last_change
+            self.change_interval = gap if self.change_interval is None else (
+                POLL_CHANGE_SMOOTHING * gap + (1 - POLL_CHANGE_SMOOTHING) * self.change_interval)
+        self.last_change = self.updated_at
+        self.payload = payload
+        self.version += 1
+        self.columns = columns
+        self.rows = rows
+        self.history[self.version] = rows
+        while len(self.history) > FINAL_HISTORY_VERSIONS:
+            self.history.popitem(last=False)
+        for queue in self.subscribers:
+            # Subscribers only need the latest version, drop anything they haven't read yet
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait((self.epoch, self.version, payload))
+
+    def versioned_payload(self, since, epoch=None):
+        """
+        Payload of the standings relative to the version a client already has.
+
+        Rows are lists of values in `columns` order. If `since` is one of the recent
+        versions of this `epoch` only the rows that changed since then are sent (`changed`),
+        plus the names of rows that disappeared (`removed`). On a version gap, or a version
+        of another epoch (the pair was dropped or the server restarted since), the full
+        table is sent as `rows` with `full` set.
+        """
+        payload = {key: value for key, value in self.payload.items() if key != "finalResults"}
+        payload["epoch"] = self.epoch
+        payload["version"] = self.version
+        payload["columns"] = self.columns
+
+        previous = self.history.get(since) if epoch == self.epoch else None
+        if previous is None:
+            payload["full"] = True
+            payload["rows"] = list(self.rows.values())
+            return payload
+
+        payload["full"] = False
+        payload["changed"] = [row for name, row in self.rows.items() if previous.get(name) != row]
+        payload["removed"] = [name for name in previous if name not in self.rows]
+        return payload
+
+class FinalPoller:
+    """
+    Refreshes the finals that clients are viewing on a schedule and publishes the latest snapshot.
+
+    API handlers read the published snapshot, so response time doesn't depend on Plaza
+    or on how many people are watching. Streaming clients subscribe to a pair and are
+    pushed the payload only when it changes, so one refresh fans out to all of them.
+    A pair is polled from the first time it is requested until nobody has viewed or
+    subscribed to it for `POLL_IDLE_TIMEOUT` seconds.
+    """
+    def __init__(self):
+        self.pairs = {}  # (agilityID, jumpingID) -> PairState
+        self._task = None
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the polling loop on the running event loop."""
+        if not self.running:
+            self._task = asyncio.create_task(self.run())
+            logger.debug("Final poller started")
+
+    async def stop(self):
+        """Stop the polling loop and cancel in-flight refreshes."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for state in self.pairs.values():
+            if state.refreshing is not None:
+                state.refreshing.cancel()
+        logger.debug("Final poller stopped")
+
+    def _track(self, agilityID, jumpingID):
+        key = (agilityID, jumpingID)
+        state = self.pairs.get(key)
+        if state is None:
+            state = self.pairs[key] = PairState(agilityID, jumpingID)
+            logger.debug("Tracking pair agility=%s, jumping=%s", agilityID, jumpingID)
+        state.last_viewed = time.monotonic()
+        return state
+
+    async def _current(self, agilityID, jumpingID):
+        state = self._track(agilityID, jumpingID)
+        # Without the background loop (e.g. no lifespan) fall back to refreshing on demand
+        if state.snapshot is None or (not self.running and time.monotonic() >= state.next_refresh):
+            await self._refresh(state)
+        return state
+
+    async def get_snapshot(self, agilityID: str, jumpingID: str):
+        """
+        Return the latest published snapshot of a pair, and keep the pair tracked.
+
+        The first request for a pair waits for its initial refresh; every later request is
+        answered straight from the snapshot.
+
+        Returns:
+            update_classesResponse: The latest ClassInfo objects and Final for the pair.
+        """
+        state = await self._current(agilityID, jumpingID)
+        return state.snapshot
+
+    async def get_payload(self, agilityID: str, jumpingID: str):
+        """
+        Return the latest published `/api/final` payload of a pair, see `get_snapshot`.
+
+        Returns:
+            tuple: (epoch, version, payload dict)
+        """
+        state = await self._current(agilityID, jumpingID)
+        return state.epoch, state.version, state.payload
+
+    async def get_changes(self, agilityID: str, jumpingID: str, since: int, epoch: str = None):
+        """Return the standings of a pair as changes since version `since` of `epoch`, see `PairState.versioned_payload`."""
+        state = await self._current(agilityID, jumpingID)
+        return state.versioned_payload(since, epoch)
+
+    async def subscribe(self, agilityID: str, jumpingID: str):
+        """
+        Subscribe to payload changes of a pair.
+
+        Returns:
+            asyncio.Queue: Receives (epoch, version, payload) each time the payload changes,
+            starting with the current one. Pass it to `unsubscribe` when done.
+        """
+        state = await self._current(agilityID, jumpingID)
+        queue = asyncio.Queue(maxsize=1)
+        queue.put_nowait((state.epoch, state.version, state.payload))
+        state.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, agilityID: str, jumpingID: str, queue):
+        """Stop sending payload changes of a pair to `queue`."""
+        state = self.pairs.get((agilityID, jumpingID))
+        if state is not None:
+            state.subscribers.discard(queue)
+            state.last_viewed = time.monotonic()
+
+    async def _refresh(self, state):
+        """Refresh a pair, joining any refresh of it that is already in flight."""
+        if state.refreshing is None:
+            state.refreshing = asyncio.ensure_future(self._do_refresh(state))
+        task = state.refreshing
+        await asyncio.shield(task)
+        if state.snapshot is None:
+            raise ValueError(state.error)
+
+    async def _do_refresh(self, state):
+        from .handlers import update_classInfo, final_payload, final_rows
+        try:
+            snapshot = await update_classInfo(state.agilityID, state.jumpingID)
+            state.publish(snapshot, final_payload(snapshot), *final_rows(snapshot))
+            state.error = None
+            state.failures = 0
+        except Exception as e:
+            state.error = str(e)
+            state.failures += 1
+            logger.warning("Refresh failed for agility=%s, jumping=%s: %s", state.agilityID, state.jumpingID, e)
+        finally:
+            interval = state.interval()
+            if interval is None:
+                logger.debug("Both classes completed, no more refreshes of agility=%s, jumping=%s", state.agilityID, state.jumpingID)
+            state.next_refresh = time.monotonic() + interval if interval is not None else math.inf
+            state.refreshing = None
+
+    async def run(self):
+        """Polling loop: refresh due pairs and stop tracking pairs nobody is viewing."""
+        while True:
+            now = time.monotonic()
+            for key, state in list(self.pairs.items()):
+                if state.subscribers:
+                    state.last_viewed = now
+                if now - state.last_viewed > POLL_IDLE_TIMEOUT:
+                    logger.debug("Dropping idle pair agility=%s, jumping=%s", state.agilityID, state.jumpingID)
+                    del self.pairs[key]
+                elif now >= state.next_refresh and state.refreshing is None:
+                    state.refreshing = asyncio.ensure_future(self._do_refresh(state))
+            await asyncio.sleep(POLL_TICK)
+
+
+# Global poller instance - started and stopped by the app lifespan
+poller = FinalPoller()
@@ -1,8 +1,16 @@
 """Define API routes."""
-from fastapi import APIRouter, Query, HTTPException
-from src.api.session import session
+import asyncio
+import json
+from datetime import date
+from fastapi import APIRouter, Query, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from src.core.constants import STREAM_KEEPALIVE, NAME_SEARCH_LIMIT
+from src.core.debug_logger import get_logger
+from src.api.session import class_states
 from src.api.models import *
 
+logger = get_logger(__name__)
+
 router = APIRouter(prefix="/api", tags=["Championship Finals API"])
 
 @router.get("/")
@@ -24,7 +32,7 @@ async def get_near_shows(response_model=getNearShowsResponse):
 @router.post("/lookup-ids", response_model=getClassIDsResponse)
 async def lookup_ids(request: lookUpIdsRequest):
     """Look up class IDs for a show and height"""
-    print(f"DEBUG: Received request - show: {request.show}, height: {request.height}")
+    logger.debug("Received request - show: %s, height: %s", request.show, request.height)
     
     from .handlers import initialise_classInfo
     try:
@@ -32,7 +40,7 @@ async def lookup_ids(request: lookUpIdsRequest):
         agility_id = response.agilityID
         jumping_id = response.jumpingID
     except Exception as e:
-        print(f"DEBUG: Error - {e}")
+        logger.debug("Error - %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
     return {
@@ -43,7 +51,7 @@ async def lookup_ids(request: lookUpIdsRequest):
 @router.post("/lookup-ids-url", response_model=getClassIDsResponse)
 async def lookup_url_ids(request: lookUpUrlIdsRequest):
     """get IDs for backup url input"""
-    print(f"DEBUG: Received request - agilityURL: {request.agilityUrl} | jumpingURL: {request.jumpingUrl}")
+    logger.debug("Received request - agilityURL: %s | jumpingURL: %s", request.agilityUrl, request.jumpingUrl)
 
     from .handlers import get_class_ids
     try:
@@ -64,10 +72,10 @@ async def update_classes(
     agility: int = Query(..., description="Agility round ID"), 
     jumping: int = Query(..., description="Jumping round ID")
     ):
-    """Update ClassInfo objects with the latest data."""
-    from .handlers import update_classInfo
+    """Get the latest ClassInfo objects, refreshed in the background by the poller."""
+    from .poller import poller
     try:
-        response = await update_classInfo(str(agility), str(jumping))
+        response = await poller.get_snapshot(str(agility), str(jumping))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
    
@@ -82,54 +90,168 @@ async def update_classes(
 @router.get("/final")
 async def get_final_data(
     agility: int = Query(..., description="Agility round ID"), 
-    jumping: int = Query(..., description="Jumping round ID")
+    jumping: int = Query(..., description="Jumping round ID"),
+    since: int | None = Query(None, description="Version of the standings the client already has, to only receive changed rows"),
+    epoch: str | None = Query(None, description="Epoch returned with that version")
     ):
-    from .handlers import update_classInfo
+    """
+    Latest combined standings of the final, refreshed in the background by the poller.
+
+    Without `since` the whole table is returned as pandas JSON in `finalResults`. With
+    `since` (and the `epoch` returned with it) the response is versioned and row-oriented:
+    `columns` plus either every row (`full` true) or only the rows changed since that version.
+    """
+    from .poller import poller
     try:
-        response = await update_classInfo(str(agility), str(jumping))
+        if since is not None:
+            return await poller.get_changes(str(agility), str(jumping), since, epoch)
+        epoch, version, payload = await poller.get_payload(str(agility), str(jumping))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    
-    # Get the status of the classes
-    agilityStatus = response.agilityClass.status
-    jumpingStatus = response.jumpingClass.status
 
-    # Access the winners
-    agilityWinner = response.finalClass.agilityWinner
-    jumpingWinner = response.finalClass.jumpingWinner
+    return payload
+
+@router.post("/finals")
+async def get_batch_finals(request: batchFinalsRequest):
+    """
+    Latest standings of several finals at once, e.g. every height of a show for a commentator's screen.
 
-    # Accessing final dataframe
-    finalClass = response.finalClass.final_results_df
-    finalStatus = response.finalClass.status
+    Give either `pairs` (agility / jumping class IDs, optional `height` label) or a `show` and
+    its `heights`. Each final in `finals` has the `/api/final` payload of its pair, or an `error`.
+    """
+    from .handlers import get_batch_finals
+    try:
+        pairs = [pair.model_dump() for pair in request.pairs] if request.pairs else None
+        return await get_batch_finals(pairs=pairs, show=request.show, heights=request.heights)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-    # Convert final dataframe to json object
-    final_json = finalClass.to_json()
-    print(finalClass.columns.tolist())
-    print(final_json)
+@router.get("/final/stream")
+async def stream_final_data(
+    request: Request,
+    agility: int = Query(..., description="Agility round ID"),
+    jumping: int = Query(..., description="Jumping round ID")
+    ):
+    """Server-Sent Events stream of the `/api/final` payload, pushed each time the standings change."""
+    from .poller import poller
+    agility_id, jumping_id = str(agility), str(jumping)
+    try:
+        queue = await poller.subscribe(agility_id, jumping_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-    # print the types to the console
-    print(f"agilityStatus type: {type(agilityStatus)}, jumpingStatus type: {type(jumpingStatus)}")
-    print(f"agilityWinner type: {type(agilityWinner)}, jumpingWinner type: {type(jumpingWinner)}")
-    print(f"finalClass type: {type(final_json)}")
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    epoch, version, payload = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    # Comment line to stop proxies closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"id: {epoch}.{version}\ndata: {json.dumps(payload)}\n\n"
+        finally:
+            poller.unsubscribe(agility_id, jumping_id, queue)
 
-    return {
-        "agilityStatus": agilityStatus,
-        "jumpingStatus": jumpingStatus,
-        "finalStatus": finalStatus,
-        "agilityWinner": agilityWinner,
-        "jumpingWinner": jumpingWinner,
-        "finalResults": final_json,
-    }
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @router.get("/requirements")
 async def get_requirements(
     agility: int = Query(..., description="Agility round ID"), jumping: int = Query(..., description="Jumping round ID")
     ):
-    return {
-        "message": "Requirements endpoint is under construction."
-    }
+    """
+    What place each pair still to run needs in the round in progress to make the final,
+    plus best/worst combined points and the outlook of every pair in contention.
+    """
+    from .handlers import get_requirements
+    from .poller import poller
+    try:
+        snapshot = await poller.get_snapshot(str(agility), str(jumping))
+        return await get_requirements(str(agility), str(jumping), snapshot=snapshot)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/running-order")
+async def get_running_order(
+    agility: int = Query(..., description="Agility round ID"), jumping: int = Query(..., description="Jumping round ID")
+    ):
+    """Pairs still to run in each class in progress, in the expected order, with an ETA in seconds."""
+    from .handlers import run_queue_payload
+    from .poller import poller
+    try:
+        snapshot = await poller.get_snapshot(str(agility), str(jumping))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return run_queue_payload(snapshot)
+
+@router.get("/archive/results")
+async def get_archive_results(
+    season: int | None = Query(None, description="Year of the shows, defaults to this year"),
+    height: str | None = Query(None, description="Height, e.g. Lge"),
+    show: str | None = Query(None, description="Show name, as listed in the calendar"),
+    class_type: str | None = Query(None, description="Agility or Jumping")
+    ):
+    """Championship runs of completed classes from the results archive, without scraping Plaza."""
+    from .handlers import get_archive_results
+    try:
+        return await get_archive_results(season or date.today().year, height=height, show=show, class_type=class_type)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/archive/summary")
+async def get_archive_summary(
+    height: str = Query(..., description="Height, e.g. Lge"),
+    season: int | None = Query(None, description="Year of the shows, defaults to this year")
+    ):
+    """Season record (classes, wins, top 10s, clears, average rank) of every pair of a height."""
+    from .handlers import get_archive_summary
+    try:
+        return await get_archive_summary(season or date.today().year, height)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/archive/handler")
+async def get_handler_placings(
+    name: str = Query(..., min_length=2, description="Handler name, or the start of it"),
+    season: int | None = Query(None, description="Year of the shows, all seasons if not given"),
+    height: str | None = Query(None, description="Height, e.g. Lge")
+    ):
+    """Every archived championship placing of a handler, with any of their dogs."""
+    from .handlers import get_handler_placings
+    try:
+        return await get_handler_placings(name, season=season, height=height)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/archive/search")
+async def search_names(
+    q: str = Query(..., min_length=2, description="Handler and / or dog name, each word matched as a prefix"),
+    season: int | None = Query(None, description="Year of the shows, defaults to this year"),
+    height: str | None = Query(None, description="Height, e.g. Lge"),
+    field: str | None = Query(None, description="Only match the handler or the dog name"),
+    limit: int = Query(NAME_SEARCH_LIMIT, ge=1, le=1000, description="Most runs returned")
+    ):
+    """Where a dog or handler has placed this season: archived runs found through the name index."""
+    from .handlers import search_names
+    try:
+        return await search_names(q, season=season or date.today().year, height=height, field=field, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/health")
 async def health_check():
     """Check if API is running"""
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@router.get("/stats")
+async def get_stats():
+    """Size and hit/miss counters of the shared class state store"""
+    return {"classStates": class_states.stats()}
@@ -1,34 +1,120 @@
-"""Manage global ClassInfo state across API requests."""
-from src.core.models import ClassInfo, Final
-
-class SessionManager:
-    """Manages ClassInfo objects for the current session."""
-    _instance = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance.agility_class = None
-            cls._instance.jumping_class = None
-            cls._instance.final = None
-        return cls._instance
-    
-    def initialize_classes(self, agility_class: ClassInfo, jumping_class: ClassInfo, final: Final = None):
-        """Store ClassInfo objects globally."""
-        self.agility_class = agility_class
-        self.jumping_class = jumping_class
-        self.final = final
-    
-    def add_final(self, final: Final):
-        """Store Final object globally."""
-        self.final = final
-    
+"""Shared ClassInfo state of every class pair being viewed, across API requests."""
+import threading
+import time
+from collections import OrderedDict
+from src.core.constants import STATE_STORE_MAX_PAIRS, STATE_STORE_MAX_BYTES, STATE_STORE_TTL
+from src.core.debug_logger import get_logger, TRACE
+
+logger = get_logger(__name__)
+
+def snapshot_size(snapshot):
+    """Approximate memory in bytes of the DataFrames held by an update_classesResponse."""
+    frames = [
+        snapshot.agilityClass.results_df, snapshot.agilityClass.running_orders_df,
+        snapshot.jumpingClass.results_df, snapshot.jumpingClass.running_orders_df,
+        snapshot.agilityClass.queue_df, snapshot.jumpingClass.queue_df,
+        snapshot.finalClass.final_results_df,
+    ]
+    return int(sum(df.memory_usage(index=True, deep=True).sum() for df in frames if df is not None))
+
+class ClassStateStore:
+    """
+    Bounded store of the latest parsed state of each (agilityID, jumpingID) pair.
+
+    Holds the update_classesResponse (ClassInfo objects and Final) of many pairs at
+    once, e.g. every height of several shows on the same weekend. Entries expire
+    `ttl` seconds after they were stored, and the least recently used pairs are
+    evicted once there are more than `max_pairs` or they hold more than `max_bytes`
+    of DataFrames. Stored snapshots are shared between requests, treat them as read-only.
+
+    All methods are synchronous and lock-protected, so the store can be used from
+    the event loop and from worker threads.
+    """
+    def __init__(self, max_pairs=STATE_STORE_MAX_PAIRS, max_bytes=STATE_STORE_MAX_BYTES, ttl=STATE_STORE_TTL):
+        self.max_pairs = max_pairs
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # (agilityID, jumpingID) -> (stored_at, size, snapshot), oldest use first
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, agilityID: str, jumpingID: str):
+        """
+        Return the stored snapshot of a pair, or None if there isn't a current one.
+
+        Returns:
+            update_classesResponse | None
+        """
+        key = (agilityID, jumpingID)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.monotonic() - entry[0] >= self.ttl:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, agilityID: str, jumpingID: str, snapshot):
+        """Store the snapshot of a pair, evicting least recently used pairs if over the limits."""
+        key = (agilityID, jumpingID)
+        size = snapshot_size(snapshot)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic(), size, snapshot)
+            self._bytes += size
+            # Always keep the pair just stored, even if it is over the byte limit on its own
+            while len(self._entries) > 1 and (len(self._entries) > self.max_pairs or self._bytes > self.max_bytes):
+                evicted, _ = next(iter(self._entries.items()))
+                self._remove(evicted)
+                self.evictions += 1
+                logger.log(TRACE, "Evicted state of pair %s", evicted)
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def discard(self, agilityID: str, jumpingID: str):
+        """Drop the state of a pair."""
+        with self._lock:
+            if (agilityID, jumpingID) in self._entries:
+                self._remove((agilityID, jumpingID))
+
     def clear(self):
-        """Clear session data."""
-        self.agility_class = None
-        self.jumping_class = None
-        self.final = None
+        """Drop the state of every pair."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Size and hit/miss counters of the store."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "pairs": len(self._entries),
+                "max_pairs": self.max_pairs,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
 
 
-# Global session instance - always returns same object
-session = SessionManager()
\ No newline at end of file
+# Global state store - shared by every request in the process
+class_states = ClassStateStore()
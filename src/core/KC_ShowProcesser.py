@@ -1,8 +1,77 @@
 """Processing logic for the available shows."""
+import os
+import threading
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from src.core.debug_logger import print_debug,print_debug3
-import difflib
+from src.core.debug_logger import get_logger, TRACE
+from src.core.show_matcher import normalize, similarity
+from src.core.name_tokens import split_names
+
+logger = get_logger(__name__)
+
+class ShowCalendar:
+    """
+    Championship show calendar from a CSV file, loaded once and kept sorted by date.
+
+    The file is re-read only when its modification time changes. Lookups around a date
+    use a binary search on the sorted dates instead of filtering and sorting the frame.
+    """
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.mtime = None
+        self.shows_df = None  # shows sorted by Date, treat as read-only
+        self.dates = None  # numpy datetime64[D] array of shows_df['Date']
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Reload the CSV if it changed since it was last read."""
+        mtime = os.stat(self.filepath).st_mtime_ns
+        if mtime == self.mtime:
+            return
+        with self._lock:
+            if mtime == self.mtime:
+                return
+            shows_df = pd.read_csv(self.filepath)
+            shows_df["Date"] = pd.to_datetime(shows_df["Date"], format="%d/%m/%Y")
+            shows_df = shows_df.sort_values(by="Date", kind="stable").reset_index(drop=True)
+            self.dates = shows_df["Date"].values.astype("datetime64[D]")
+            self.shows_df = shows_df
+            self.mtime = mtime
+            logger.log(TRACE, "Loaded %s shows from %s", len(shows_df), self.filepath)
+
+    def around(self, date, days_ahead=0, num_shows=5):
+        """
+        Shows on or before `date`, plus shows up to `days_ahead` days after it, most recent first.
+
+        Args:
+            date (datetime.date): Date to search around.
+            days_ahead (int, optional): How many days after `date` to include. Defaults to 0.
+            num_shows (int, optional): Maximum number of shows to return. Defaults to 5.
+
+        Returns:
+            Pandas Dataframe: Copy of the matching rows with added columns 'timedelta' and 'is_future'.
+        """
+        self.refresh()
+        day = np.datetime64(date, "D")
+        # Shows up to `date` end at `last_past`, shows up to the cutoff end at `end`
+        last_past = int(np.searchsorted(self.dates, day, side="right"))
+        end = int(np.searchsorted(self.dates, day + np.timedelta64(days_ahead, "D"), side="right"))
+        start = max(0, last_past - num_shows, end - num_shows)
+
+        result_df = self.shows_df.iloc[start:end].iloc[::-1].copy()
+        result_df["timedelta"] = (result_df["Date"].dt.date - date).abs()
+        result_df["is_future"] = result_df["Date"].dt.date > date
+        return result_df
+
+_calendars = {}  # filepath -> ShowCalendar
+
+def get_calendar(champ_shows_filepath="Champ shows.csv"):
+    """Return the shared ShowCalendar of a CSV file."""
+    calendar = _calendars.get(champ_shows_filepath)
+    if calendar is None:
+        calendar = _calendars.setdefault(champ_shows_filepath, ShowCalendar(champ_shows_filepath))
+    return calendar
 
 def find_closest_shows(champ_shows_filepath = "Champ shows.csv", days_ahead=0, num_shows=5):
     """
@@ -17,23 +86,7 @@ def find_closest_shows(champ_shows_filepath = "Champ shows.csv", days_ahead=0, n
         Pandas Dataframe: Dataframe of the closest shows with columns added columns 'timedelta', and 'is_future'.
     """
     today = datetime.now().date()
-    future_cutoff = today + pd.Timedelta(days=days_ahead)
-    
-    champ_shows_df = pd.read_csv(champ_shows_filepath)
-    champ_shows_df["Date"] = pd.to_datetime(champ_shows_df["Date"], format="%d/%m/%Y")
-    champ_shows_df['timedelta'] = (champ_shows_df['Date'].dt.date - today).abs()
-    champ_shows_df['is_future'] = champ_shows_df['Date'].dt.date > today
-    
-    # Get past shows (sorted by most recent first)
-    past_shows = champ_shows_df[champ_shows_df["Date"].dt.date <= today].sort_values(by='Date', ascending=False).head(num_shows)
-    
-    # Get future shows within days_ahead
-    future_shows = champ_shows_df[(champ_shows_df["Date"].dt.date > today) & (champ_shows_df["Date"].dt.date <= future_cutoff)]
-    
-    # Combine past and future shows
-    result_df = pd.concat([past_shows, future_shows]).sort_values(by='Date', ascending=False)
-    
-    return result_df.head(num_shows)
+    return get_calendar(champ_shows_filepath).around(today, days_ahead=days_ahead, num_shows=num_shows)
 
 def check_show_in_closest(Target_show_name,closest_shows_df):
     """
@@ -54,11 +107,11 @@ def check_show_in_closest(Target_show_name,closest_shows_df):
     show_names = closest_shows_df["Show Name"].to_list()
     match = next((name for name in show_names if name.strip().lower() == Target_show_name.strip().lower()), None)
     date = closest_shows_df.loc[closest_shows_df['Show Name'] == match, 'Date'].values[0] if match else None
-    print_debug(f"Date of matched show '{match}': {date}")
+    logger.debug("Date of matched show '%s': %s", match, date)
     if not match:
         raise ValueError(f"Target show '{Target_show_name}' not found in closest shows.")
     else:
-        print_debug(f"Target show '{match}' found in closest shows.")
+        logger.debug("Target show '%s' found in closest shows.", match)
         return match, date
 
 def is_close_match(target, candidate, threshold=0.7):
@@ -76,32 +129,20 @@ def is_close_match(target, candidate, threshold=0.7):
         - Abbreviation match: Checks if either string matches a known abbreviation of the other.
         - Exact match: Checks if the normalized strings are identical.
         - Substring match: Checks if one string is a substring of the other.
-        - Fuzzy match: Uses difflib.SequenceMatcher to compare similarity ratio.
+        - Fuzzy match: Uses the trigram / word similarity of `show_matcher.ShowMatcher`.
+    To compare one name against many, build a `ShowMatcher` once and use `rank` or `best` instead.
     """
-
     target_norm = target.strip().lower()
     candidate_norm = candidate.strip().lower()
-    # Check for abbreviation match
-    abbreviations = {
-        "kennel club international agility festival": "kciaf",
-        "dogs in need agility society": "dinas",
-        # Add more abbreviations as needed
-    }
-    target_abbr = abbreviations.get(target_norm, None)
-    candidate_abbr = abbreviations.get(candidate_norm, None)
-    if target_abbr and (target_abbr == candidate_norm or target_abbr == candidate_abbr):
-        return True
-    if candidate_abbr and (candidate_abbr == target_norm or candidate_abbr == target_abbr):
-        return True
-        # Exact match
-    if target_norm == candidate_norm:
+    # Abbreviation and exact match
+    if normalize(target_norm) == normalize(candidate_norm):
         return True
     # Substring match
     if target_norm in candidate_norm or candidate_norm in target_norm:
         return True
     # Fuzzy match
-    ratio = difflib.SequenceMatcher(None, target_norm, candidate_norm).ratio()
-    return ratio >= threshold
+    return similarity(target, candidate) >= threshold
+
 
 def Find_duplicates(df):
     """
@@ -112,16 +153,16 @@ def Find_duplicates(df):
     
     # If there is a Name column, split it into Dog Name and Handler Name
     if 'Name' in df.columns:
-        df[['Handler', 'Dog']] = df['Name'].str.split(' & ', expand=True)
+        df[['Handler', 'Dog']] = split_names(df['Name'])
         df.drop(columns=['Name'], inplace=True)
     else:
         raise ValueError("No 'Name' column found in DataFrame to split into Dog and Handler")
     #if there is the same name for a dog then print warning
     if df['Dog'].duplicated().any():
         duplicated_dogs = df[df['Dog'].duplicated(keep=False)]['Dog'].unique()
-        print_debug3(f"Warning: Duplicate dog names found: {duplicated_dogs}")
+        logger.log(TRACE, "Warning: Duplicate dog names found: %s", duplicated_dogs)
     else:
-        print_debug3("No duplicate dog names found.")
+        logger.log(TRACE, "No duplicate dog names found.")
     return df
 
 
@@ -130,12 +171,11 @@ if __name__ == "__main__":
 
     print("\n==== Testing find shows function can read csv ====")
     closest_shows_df = find_closest_shows(champ_shows_filepath="Champ shows.csv", days_ahead=0, num_shows=30)
-    # print_debug(f"Closest Shows:\n{closest_shows_df[['Show Name', 'Date']].head()}")
-    print_debug(f"Closest Shows:\n{closest_shows_df.info()}")
+    logger.debug("Closest Shows:\n%s", closest_shows_df[['Show Name', 'Date']].head())
 
     print("\n==== Testing check show in show dataset ====")
     try:
         matched_show,date = check_show_in_closest(test_show_name, closest_shows_df)
-        print_debug(f"Matched Show: {matched_show}, Date: {date} ({type(date)})")
+        logger.debug("Matched Show: %s, Date: %s (%s)", matched_show, date, type(date))
     except ValueError as e:
-        print_debug(str(e))
\ No newline at end of file
+        logger.debug("%s", e)
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""Aggregations over archived championship runs, see `src/io/results_archive.py`."""
+import pandas as pd
+from .debug_logger import get_logger, TRACE
+from .name_tokens import split_names
+
+logger = get_logger(__name__)
+
+SUMMARY_COLUMNS = ["Name", "Height", "Classes", "Wins", "Top_10", "Clears", "Eliminations", "Best_Rank", "Average_Rank"]
+PLACINGS_COLUMNS = ["Date", "Show", "Height", "Class_Type", "Class_ID", "Name", "Rank", "Entries", "Faults", "Time", "Eliminated"]
+
+def handler_names(names):
+    """Handler part of pair names, e.g. "Max Glover & Sushi" -> "max glover", lower-case."""
+    return split_names(names)["Handler"].str.lower()
+
+def season_summary(runs):
+    """
+    Record of every pair over the archived classes given, e.g. a height's season.
+
+    Args:
+        runs (DataFrame): Archived runs, as returned by `ResultsArchive.read`.
+
+    Returns:
+        DataFrame: One row per pair and height, columns `SUMMARY_COLUMNS`. Most wins first,
+            then most top 10 places and best average rank.
+    """
+    if runs.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    rank = runs["rank"].astype("float64")
+    placed = ~runs["eliminated"].to_numpy()
+    counts = pd.DataFrame({
+        "Name": runs["name"],
+        "Height": runs["height"],
+        "Classes": 1,
+        "Wins": (rank == 1).astype(int),
+        "Top_10": (rank <= 10).astype(int),
+        "Clears": ((runs["faults"] == 0) & placed).astype(int),
+        "Eliminations": (~placed).astype(int),
+        "Best_Rank": rank,
+        "Average_Rank": rank,
+    })
+    summary = counts.groupby(["Name", "Height"], sort=False).agg({
+        "Classes": "sum", "Wins": "sum", "Top_10": "sum", "Clears": "sum", "Eliminations": "sum",
+        "Best_Rank": "min", "Average_Rank": "mean",
+    }).reset_index()
+    summary["Best_Rank"] = summary["Best_Rank"].astype("Int64")
+    summary["Average_Rank"] = summary["Average_Rank"].round(2)
+    summary = summary.sort_values(
+        ["Wins", "Top_10", "Average_Rank", "Name"], ascending=[False, False, True, True], na_position="last", kind="stable"
+    ).reset_index(drop=True)
+    logger.log(TRACE, "Season summary of %s pairs over %s runs", len(summary), len(runs))
+    return summary[SUMMARY_COLUMNS]
+
+def handler_placings(runs, handler):
+    """
+    Every archived run of a handler (all their dogs), newest first.
+
+    Args:
+        runs (DataFrame): Archived runs, as returned by `ResultsArchive.read`.
+        handler (str): Handler name, or the start of it (case-insensitive), e.g. "max glover".
+
+    Returns:
+        DataFrame: Columns `PLACINGS_COLUMNS`. 'Entries' is the number of runs in the class.
+    """
+    handler = " ".join(handler.split()).lower()
+    if runs.empty or not handler:
+        return pd.DataFrame(columns=PLACINGS_COLUMNS)
+    entries = runs.groupby("class_id")["name"].transform("size").rename("entries")
+    mine = handler_names(runs["name"]).str.startswith(handler)
+    placings = pd.concat([runs, entries], axis=1).loc[mine].rename(columns={
+        "date": "Date", "show": "Show", "height": "Height", "class_type": "Class_Type", "class_id": "Class_ID",
+        "name": "Name", "rank": "Rank", "entries": "Entries", "faults": "Faults", "time": "Time", "eliminated": "Eliminated",
+    })[PLACINGS_COLUMNS]
+    placings = placings.sort_values(["Date", "Class_Type"], ascending=False, kind="stable").reset_index(drop=True)
+    logger.log(TRACE, "%s archived runs for handler '%s'", len(placings), handler)
+    return placings
@@ -0,0 +1,146 @@
+"""Process-wide cache of parsed class results, shared between API requests."""
+import asyncio
+import time
+from .constants import RESULTS_CACHE_TTL, RESULTS_TTL_COMPLETED, RUNNING_ORDERS_TTL, SHOW_CATALOGUE_TTL, STALE_MAX_AGE
+from .debug_logger import get_logger, TRACE
+
+logger = get_logger(__name__)
+
+class ResultsCache:
+    """
+    TTL cache of parsed class results keyed by class ID.
+
+    Concurrent requests for the same class share a single in-flight fetch (request coalescing),
+    so any number of viewers of one class cause at most one upstream fetch per TTL window.
+    If `ttl_for` is given it sets the TTL of each entry from its value, e.g. longer for
+    classes that can no longer change; it returns None to use `ttl`.
+
+    Values primed from disk after their TTL are served stale while they are revalidated,
+    but only until they are `stale_max_age` seconds old or a revalidation fails. After
+    that requests wait for a normal load, and its error.
+    """
+    def __init__(self, ttl=RESULTS_CACHE_TTL, ttl_for=None, stale_max_age=STALE_MAX_AGE):
+        self.ttl = ttl
+        self.ttl_for = ttl_for
+        self.stale_max_age = stale_max_age
+        self._entries = {}  # key -> (expires_at, value)
+        self._inflight = {}  # key -> asyncio.Task loading the value
+        self._stale = {}  # key -> time.time() a primed, expired value was fetched; served while it is revalidated
+
+    async def get(self, key, loader):
+        """
+        Return the cached value for `key`, loading it with `loader` if missing or expired.
+
+        Args:
+            key (str): Cache key, normally the Plaza class ID.
+            loader (callable): Coroutine function returning the value to cache. It is passed the
+                previous (expired) value, or None, so it can revalidate instead of refetching.
+
+        Returns:
+            The cached value, e.g. a (results_df, eliminations, status) tuple.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() < entry[0]:
+            logger.log(TRACE, "Cache hit for %s", key)
+            return entry[1]
+        if entry is not None and key in self._stale and time.time() - self._stale[key] >= self.stale_max_age:
+            logger.debug("Stored value of %s is too old to serve, waiting for a fresh one", key)
+            del self._stale[key]
+        if entry is not None and key in self._stale:
+            # Primed from disk: answer now, revalidate in the background
+            if key not in self._inflight:
+                logger.log(TRACE, "Serving stale %s, revalidating", key)
+                task = self._inflight[key] = asyncio.ensure_future(self._load(key, loader))
+                task.add_done_callback(_log_failure)
+            return entry[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            logger.log(TRACE, "Cache miss for %s, fetching", key)
+            task = asyncio.ensure_future(self._load(key, loader))
+            self._inflight[key] = task
+        else:
+            logger.log(TRACE, "Joining in-flight fetch for %s", key)
+        # Shield so one cancelled viewer doesn't cancel the fetch for everyone else
+        return await asyncio.shield(task)
+
+    async def _load(self, key, loader):
+        previous = self._entries.get(key)
+        try:
+            value = await loader(previous[1] if previous is not None else None)
+            ttl = self.ttl_for(value) if self.ttl_for is not None else None
+            if ttl is None:
+                ttl = self.ttl
+            self._prune()
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._stale.pop(key, None)
+            return value
+        except Exception:
+            # Don't keep serving the stored value as if it were fresh, the next request loads and fails
+            self._stale.pop(key, None)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def _prune(self):
+        """Drop entries that expired more than a TTL ago, they are too old to revalidate against."""
+        cutoff = time.monotonic() - self.ttl
+        for key in [key for key, (expires_at, _) in self._entries.items() if expires_at < cutoff and key not in self._stale]:
+            del self._entries[key]
+
+    def prime(self, key, value, age=0.0):
+        """
+        Add a value loaded elsewhere, e.g. from the snapshot store at startup.
+
+        Args:
+            key (str): Cache key.
+            value: The value, as a loader would return it.
+            age (float): Seconds since the value was fetched. If that is more than its TTL the
+                value is only served while it is revalidated in the background, and not at all
+                (only revalidated against) once it is `stale_max_age` old.
+        """
+        ttl = self.ttl_for(value) if self.ttl_for is not None else None
+        if ttl is None:
+            ttl = self.ttl
+        self._entries[key] = (time.monotonic() + ttl - age, value)
+        if ttl <= age < self.stale_max_age:
+            self._stale[key] = time.time() - age
+
+    def stale_since(self, key):
+        """time.time() the value of `key` was fetched if it is being served stale, else None."""
+        return self._stale.get(key)
+
+    def invalidate(self, key):
+        """Drop a single entry so the next request refetches it."""
+        self._entries.pop(key, None)
+        self._stale.pop(key, None)
+
+    def clear(self):
+        """Drop all cached entries."""
+        self._entries.clear()
+        self._stale.clear()
+
+def _log_failure(task):
+    """Done callback of background revalidations, nobody awaits them to see the error."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background revalidation failed: %s", task.exception())
+
+
+def results_ttl(results):
+    """
+    Seconds to keep the (results_df, eliminations, status) of a class before revalidating.
+
+    Completed classes can't change any more, so they aren't fetched again for
+    `RESULTS_TTL_COMPLETED`. Returns None for classes in progress, which use the cache TTL.
+    """
+    if isinstance(results, tuple) and len(results) == 3 and results[2] == "completed":
+        return RESULTS_TTL_COMPLETED
+    return None
+
+
+# Global results cache - shared by every request in the process
+results_cache = ResultsCache(ttl_for=results_ttl)
+# Global running orders cache - running orders rarely change once a class has started
+running_orders_cache = ResultsCache(ttl=RUNNING_ORDERS_TTL)
+# Global show catalogue cache - one fetch of a show page answers every height
+show_catalogues = ResultsCache(ttl=SHOW_CATALOGUE_TTL)
@@ -1,4 +1,5 @@
 """Constants for the core championship placement module."""
+import os
 
 # Agility Plaza URLs
 PLAZA_RESULTS = "https://www.agilityplaza.com/results/"
@@ -24,5 +25,54 @@ REMOVED_WORDS = [
     'District', '(Lancs)', 'Show', 'Championship', 'agility'
 ]
 
+# Full show names that are listed under their abbreviation (and vice versa), lower case
+SHOW_ABBREVIATIONS = {
+    "kennel club international agility festival": "kciaf",
+    "dogs in need agility society": "dinas",
+    # Add more abbreviations as needed
+}
+SHOW_MATCH_THRESHOLD = 0.7  # minimum ShowMatcher score for a fuzzy show name match
+
+# Number of pairs from the two qualifying rounds that make the final
+FINAL_CUTOFF = 20
+
 # Timing
-REFRESH_INTERVAL = 120  # seconds
\ No newline at end of file
+REFRESH_INTERVAL = 120  # seconds
+RESULTS_CACHE_TTL = 30  # seconds a fetched class result is shared between requests
+RESULTS_TTL_COMPLETED = 6 * 3600  # seconds before the results of a completed class are fetched again (they don't change)
+POLL_INTERVAL_LIVE = 30  # seconds between background refreshes while a class is in progress (keep >= RESULTS_CACHE_TTL)
+POLL_JITTER = 0.1  # +/- fraction of random jitter on live refresh intervals, so pairs don't poll Plaza in lockstep
+POLL_CHANGE_SMOOTHING = 0.3  # weight of the latest gap between standings changes in its moving average
+POLL_IDLE_TIMEOUT = 600  # seconds without a viewer before a pair stops being polled
+POLL_TICK = 1  # seconds between checks of the polling loop
+FINAL_HISTORY_VERSIONS = 20  # versions of the standings kept per pair to answer /api/final?since= with a diff
+STREAM_KEEPALIVE = 15  # seconds between keep-alive comments on an idle event stream
+RUNNING_ORDERS_TTL = 900  # seconds a fetched running order is kept before it is revalidated (withdrawals)
+SECONDS_PER_RUN = 45  # assumed time between runs in a class until a run rate has been observed
+RUN_RATE_WINDOW = 900  # seconds of new results the observed run rate of a class is taken over
+RUN_RATE_IDLE_TIMEOUT = 1800  # seconds without a refresh before the run rate of a class is forgotten (abandoned, no longer viewed)
+POLL_AFTER_RUN = 5  # seconds after the next run is expected that a live class is polled
+
+# Logging: TRACE, DEBUG2, DEBUG, INFO or WARNING, see debug_logger
+LOG_LEVEL = os.getenv("CHAMP_LOG_LEVEL", "INFO")
+
+# Shared state of class pairs (src/api/session.py)
+STATE_STORE_MAX_PAIRS = 64  # pairs kept at once, e.g. 4 heights x several shows
+STATE_STORE_MAX_BYTES = 256 * 1024 * 1024  # DataFrame memory held before least recently used pairs are evicted
+STATE_STORE_TTL = 3600  # seconds before a stored pair is dropped even if still in use
+
+# Local cache of scraped indexes, survives restarts
+CACHE_DIR = os.getenv("CHAMP_CACHE_DIR", ".cache")
+SHOW_CATALOGUE_TTL = 300  # seconds a show page's class catalogue is reused (links change as classes start and finish)
+SHOW_INDEX_REFRESH = 600  # seconds before the year page is downloaded again to look for a missing show
+SHOW_INDEX_GRACE = 31 * 24 * 3600  # seconds after a month ends that its shows are still re-read (results posted late)
+SNAPSHOT_MAX_AGE = 2 * 24 * 3600  # seconds stored class results are used to warm the caches after a restart
+STALE_MAX_AGE = 600  # seconds since it was fetched that a stored value is still served while it is revalidated
+NAME_SEARCH_LIMIT = 200  # most runs returned by a handler / dog name search of the archive
+
+# HTTP client
+HTTP_TIMEOUT = (5, 20)  # (connect, read) seconds
+HTTP_RETRIES = 2  # retries on connection errors and 429/5xx responses
+HTTP_MAX_CONNECTIONS_PER_HOST = 8
+BATCH_MAX_PAIRS = 4  # class pairs of a batch finals request refreshed at once (2 class fetches each)
+BATCH_MAX_REQUEST_PAIRS = 8  # class pairs a batch finals request can ask for, e.g. 4 heights at 2 shows
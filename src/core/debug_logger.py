@@ -1,25 +1,94 @@
-import inspect
+"""
+Debug logging for the project, built on the standard `logging` module.
+
+Modules get a logger with `get_logger(__name__)` and pass arguments lazily
+(`logger.debug("Fetched %s", url)`), so messages are only formatted when the level
+is enabled. The level comes from `LOG_LEVEL` (env `CHAMP_LOG_LEVEL`) and can be
+changed at runtime with `set_level`:
+
+    TRACE (5)    - everything, including `print_debug3` and table dumps
+    DEBUG2 (9)   - `print_debug2` and above
+    DEBUG (10)   - `print_debug` and above
+    INFO/WARNING - production (INFO is the default): disabled debug calls cost one flag check
+
+`print_debug`, `print_debug2` and `print_debug3` are kept for existing callers and
+log at DEBUG, DEBUG2 and TRACE under the calling module's logger.
+"""
+import logging
+import sys
+from .constants import LOG_LEVEL
+
+__all__ = ["get_logger", "set_level", "TRACE", "DEBUG2", "print_debug", "print_debug2", "print_debug3"]
+
+TRACE = 5
+DEBUG2 = 9
+logging.addLevelName(TRACE, "TRACE")
+logging.addLevelName(DEBUG2, "DEBUG2")
+
+# Loggers that the handler is attached to; module loggers propagate up to them
+_ROOT_LOGGERS = ("src", "benchmarks", "__main__")
+_loggers = {}  # module name -> logging.Logger, for the print_debug shims
+
+def get_logger(name):
+    """Logger of a module, use as `logger = get_logger(__name__)`."""
+    return logging.getLogger(name)
+
+def _level_number(level):
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+    if not isinstance(level, int):
+        raise ValueError(f"Unknown log level: {level!r}")
+    return level
+
+def set_level(level):
+    """
+    Set the level of all project loggers.
+
+    Args:
+        level (int | str): Level number or name, e.g. "TRACE", "DEBUG", "WARNING".
+    """
+    global print_statements, print_statements2, print_statements3
+    level = _level_number(level)
+    for name in _ROOT_LOGGERS:
+        logging.getLogger(name).setLevel(level)
+    print_statements = level <= logging.DEBUG
+    print_statements2 = level <= DEBUG2
+    print_statements3 = level <= TRACE
+
+def _configure():
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("(%(name)s) %(message)s"))
+    for name in _ROOT_LOGGERS:
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            logger.addHandler(handler)
+        logger.propagate = False
+    set_level(LOG_LEVEL)
+
+def _log(level, args, kwargs):
+    # Name of the module that called print_debug*, without the cost of inspect.getmodule
+    name = sys._getframe(2).f_globals.get("__name__", "__main__")
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = logging.getLogger(name)
+    logger.log(level, kwargs.get("sep", " ").join(map(str, args)))
 
 print_statements = True
 def print_debug(*args, **kwargs):
-    """Print debug statements if enabled."""
+    """Log debug statements at DEBUG if enabled."""
     if print_statements:
-        caller_frame = inspect.currentframe().f_back
-        caller_module = inspect.getmodule(caller_frame).__name__
-        print(f"({caller_module})", *args, **kwargs)
+        _log(logging.DEBUG, args, kwargs)
 
 print_statements2 = True
 def print_debug2(*args, **kwargs):
-    """Print debug statements if enabled."""
+    """Log debug statements at DEBUG2 if enabled."""
     if print_statements2:
-        caller_frame = inspect.currentframe().f_back
-        caller_module = inspect.getmodule(caller_frame).__name__
-        print(f"({caller_module})", *args, **kwargs)
+        _log(DEBUG2, args, kwargs)
 
 print_statements3 = True
 def print_debug3(*args, **kwargs):
-    """Print debug statements if enabled."""
+    """Log debug statements at TRACE if enabled."""
     if print_statements3:
-        caller_frame = inspect.currentframe().f_back
-        caller_module = inspect.getmodule(caller_frame).__name__
-        print(f"({caller_module})", *args, **kwargs)
+        _log(TRACE, args, kwargs)
+
+_configure()
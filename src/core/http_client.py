@@ -0,0 +1,145 @@
+"""Pooled HTTP client used by the scrapers to fetch pages from agilityplaza.com."""
+import asyncio
+import hashlib
+import threading
+import weakref
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .constants import HTTP_TIMEOUT, HTTP_RETRIES, HTTP_MAX_CONNECTIONS_PER_HOST
+from .debug_logger import get_logger, TRACE
+
+logger = get_logger(__name__)
+
+_session = None
+_session_lock = threading.Lock()
+_host_limits = weakref.WeakKeyDictionary()  # event loop -> {host: asyncio.Semaphore}
+_validators = {}  # url -> {"etag", "last_modified", "digest"} of the last 200 response
+_validators_lock = threading.Lock()
+
+def get_session():
+    """Return the shared keep-alive session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retries = Retry(
+                    total=HTTP_RETRIES,
+                    backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset(["GET"]),
+                    raise_on_status=False,
+                )
+                # pool_block makes extra threads wait for a free connection instead of opening more
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=HTTP_MAX_CONNECTIONS_PER_HOST,
+                    pool_block=True,
+                    max_retries=retries,
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+def _content_digest(content):
+    """Hash the table section of a page (or the whole body if there is no table).
+
+    Only the tables are parsed, so ignoring the rest of the page stops per-response
+    tokens in the header/footer from defeating the unchanged-body check.
+    """
+    start = content.find(b"<table")
+    end = content.rfind(b"</table>")
+    if start != -1 and end > start:
+        content = content[start:end]
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+def fetch(url, conditional=False):
+    """
+    Fetch a URL with the pooled session. Blocks the calling thread.
+
+    Validators (ETag, Last-Modified and a hash of the body) are stored for every
+    successful response. With `conditional=True` they are sent back to the server,
+    and None is returned if the page is unchanged (304, or an identical body), so the
+    caller can reuse whatever it parsed from the previous response.
+
+    Args:
+        url (str): URL to fetch.
+        conditional (bool): Send a conditional request. Only use this if the result of
+            the previous fetch of `url` is still available to the caller.
+
+    Returns:
+        bytes | None: The response body, or None if unchanged since the last fetch.
+
+    Raises:
+        ConnectionError: If the final response (after retries) is not 200 or 304.
+        requests.RequestException: If the request could not be completed.
+    """
+    headers = {}
+    with _validators_lock:
+        previous = _validators.get(url) if conditional else None
+    if previous:
+        if previous["etag"]:
+            headers["If-None-Match"] = previous["etag"]
+        if previous["last_modified"]:
+            headers["If-Modified-Since"] = previous["last_modified"]
+
+    logger.log(TRACE, "GET %s%s", url, ' (conditional)' if previous else '')
+    response = get_session().get(url, headers=headers, timeout=HTTP_TIMEOUT)
+    if response.status_code == 304 and previous:
+        logger.log(TRACE, "Not modified: %s", url)
+        return None
+    if response.status_code != 200:
+        raise ConnectionError(f"Failed to fetch URL: {url}. Status code: {response.status_code}")
+
+    content = response.content
+    digest = _content_digest(content)
+    with _validators_lock:
+        _validators[url] = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "digest": digest,
+        }
+    if previous and previous["digest"] == digest:
+        logger.log(TRACE, "Body unchanged: %s", url)
+        return None
+    return content
+
+def _host_limit(url):
+    host = urlsplit(url).netloc
+    loop_limits = _host_limits.setdefault(asyncio.get_running_loop(), {})
+    limit = loop_limits.get(host)
+    if limit is None:
+        limit = loop_limits[host] = asyncio.Semaphore(HTTP_MAX_CONNECTIONS_PER_HOST)
+    return limit
+
+async def fetch_async(url, conditional=False):
+    """
+    Fetch a URL without blocking the event loop.
+
+    The request runs on a worker thread using the pooled session; at most
+    `HTTP_MAX_CONNECTIONS_PER_HOST` requests per host are in flight at once.
+    See `fetch` for `conditional`.
+    """
+    async with _host_limit(url):
+        return await asyncio.to_thread(fetch, url, conditional)
+
+def forget(url):
+    """
+    Drop the stored validators of a URL, so its next conditional fetch returns the body.
+
+    Call this when a fetched body couldn't be used (e.g. it failed to parse), otherwise
+    the next fetch would report the page as unchanged and the failure would be hidden.
+    """
+    with _validators_lock:
+        _validators.pop(url, None)
+
+def close():
+    """Close the shared session and its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -1,7 +1,11 @@
 """Data models for the champPackage core module."""
+import numpy as np
+import pandas as pd
 from .debug_logger import *
 # from .plaza_resultsRunningOrder import import_running_orders
 
+logger = get_logger(__name__)
+
 class ClassInfo:
     def __init__(self, class_type, class_number = None, order = 0, running_orders_url = None, results_url = None):
         """information about a specific class within a show"""
@@ -20,6 +24,8 @@ class ClassInfo:
         self.results_df = None  # DataFrame to hold results
         self.eliminations = []  # List to hold eliminations
         self.running_orders_df = None  # DataFrame to hold running orders
+        self.queue_df = None  # DataFrame of the pairs still to run, see run_queue.still_to_run
+        self.stale_since = None  # time.time() the results were fetched, if served from storage before revalidation
 
     def __repr__(self):
         results_message = 0
@@ -70,8 +76,47 @@ class ClassInfo:
             "classID": self.classID,
             "eliminations_count": len(self.eliminations),
             "results_df_rows": len(self.results_df) if self.results_df is not None else 0,
+            "still_to_run": len(self.queue_df) if self.queue_df is not None else None,
+            "stale_since": self.stale_since,
+            "finish_eta_seconds": self.finish_eta(),
         }
 
+    def finish_eta(self):
+        """Seconds until the last pair still to run is expected to run, from the queue's ETAs, or None if not known."""
+        if self.queue_df is None or not len(self.queue_df):
+            return None
+        return float(self.queue_df['ETA_Seconds'].iloc[-1])
+
+# Columns of the combined final standings, in order
+STANDINGS_COLUMNS = [
+    'Rank_jumping', 'Name', 'Faults_jumping', 'Time_jumping', 'Rank_agility', 'Faults_agility', 'Time_agility',
+    'Combined_Points', 'Combined_Faults', 'Combined_Time',
+]
+
+# Columns of the standings that the others are derived from, compared to find changed rows
+_RESULT_COLUMNS = ['Rank_jumping', 'Faults_jumping', 'Time_jumping', 'Rank_agility', 'Faults_agility', 'Time_agility']
+
+def _changed_names(new, old):
+    """
+    Names of the rows added or changed, and of the rows removed, between two final standings.
+
+    Args:
+        new, old (dict): Column name -> array of two standings, one row per Name, as built by `Final.combine_dfs`.
+
+    Returns:
+        tuple: (changed or new names, removed names). Blank (NaN) on both sides counts as unchanged.
+    """
+    if not len(old['Name']):
+        return new['Name'].tolist(), []
+    positions = pd.Index(old['Name']).get_indexer(new['Name'])
+    same = positions >= 0
+    for column in _RESULT_COLUMNS:
+        new_values, old_values = new[column], old[column][positions]
+        same &= (new_values == old_values) | ((new_values != new_values) & (old_values != old_values))
+    kept = np.zeros(len(old['Name']), dtype=bool)
+    kept[positions[positions >= 0]] = True
+    return new['Name'][~same].tolist(), old['Name'][~kept].tolist()
+
 class Final:
     def __init__(self, jumpingClass: ClassInfo, agilityClass: ClassInfo):
         """information about the final show"""
@@ -80,6 +125,9 @@ class Final:
         
         self.status = self.update_status()
         self.final_results_df = None  # DataFrame to hold final combined results
+        self._columns = None  # Column name -> array of final_results_df, to diff the next final against
+        self.changed_rows = []  # Names of the rows added or changed since the previous final
+        self.removed_rows = []  # Names of the rows removed since the previous final
 
         self.jumpingWinner = jumpingClass.results_df.iloc[0]["Name"] if jumpingClass.results_df is not None else None
         self.agilityWinner = agilityClass.results_df.iloc[0]["Name"] if agilityClass.results_df is not None else None
@@ -98,8 +146,21 @@ class Final:
         else:
             self.status = 'not started'
 
-    def combine_dfs(self):
-        """Combine the results DataFrames of the jumping and agility classes, Only for pairs that aren't eliminated in either class."""
+    def combine_dfs(self, previous=None):
+        """
+        Combine the results DataFrames of the jumping and agility classes, Only for pairs that aren't eliminated in either class.
+
+        Expects the typed columns of `process_class_df`. Pairs are joined on 'Name' and ordered
+        by combined points, then combined faults, then combined time, then jumping rank and name.
+
+        Args:
+            previous (Final, optional): Earlier Final of the same two classes. `changed_rows` and
+                `removed_rows` are diffed against its standings (every row is changed without it),
+                and its standings are reused as they are if neither class's results changed.
+
+        Returns:
+            DataFrame: The combined results, also stored in `final_results_df`.
+        """
 
         # Load round dataframes
         jumping_df = self.jumpingClass.results_df
@@ -117,6 +178,13 @@ class Final:
                 missing_results.append("agility")
             raise ValueError(f"Missing results dataframes for: {', '.join(missing_results)}")
         
+        if (previous is not None and previous.final_results_df is not None
+                and previous._columns is not None and jumping_df is previous.jumpingClass.results_df and agility_df is previous.agilityClass.results_df):
+            # Both results reused unchanged from the cache
+            self.final_results_df, self._columns = previous.final_results_df, previous._columns
+            self.changed_rows, self.removed_rows = [], []
+            return self.final_results_df
+
         # Determine order of classes
         if self.jumpingClass.order < self.agilityClass.order:
             first_class = self.jumpingClass
@@ -125,25 +193,51 @@ class Final:
             first_class = self.agilityClass
             second_class = self.jumpingClass
 
-        print_debug("Combining results based on position...")
-        # Combine results, joining on 'Name' column (name of pair)
-        combined_df = jumping_df.merge(agility_df, on='Name', suffixes=('_jumping', '_agility'))
+        logger.debug("Combining results based on position...")
+        # Join on 'Name' (name of pair): position of each jumping pair in the agility results
+        jumping_names = jumping_df['Name'].to_numpy(dtype=object)
+        agility_names = agility_df['Name'].to_numpy(dtype=object)
+        jumping_index, agility_index = pd.Index(jumping_names), pd.Index(agility_names)
 
         # Check for duplicated in combined df
-        if combined_df['Name'].duplicated().any():
-            duplicated_names = combined_df[combined_df['Name'].duplicated()]['Name'].unique()
-            raise ValueError(f"Warning: Duplicated names found in combined results: {duplicated_names}")
+        if jumping_index.has_duplicates or agility_index.has_duplicates:
+            duplicated = jumping_index[jumping_index.duplicated()].union(agility_index[agility_index.duplicated()])
+            duplicated_names = duplicated[duplicated.isin(jumping_index) & duplicated.isin(agility_index)]
+            if len(duplicated_names):
+                raise ValueError(f"Warning: Duplicated names found in combined results: {duplicated_names.to_numpy()}")
+            unique = ~agility_index.duplicated()
+            positions = pd.Index(agility_names[unique]).get_indexer(jumping_names)
+            positions = np.where(positions >= 0, np.flatnonzero(unique)[positions], -1)
+        else:
+            positions = agility_index.get_indexer(jumping_names)
+        in_both = positions >= 0
+        jumping_rows, agility_rows = np.flatnonzero(in_both), positions[in_both]
 
-        combined_df['Combined_Points'] = combined_df['Rank_jumping'].astype(int) + combined_df['Rank_agility'].astype(int)
-        combined_df['Combined_Faults'] = combined_df['Faults_jumping'].astype(float) + combined_df['Faults_agility'].astype(float)
-        combined_df['Combined_Time'] = combined_df['Time_jumping'].astype(float) + combined_df['Time_agility'].astype(float)
+        # Typed columns from process_class_df, no conversion needed
+        columns = {}
+        for suffix, df, rows in (("jumping", jumping_df, jumping_rows), ("agility", agility_df, agility_rows)):
+            for column in ("Rank", "Faults", "Time"):
+                columns[f"{column}_{suffix}"] = df[column].to_numpy()[rows]
+        points = columns['Rank_jumping'] + columns['Rank_agility']
+        faults = columns['Faults_jumping'] + columns['Faults_agility']
+        time = columns['Time_jumping'] + columns['Time_agility']
 
-        # Drop unnecessary columns
-        combined_df.drop(columns=['Place (mobile)_jumping', 'Place (mobile)_agility', 'KC names_jumping', 'KC names_agility', 'Run Data_jumping', 'Run Data_agility'], inplace=True)
+        columns['Name'] = jumping_names[jumping_rows]
+        columns['Combined_Points'] = points
+        columns['Combined_Faults'] = faults
+        columns['Combined_Time'] = time
+
+        # Sort: points, then faults, then time (blank last), then jumping rank and name
+        order = np.lexsort((columns['Name'], columns['Rank_jumping'], np.nan_to_num(time, nan=np.inf),
+                            np.nan_to_num(faults, nan=np.inf), points))
+        self._columns = {column: columns[column][order] for column in STANDINGS_COLUMNS}
+        self.final_results_df = pd.DataFrame(self._columns)
+        if previous is not None and previous._columns is not None:
+            self.changed_rows, self.removed_rows = _changed_names(self._columns, previous._columns)
+        else:
+            self.changed_rows, self.removed_rows = self._columns['Name'].tolist(), []
+        return self.final_results_df
 
-        self.final_results_df = combined_df.sort_values("Combined_Points", ascending=True).reset_index(drop=True)
-        return combined_df
-        
     def to_dict(self):
         """Serialize Final to JSON-serializable dictionary."""
         return {
@@ -151,6 +245,8 @@ class Final:
             "agilityClass": self.agilityClass.to_dict(),
             "status": self.status,
             "final_results_df_rows": len(self.final_results_df) if self.final_results_df is not None else 0,
+            "changed_rows": self.changed_rows,
+            "removed_rows": self.removed_rows,
             "jumpingWinner": self.jumpingWinner,
             "agilityWinner": self.agilityWinner,
         }
@@ -211,12 +307,12 @@ if __name__ == "__main__":
     
     second_class.running_orders_df = import_running_orders(second_class, simulation=True)
 
-    print_debug(agility_class)
-    print_debug(jumping_class)
+    logger.debug("%s", agility_class)
+    logger.debug("%s", jumping_class)
 
     final = Final(jumping_class, agility_class)
     final.combine_dfs()
 
-    print_debug(final.final_results_df)
-    print_debug(f"Jumping Winner: {final.jumpingWinner}")
-    print_debug(f"Agility Winner: {final.agilityWinner}")
+    logger.debug("%s", final.final_results_df)
+    logger.debug("Jumping Winner: %s", final.jumpingWinner)
+    logger.debug("Agility Winner: %s", final.agilityWinner)
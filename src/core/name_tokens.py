@@ -0,0 +1,59 @@
+"""Handler and dog parts of Plaza pair names ("Handler & Dog"), and their search tokens."""
+import re
+import unicodedata
+import pandas as pd
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_APOSTROPHES = re.compile(r"['’`]")
+_KC_NAME = re.compile(r"\(([^()]*)\)\s*$")
+
+def split_names(names):
+    """
+    Split pair names into handler and dog, on the last " & " (handlers are sometimes two people).
+
+    Args:
+        names (Series): Pair names, e.g. "Max Glover & Sushi".
+
+    Returns:
+        DataFrame: Columns 'Handler' and 'Dog', same index as `names`. 'Dog' is empty if there's no " & ".
+    """
+    parts = names.fillna("").str.rsplit(" & ", n=1, expand=True)
+    if parts.shape[1] == 1:
+        parts[1] = None
+    parts.columns = ["Handler", "Dog"]
+    parts["Handler"] = parts["Handler"].str.strip()
+    parts["Dog"] = parts["Dog"].fillna("").str.strip()
+    return parts
+
+def registered_name(kc_name):
+    """Registered (KC) name of the dog from a "KC names" entry, e.g. "... & Sushi (Soldaze Dark Side)" -> "Soldaze Dark Side"."""
+    match = _KC_NAME.search(kc_name or "")
+    return match.group(1).strip() if match else ""
+
+def name_tokens(text):
+    """
+    Search tokens of a name: lower-case, accents and apostrophes dropped, split on anything else.
+
+    e.g. "Zoë O'Neill" -> ["zoe", "oneill"]
+    """
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _TOKEN.findall(_APOSTROPHES.sub("", text.lower()))
+
+def pair_tokens(names, kc_names=None):
+    """
+    Handler and dog tokens of each pair.
+
+    Args:
+        names (Series): Pair names.
+        kc_names (Series, optional): "KC names" of the same pairs, for the dogs' registered names.
+
+    Returns:
+        list: (handler tokens, dog tokens) per pair, as sets. Dog tokens include the registered name.
+    """
+    parts = split_names(names)
+    registered = kc_names.fillna("").map(registered_name) if kc_names is not None else pd.Series("", index=names.index)
+    return [
+        (set(name_tokens(handler)), set(name_tokens(dog)) | set(name_tokens(kc)))
+        for handler, dog, kc in zip(parts["Handler"], parts["Dog"], registered)
+    ]
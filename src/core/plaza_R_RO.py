@@ -1,4 +1,5 @@
 """Module for importing and parsing competition results and running order pages from agilityplaza.com. Returning pandas DataFrames of the main tables."""
+import asyncio
 import requests
 from bs4 import BeautifulSoup
 import os
@@ -6,15 +7,23 @@ from .debug_logger import *
 from .models import ClassInfo
 from urllib.parse import urljoin
 import pandas as pd
-from .plaza_scraper import get_soup
+from .table_extract import extract_table
+from .http_client import fetch, fetch_async, forget
 from .constants import PLAZA_RESULTS as base_url
 
+logger = get_logger(__name__)
+
 def read_from_file(filename="NorthDerbyShow.txt"):
     with open(filename, "r", encoding="utf-8") as f:      
         html = f.read()
     soup = BeautifulSoup(html, 'html.parser')
     return soup
 
+def read_bytes(filename):
+    """Read a saved HTML page as bytes, ready for `parse_results` / `parse_running_orders`."""
+    with open(filename, "rb") as f:
+        return f.read()
+
 def process_eliminations(eliminations_text):
     """Process elimination text into a list of eliminated competitors without their prior faults."""
     eliminations = []
@@ -46,7 +55,24 @@ def process_eliminations(eliminations_text):
     eliminations = [entry.split(" (")[0].strip() for entry in eliminations]
     return eliminations
 
+def _place_numbers(column):
+    """Integer places of a results column, e.g. "3" or "3(R)" -> 3. The regex only runs on the non-numeric cells."""
+    places = pd.to_numeric(column, errors="coerce")
+    text = places.isna()
+    if text.any():
+        places[text] = pd.to_numeric(column[text].str.extract(r'(\d+)', expand=False))
+    return places.astype("int64")
+
 def process_class_df(df):
+    """
+    Standardise the headers of a results DataFrame and parse its numeric columns once.
+
+    'Rank' and 'Place (mobile)' become int64, 'Faults' and 'Time' float64 (NaN when blank),
+    so later stages like `Final.combine_dfs` don't need to convert them again.
+
+    Returns:
+        tuple: (df, status) where status is "completed" if the table has final places, else "in progress".
+    """
     headers = df.columns.tolist()
     wanted_headers = ['Rank', 'Place (mobile)', 'KC names', 'Name', 'Run Data', 'Faults', 'Time']
     status = "in progress"
@@ -56,15 +82,63 @@ def process_class_df(df):
         status = "completed"
 
     # Remove any non numbers from Rank column
-    df['Rank'] = df['Rank'].astype(str).str.extract('(\d+)').astype(int)
-    df['Place (mobile)'] = df['Place (mobile)'].astype(str).str.extract('(\d+)').astype(int)
-    
+    df['Rank'] = _place_numbers(df['Rank'])
+    df['Place (mobile)'] = _place_numbers(df['Place (mobile)'])
+    df['Faults'] = pd.to_numeric(df['Faults'], errors="coerce").astype("float64")
+    df['Time'] = pd.to_numeric(df['Time'], errors="coerce").astype("float64")
+
     return df, status
 
 
+def _validate_results_class(show_class):
+    """Check that a ClassInfo object has what `import_results` needs to fetch its results."""
+    # Validate input parameters
+    if not show_class:
+        raise ValueError("show_class parameter cannot be None")
+    
+    if not hasattr(show_class, 'results_url'):
+        raise ValueError("show_class must have a results_url attribute")
+    
+    # Handle case where results_url is None - return None, None gracefully
+    if show_class.results_url is None:
+        raise ValueError(f"No results URL provided from {show_class.class_type} - returning None, None. Class status: {show_class.status}")
+    
+    # Check for empty string URL
+    if not show_class.results_url.strip():
+        raise ValueError("show_class results_url cannot be empty string")
+    
+    if not hasattr(show_class, 'class_type') or not show_class.class_type:
+        raise ValueError("show_class must have a valid class_type attribute")
+
+def _read_results_simulation(show_class):
+    """Load the saved results page of the simulation show for the class type."""
+    # Load results from local simulation files
+    logger.log(TRACE, "Loading simulation data for class type: %s", show_class.class_type)
+    
+    if show_class.class_type.lower() == "agility":
+        agility_url = os.path.join("NorthDerbySaves", "NorthDerbyShow_LgeAg_compeleted.html")
+        try:
+            simulation_content = read_bytes(agility_url)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Simulation file '{agility_url}' not found")
+    elif show_class.class_type.lower() == "jumping":
+        jumping_url = os.path.join("NorthDerbySaves", "NorthDerbyShow_LgeJmp_incomplete.html")
+        try:
+            simulation_content = read_bytes(jumping_url)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Simulation file '{jumping_url}' not found")
+    else:
+        raise ValueError(f"Unsupported class type for simulation: '{show_class.class_type}'. "
+                       f"Supported types are: 'agility', 'jumping'")
+    return simulation_content
+
 def import_results(show_class, simulation=False):
     """
     Imports and parses competition results from a web page or local file.
+
+    If `show_class.results_df` already holds parsed results, a conditional request is
+    sent and, when the page is unchanged, the existing results are returned without
+    re-parsing.
     
     Args:
         show_class (ClassInfo): The ClassInfo object containing the results URL and class type.
@@ -82,140 +156,114 @@ def import_results(show_class, simulation=False):
         FileNotFoundError: If simulation file is not found
         RuntimeError: If table parsing fails unexpectedly
     """
-    # Validate input parameters
-    if not show_class:
-        raise ValueError("show_class parameter cannot be None")
-    
-    if not hasattr(show_class, 'results_url'):
-        raise ValueError("show_class must have a results_url attribute")
-    
-    # Handle case where results_url is None - return None, None gracefully
-    if show_class.results_url is None:
-        raise ValueError(f"No results URL provided from {show_class.class_type} - returning None, None. Class status: {show_class.status}")
-    
-    # Check for empty string URL
-    if not show_class.results_url.strip():
-        raise ValueError("show_class results_url cannot be empty string")
-    
-    if not hasattr(show_class, 'class_type') or not show_class.class_type:
-        raise ValueError("show_class must have a valid class_type attribute")
-   
-    soup = None
-    
+    _validate_results_class(show_class)
+
     if not simulation:
         # Fetch results from web
-        print_debug3(f"Fetching results from URL: {show_class.results_url}")
+        logger.log(TRACE, "Fetching results from URL: %s", show_class.results_url)
         try:
-            soup = get_soup(show_class.results_url)
+            content = fetch(show_class.results_url, conditional=show_class.results_df is not None)
         except Exception as e:
             raise RuntimeError(f"Failed to fetch results from {show_class.results_url}: {e}")
+        if content is None:
+            return _unchanged_results(show_class)
     else:
-        # Load results from local simulation files
-        print_debug3(f"Loading simulation data for class type: {show_class.class_type}")
-        
-        if show_class.class_type.lower() == "agility":
-            agility_url = os.path.join("NorthDerbySaves", "NorthDerbyShow_LgeAg_compeleted.html")
-            try:
-                simulation_soup = read_from_file(agility_url)
-            except FileNotFoundError:
-                raise FileNotFoundError(f"Simulation file '{agility_url}' not found")
-        elif show_class.class_type.lower() == "jumping":
-            jumping_url = os.path.join("NorthDerbySaves", "NorthDerbyShow_LgeJmp_incomplete.html")
-            try:
-                simulation_soup = read_from_file(jumping_url)
-            except FileNotFoundError:
-                raise FileNotFoundError(f"Simulation file '{jumping_url}' not found")
-        else:
-            raise ValueError(f"Unsupported class type for simulation: '{show_class.class_type}'. "
-                           f"Supported types are: 'agility', 'jumping'")
-        
-        soup = simulation_soup
-
-    if not soup:
-        raise RuntimeError("Failed to create BeautifulSoup object from HTML content")
-
-    # Find and parse the results table
-    table = soup.find('table')
-    if not table:
-        raise ValueError("No HTML table found in the results page. "
-                        "The page structure may have changed or the URL may be incorrect.")
-    
-    print_debug3("Table found, extracting data...")
-    
-    # Extract all table rows
-    rows = table.find_all('tr')
-    if len(rows) < 2:
-        raise ValueError(f"Table has insufficient rows ({len(rows)}). "
-                        f"Expected at least 2 rows (header + data), but found {len(rows)}")
-    
-    table_data = []
-    for i, row in enumerate(rows):
-        row_data = []
-        cells = row.find_all('td')
-        
-        # Skip header row (typically has 'th' elements instead of 'td')
-        if not cells and i == 0:
-            continue
-            
-        for cell in cells:
-            cell_text = cell.get_text().strip()
-            row_data.append(cell_text)
-        
-        if row_data:  # Only add non-empty rows
-            table_data.append(row_data)
-    
-    if len(table_data) < 2:
-        raise ValueError(f"Insufficient data rows found ({len(table_data)}). "
-                        f"Expected at least 2 rows (data + eliminations)")
+        content = _read_results_simulation(show_class)
+
+    return _parse_fetched(parse_results, content, show_class, None if simulation else show_class.results_url)
+
+async def import_results_async(show_class, simulation=False):
+    """
+    Non-blocking version of `import_results` for use inside async API handlers.
+
+    The page is fetched through the pooled async client and parsed on a worker thread,
+    so the event loop stays free while results are imported.
+    """
+    _validate_results_class(show_class)
+
+    if not simulation:
+        logger.log(TRACE, "Fetching results from URL: %s", show_class.results_url)
+        try:
+            content = await fetch_async(show_class.results_url, conditional=show_class.results_df is not None)
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch results from {show_class.results_url}: {e}")
+        if content is None:
+            return _unchanged_results(show_class)
+    else:
+        content = await asyncio.to_thread(_read_results_simulation, show_class)
+
+    url = None if simulation else show_class.results_url
+    return await asyncio.to_thread(_parse_fetched, parse_results, content, show_class, url)
+
+def _parse_fetched(parse, content, show_class, url=None):
+    """
+    Parse a fetched page with `parse(content, show_class)`.
+
+    If parsing fails the validators stored for `url` are dropped, so the next conditional
+    fetch downloads and parses the page again instead of reusing older results as unchanged.
+    """
+    try:
+        return parse(content, show_class)
+    except Exception:
+        if url:
+            forget(url)
+        raise
+
+def _unchanged_results(show_class):
+    """Results tuple built from the already parsed results of `show_class` (page unchanged since)."""
+    logger.log(TRACE, "Results page unchanged, reusing parsed %s results", show_class.class_type)
+    return show_class.results_df, show_class.eliminations, show_class.status
+
+def parse_results(content, show_class):
+    """
+    Parse the results table of a class results page.
+
+    Args:
+        content (bytes): HTML of the results page.
+        show_class (ClassInfo): The class the page belongs to.
+
+    Returns:
+        tuple: (df, eliminations, status), see `import_results`.
+    """
+    if not content:
+        raise RuntimeError("No HTML content to parse")
+
+    headers, columns, footer = extract_table(content)
+    logger.log(TRACE, "Table found, extracting data...")
 
-    # Extract and process table headers
-    headers = table.find_all('th')
     if not headers:
         raise ValueError("No table headers (th elements) found. Cannot determine column structure.")
-    
-    header_row = [header.get_text().strip() for header in headers]
-    if not header_row or not any(header_row):
+    if not any(headers):
         raise ValueError("All table headers are empty. Cannot create meaningful DataFrame columns.")
-    
+
     # Add custom headers for mobile compatibility and KC names
-    header_row = header_row[:1] + ["Place (mobile)", "KC names"] + header_row[1:]
-    print_debug3(f"Table headers: {header_row}")
+    header_row = headers[:1] + ["Place (mobile)", "KC names"] + headers[1:]
+    logger.log(TRACE, "Table headers: %s", header_row)
 
-    # Validate data structure before creating DataFrame
-    data_rows = table_data[:-1]  # All rows except the last (eliminations)
-    if not data_rows:
+    if not columns or not columns[0]:
         raise ValueError("No data rows found after excluding elimination row")
-    
-    # Check if all data rows have consistent column count
+
+    # Pad or trim columns to match header length
     expected_columns = len(header_row)
-    for i, row in enumerate(data_rows):
-        if len(row) != expected_columns:
-            print_debug3(f"Warning: Row {i} has {len(row)} columns, expected {expected_columns}")
-            # Pad or trim row to match header length
-            if len(row) < expected_columns:
-                row.extend([''] * (expected_columns - len(row)))
-            else:
-                row = row[:expected_columns]
-            data_rows[i] = row
+    if len(columns) != expected_columns:
+        logger.log(TRACE, "Warning: Table has %s columns, expected %s", len(columns), expected_columns)
+        columns = columns[:expected_columns] + [[''] * len(columns[0])] * (expected_columns - len(columns))
 
     try:
-        df = pd.DataFrame(data_rows, columns=header_row)
-        print_debug3(f"DataFrame created with {len(df)} rows and {len(df.columns)} columns")
+        df = pd.DataFrame(dict(zip(header_row, columns)))
+        logger.log(TRACE, "DataFrame created with %s rows and %s columns", len(df), len(df.columns))
     except Exception as e:
         raise RuntimeError(f"Failed to create pandas DataFrame: {e}")
 
     # Parse elimination data from the last row
-    elimination_row = table_data[-1]
+    elimination_row = footer
     if not elimination_row:
-        raise ValueError("Last table row (eliminations) is empty")
-    
-    if len(elimination_row) == 0:
-        print_debug3("No elimination data found in last table row")
+        logger.log(TRACE, "No elimination data found in last table row")
         eliminations = []
     else:
         eliminations_raw = elimination_row[0]
         if not eliminations_raw or not eliminations_raw.strip():
-            print_debug3("Elimination cell is empty")
+            logger.log(TRACE, "Elimination cell is empty")
             eliminations = []
         else:
             # Clean up the elimination text
@@ -230,7 +278,7 @@ def import_results(show_class, simulation=False):
                 # eliminations = [entry.strip() for entry in eliminations_text.split(",") if entry.strip()]
                 eliminations = process_eliminations(eliminations_text)
             
-            print_debug3(f"Parsed {len(eliminations)} eliminations")
+            logger.log(TRACE, "Parsed %s eliminations", len(eliminations))
 
     # Final validation
     if df.empty:
@@ -241,22 +289,14 @@ def import_results(show_class, simulation=False):
     assert isinstance(eliminations, list), "Eliminations should be a list"
     assert isinstance(status, str), "Status should be a string"
     # Output summary information
-    print_debug3(f"Results DataFrame for {show_class.class_type}:\n", df.head())
-    print_debug3(f"Eliminations array ({len(eliminations)} entries): {eliminations[:3] if len(eliminations) >= 3 else eliminations}")
+    if logger.isEnabledFor(TRACE):
+        logger.log(TRACE, "Results DataFrame for %s:\n%s", show_class.class_type, df.head())
+    logger.log(TRACE, "Eliminations array (%s entries): %s", len(eliminations), eliminations[:3])
 
     return df, eliminations, status
 
-def import_running_orders(show_class, simulation=False):
-    """
-    Imports and parses running orders from a web page or local file.
-    
-    Args:
-        show_class (ClassInfo): The ClassInfo object containing the running orders URL and class type.
-        simulation (bool): If True, reads from local HTML files instead of web scraping.
-    
-    Returns:
-        DataFrame: pandas DataFrame with running orders and withdrawn status.
-    """
+def _validate_running_orders_class(show_class):
+    """Check that a ClassInfo object has what `import_running_orders` needs. Returns False if it has no running orders URL."""
     # Validate input parameters
     if not show_class:
         raise ValueError("show_class parameter cannot be None")
@@ -264,10 +304,10 @@ def import_running_orders(show_class, simulation=False):
     if not hasattr(show_class, 'running_orders_url'):
         raise ValueError("show_class must have a running_orders_url attribute")
     
-    # Handle case where run is None - return None, None gracefully
+    # Handle case where run is None - return False gracefully
     if show_class.running_orders_url is None:
-        print_debug3(f"No running order URL provided from {show_class.class_type} - returning None. Class status: {show_class.status}")
-        return None, None
+        logger.log(TRACE, "No running order URL provided from %s - returning None. Class status: %s", show_class.class_type, show_class.status)
+        return False
     
     # Check for empty string URL
     if not show_class.running_orders_url.strip():
@@ -275,96 +315,112 @@ def import_running_orders(show_class, simulation=False):
     
     if not hasattr(show_class, 'class_type') or not show_class.class_type:
         raise ValueError("show_class must have a valid class_type attribute")
+    return True
+
+def _read_running_orders_simulation(show_class):
+    """Load the saved running orders page of the simulation show for the class type."""
+    # Load results from local simulation files
+    logger.log(TRACE, "Loading simulation data for class type: %s", show_class.class_type)
+    
+    if show_class.class_type.lower() == "agility":
+        raise ValueError("No simulation file available for agility running orders")
+    elif show_class.class_type.lower() == "jumping":
+        try:
+            simulation_content = read_bytes("NorthDerbySaves/NorthDerbyRunningOrders_LgeJmp.html")
+        except FileNotFoundError:
+            raise FileNotFoundError("Simulation file 'NorthDerbySaves/NorthDerbyRunningOrders_LgeJmp.html' not found")
+    else:
+        raise ValueError(f"Unsupported class type for simulation: '{show_class.class_type}'. "
+                       f"Supported types are: 'agility', 'jumping'")
+    return simulation_content
+
+def import_running_orders(show_class, simulation=False):
+    """
+    Imports and parses running orders from a web page or local file.
     
-    soup = None
+    Args:
+        show_class (ClassInfo): The ClassInfo object containing the running orders URL and class type.
+        simulation (bool): If True, reads from local HTML files instead of web scraping.
     
+    Returns:
+        DataFrame: pandas DataFrame with running orders and withdrawn status.
+    """
+    if not _validate_running_orders_class(show_class):
+        return None, None
+
     if not simulation:
         # Fetch results from web
-        print_debug3(f"Fetching results from URL: {show_class.running_orders_url}")
+        logger.log(TRACE, "Fetching results from URL: %s", show_class.running_orders_url)
         try:
-            response = requests.get(show_class.running_orders_url)
-            response.raise_for_status()  # Raises requests.HTTPError for bad status codes
-            soup = BeautifulSoup(response.content, 'html.parser')
-        except requests.RequestException as e:
+            content = fetch(show_class.running_orders_url)
+        except (requests.RequestException, ConnectionError) as e:
             raise requests.RequestException(f"Failed to fetch results from {show_class.running_orders_url}: {e}")
     else:
-        # Load results from local simulation files
-        print_debug3(f"Loading simulation data for class type: {show_class.class_type}")
-        
-        if show_class.class_type.lower() == "agility":
-            raise ValueError("No simulation file available for agility running orders")
-        elif show_class.class_type.lower() == "jumping":
-            try:
-                simulation_soup = read_from_file("NorthDerbySaves/NorthDerbyRunningOrders_LgeJmp.html")
-            except FileNotFoundError:
-                raise FileNotFoundError("Simulation file 'NorthDerbySaves/NorthDerbyRunningOrders_LgeJmp.html' not found")
-        else:
-            raise ValueError(f"Unsupported class type for simulation: '{show_class.class_type}'. "
-                           f"Supported types are: 'agility', 'jumping'")
-        
-        soup = simulation_soup
-
-    if not soup:
-        raise RuntimeError("Failed to create BeautifulSoup object from HTML content")
-
-    # Find and parse the results table
-    table = soup.find('table')
-    if not table:
-        raise ValueError("No HTML table found in the results page. "
-                        "The page structure may have changed or the URL may be incorrect.")
-    
-    print_debug3("Table found, extracting data...")
-    
-    # Extract all table rows
-    rows = table.find_all('tr')
-    if len(rows) < 2:
-        raise ValueError(f"Table has insufficient rows ({len(rows)}). "
-                        f"Expected at least 2 rows (header + data), but found {len(rows)}")
-    
-    table_data = []
-    for i, row in enumerate(rows):
-        row_data = []
-        cells = row.find_all('td')
-        
-        # Skip header row (typically has 'th' elements instead of 'td')
-        if not cells and i == 0:
-            continue
-            
-        for cell in cells:
-            cell_text = cell.get_text().strip()
-            row_data.append(cell_text)
-            
-        
-        if row_data:  # Only add non-empty rows
-            table_data.append(row_data)
-    
-    if len(table_data) < 2:
-        raise ValueError(f"Insufficient data rows found ({len(table_data)}). "
-                        f"Expected at least 2 rows (data + eliminations)")
+        content = _read_running_orders_simulation(show_class)
+
+    return _parse_fetched(parse_running_orders, content, show_class, None if simulation else show_class.running_orders_url)
+
+async def import_running_orders_async(show_class, simulation=False):
+    """
+    Non-blocking version of `import_running_orders` for use inside async API handlers.
+
+    If `show_class.running_orders_df` is already set, the page is revalidated with a
+    conditional request and the parsed running orders are reused when it is unchanged.
+    """
+    if not _validate_running_orders_class(show_class):
+        return None, None
+
+    if not simulation:
+        logger.log(TRACE, "Fetching results from URL: %s", show_class.running_orders_url)
+        try:
+            content = await fetch_async(show_class.running_orders_url, conditional=show_class.running_orders_df is not None)
+        except (requests.RequestException, ConnectionError) as e:
+            raise requests.RequestException(f"Failed to fetch results from {show_class.running_orders_url}: {e}")
+        if content is None:
+            logger.log(TRACE, "Running orders page unchanged, reusing parsed %s running orders", show_class.class_type)
+            return show_class.running_orders_df
+    else:
+        content = await asyncio.to_thread(_read_running_orders_simulation, show_class)
+
+    url = None if simulation else show_class.running_orders_url
+    return await asyncio.to_thread(_parse_fetched, parse_running_orders, content, show_class, url)
+
+def parse_running_orders(content, show_class):
+    """Parse the running orders table of a class running orders page into a DataFrame with a `Withdrawn` column."""
+    if not content:
+        raise RuntimeError("No HTML content to parse")
+
+    headers, columns, footer = extract_table(content)
+    logger.log(TRACE, "Table found, extracting data...")
 
-    # Extract and process table headers
-    headers = table.find_all('th')
     if not headers:
         raise ValueError("No table headers (th elements) found. Cannot determine column structure.")
-    
-    header_row = [header.get_text().strip() for header in headers]
-    header_row = header_row
-    print_debug3(f"Table headers: {header_row}")
+    logger.log(TRACE, "Table headers: %s", headers)
+
+    if footer is not None:
+        # Running orders have no footer row, keep a narrower last row as data
+        columns = [column + [footer[i] if i < len(footer) else ''] for i, column in enumerate(columns)]
+
+    if len(columns[0]) < 2:
+        raise ValueError(f"Insufficient data rows found ({len(columns[0])}). "
+                        f"Expected at least 2 rows")
 
     try:
-        df = pd.DataFrame(table_data, columns=header_row)
-        print_debug3(f"DataFrame created with {len(df)} rows and {len(df.columns)} columns")
+        df = pd.DataFrame(dict(zip(headers, columns)))
+        logger.log(TRACE, "DataFrame created with %s rows and %s columns", len(df), len(df.columns))
     except Exception as e:
         raise RuntimeError(f"Failed to create pandas DataFrame: {e}")
 
     # Check for 'Withdrawn' in 'Name' column. Add a 'Withdrawn' column if found.
     if 'Name' in df.columns:
-        df['Withdrawn'] = df['Name'].apply(lambda x: 'Yes' if 'Withdrawn' in x else 'No')
-        df['Name'] = df['Name'].str.replace('(Withdrawn)', '').str.strip()
+        withdrawn = df['Name'].str.contains('Withdrawn', regex=False)
+        df['Withdrawn'] = withdrawn.map({True: 'Yes', False: 'No'})
+        df['Name'] = df['Name'].str.replace('(Withdrawn)', '', regex=False).str.strip()
     else:
-        print_debug3("No 'Name' column found; cannot determine withdrawals")
+        logger.log(TRACE, "No 'Name' column found; cannot determine withdrawals")
 
-    print_debug3(f"Running Orders DataFrame for {show_class.class_type}:\n", df.head())
+    if logger.isEnabledFor(TRACE):
+        logger.log(TRACE, "Running Orders DataFrame for %s:\n%s", show_class.class_type, df.head())
     return df
 
 if __name__ == "__main__":
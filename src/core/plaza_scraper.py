@@ -1,16 +1,18 @@
 """Webscraper for agilityplaza.com to find show URLs and championship classes."""
-import requests
+import asyncio
 import numpy as np
 from bs4 import BeautifulSoup
-from src.core.models import ClassInfo
-from src.core.debug_logger import print_debug, print_debug2, print_debug3
+from src.core.debug_logger import get_logger
 from src.core.constants import *
-from src.core.KC_ShowProcesser import is_close_match
+from src.core.http_client import fetch, fetch_async
+from src.core.show_directory import MONTHS, get_show_directory
+from src.core.show_catalogue import ShowCatalogue
 # from src.core.KC_ShowProcesser import find_closest_shows, check_show_in_closest, is_close_match
-from urllib.parse import urljoin
 import pandas as pd
 from .constants import PLAZA_RESULTS as base_url
 
+logger = get_logger(__name__)
+
 def find_show_url(show_name, show_date):
     """
     Find the URL of a show given its name.
@@ -31,83 +33,31 @@ def find_show_url(show_name, show_date):
 
     # Extract year, month, day from show_date
     show_year, show_month, show_day = pd.to_datetime(show_date).year, pd.to_datetime(show_date).month, pd.to_datetime(show_date).day
-    print_debug(f"Searching for show '{show_name}' on date {show_year}-{show_month:02d}-{show_day:02d}")
-
-    month_map = {1: "January", 2: "February", 3: "March", 4: "April",
-                5: "May", 6: "June", 7: "July", 8: "August",
-                9: "September", 10: "October", 11: "November", 12: "December"}
-    
-    # Fetch the main results page
-    search_URL = base_url + str(show_year)
-    print_debug(f"Fetching Agility Plaza page for year {show_year} from URL: {search_URL}")
-    
-    soup = get_soup(search_URL)
-
-    # Finding the month section
-    target_month = month_map[show_month]
-    monthly_soup = soup.find_all('thead')
-    found_month = False
-    for i, month in enumerate(monthly_soup):
-        if target_month in month.get_text():
-            print_debug(f"Found month section for {target_month}.")
-            found_month = True
-            break
-    if not found_month:
-        raise ValueError(f"Month '{target_month}' not found on Agility Plaza for year {show_year}.")
+    logger.debug("Searching for show '%s' on date %s-%02d-%02d", show_name, show_year, show_month, show_day)
 
-    # Finding the specific show within the month
-    show_rows = month.find_next_siblings('tr')
-    # Search for exact match first, then close match
-    # Normalize abbreviations for matching
-    abbreviations = {
-        "kennel club international agility festival": "kciaf",
-        "dogs in need agility society": "dinas",
-        # Add more abbreviations as needed
-    }
-    def normalize(name):
-        name = name.strip().lower()
-        return abbreviations.get(name, name)
+    target_month = MONTHS[show_month - 1]
+    directory = get_show_directory(show_year)
 
-    target_norm = normalize(show_name)
-    # First pass: exact and abbreviation match
-    for row in show_rows:
-        columns = row.find_all('td')
-        if len(columns) >= 2:
-            row_name = columns[1].get_text(strip=True)
-            row_norm = normalize(row_name)
-            if target_norm == row_norm:
-                print_debug(f"Found exact/abbreviation match: {row_name}")
-                link = row.get('data-href')
-                if link:
-                    print_debug(f"Found link: {link}")
-                    return urljoin(base_url, link)
-                else:
-                    print_debug("No link found in data-href.")
-                    break
+    # Resolve from the saved index first, only fetch the year page if the show could be new
+    url = directory.find(show_name, target_month) if target_month in directory.months else None
+    if url is None and directory.needs_refresh(target_month):
+        search_URL = base_url + str(show_year)
+        logger.debug("Fetching Agility Plaza page for year %s from URL: %s", show_year, search_URL)
+        directory.update(get_soup(search_URL))
+        if target_month in directory.months:
+            url = directory.find(show_name, target_month)
 
-    # Second pass: substring and fuzzy match
-    for row in show_rows:
-        columns = row.find_all('td')
-        if len(columns) >= 2:
-            row_name = columns[1].get_text(strip=True)
-            row_norm = normalize(row_name)
-            # Substring or fuzzy match
-            if (target_norm in row_norm) or (row_norm in target_norm) or is_close_match(show_name, row_name):
-                print_debug(f"Found close match: {row_name}")
-                link = row.get('data-href')
-                if link:
-                    print_debug(f"Found link: {link}")
-                    return urljoin(base_url, link)
-                else:
-                    print_debug("No link found in data-href.")
-                    break
-
-    # If no show found, raise an error
-    raise ValueError(f"Show name '{show_name}' not found in the month section on Agility Plaza.")
+    if target_month not in directory.months:
+        raise ValueError(f"Month '{target_month}' not found on Agility Plaza for year {show_year}.")
+    if url is None:
+        # If no show found, raise an error
+        raise ValueError(f"Show name '{show_name}' not found in the month section on Agility Plaza.")
+    logger.debug("Found link: %s", url)
+    return url
 
 def find_champ_classes(soup, height):
     """
-    Finds all championship classes in the given BeautifulSoup object.
+    Finds all championship classes in the given BeautifulSoup object, see `ShowCatalogue.champ_classes`.
 
     Args:
         soup (BeautifulSoup): The BeautifulSoup object to search.
@@ -116,92 +66,7 @@ def find_champ_classes(soup, height):
     Returns:
         tuple: A tuple containing two ClassInfo objects (agility_class, jumping_class)."""
 
-    height_list = ['lge', 'int', 'med', 'sml']
-    if height.lower() not in height_list:
-        raise ValueError(f"Height must be one of these: {height_list}.")
-
-    # Headers on Plaza
-    headers = soup.find_all('div', class_='card-header')
-
-    agility_class = ClassInfo("agility")
-    jumping_class = ClassInfo("jumping")
-    found_classes = 0
-    # Find the running orders if availiable
-    for header in headers:
-        header_text = header.get_text(strip=True).lower()
-
-        # Look for running orders
-        if header_text == "running orders":
-            card = header.find_parent('div', class_='card')
-            if card:
-                for span in card.find_all('span'):
-                    text = span.get_text(strip=True)
-                    print_debug2(f"Found running orders text: {text}")
-                    if "championship" in text.lower() and height.lower() in text.lower():
-                        # Store the class number and type
-                        class_number,_,_,class_type = text.split(" ")
-
-                        # Get the URL
-                        link_tag = span.find_parent('a')
-                        if link_tag and link_tag.has_attr('href'):
-                            link = link_tag['href']
-                        else:
-                            raise ValueError(f"No link found for running orders of {text}")
-                        if "Jumping" in text:
-                            jumping_class.class_number = class_number
-                            jumping_class.class_type = class_type
-                            jumping_class.running_orders_url = "https://www.agilityplaza.com" + link
-                            
-                        elif "Agility" in text:
-                            agility_class.class_number = class_number
-                            agility_class.class_type = class_type
-                            agility_class.running_orders_url = "https://www.agilityplaza.com" + link
-                        found_classes += 1
-                        print_debug2(f"Class number: {class_number}, Class type: {class_type}, link: {link}")
-                        
-        else:
-            # Each card block contains a table for the days results
-            card_block = header.find_next_sibling('div', class_='card-block')
-            if card_block:
-                print_debug2(f"Found card block for header: {header_text}")
-            else:
-                print_debug2(f"No card block found for header: {header_text}")
-                continue
-
-            for a in card_block.find_all('a'):
-                text = a.get_text(strip=True)
-                if "Championship Jumping" in text and height.lower() in text.lower():
-                    name = text
-                    link = "https://www.agilityplaza.com" + a.get('href')
-
-                    # Store information in the class object
-                    jumping_class.class_number,_,_,jumping_class.class_type = name.split(" ")
-                    jumping_class.results_url = link
-
-                    found_classes += 1
-                    print_debug2(f"Found Championship Jumping class: {name}, link: {link}")
-
-                elif "Championship Agility" in text and height.lower() in text.lower():
-                    name = text
-                    link = "https://www.agilityplaza.com" + a.get('href')
-
-                    # Store information in the class object
-                    agility_class.class_number,_,_,agility_class.class_type = name.split(" ")
-                    agility_class.results_url = link
-
-                    found_classes += 1
-                    print_debug2(f"Found Championship Agility class: {name}, link: {link}")
-
-    if found_classes == 0:
-        raise ValueError(f"No championship class found for height '{height.capitalize()}'.")
-    # Update status and order
-    agility_class.update_status()
-    jumping_class.update_status()
-    agility_class.update_order(jumping_class)
-    print_debug2(f"Agility Class Info: {agility_class}")
-    print_debug2(f"Jumping Class Info: {jumping_class}")        
-
-    return agility_class, jumping_class
+    return ShowCatalogue.from_soup(soup).champ_classes(height)
 
 def find_champClass_fromIDs(agilityID, jumpingID):
     """Find championship classes based on their IDs.
@@ -246,12 +111,15 @@ def extract_class_id(class_link):
 
 def get_soup(url):
     """Fetches the content of a URL and returns a BeautifulSoup object."""
-    response = requests.get(url)
-    if response.status_code != 200:
-        raise ConnectionError(f"Failed to fetch URL: {url}. Status code: {response.status_code}")
-    show_soup = BeautifulSoup(response.content, 'html.parser')
+    show_soup = BeautifulSoup(fetch(url), 'html.parser')
     return show_soup
 
+async def get_soup_async(url):
+    """Fetches the content of a URL without blocking the event loop and returns a BeautifulSoup object."""
+    content = await fetch_async(url)
+    # Parsing is CPU bound, keep it off the event loop as well
+    return await asyncio.to_thread(BeautifulSoup, content, 'html.parser')
+
 if __name__ == "__main__":
     from .KC_ShowProcesser import find_closest_shows, check_show_in_closest
     test_show_name = "North Derbyshire Dog Agility Club"
@@ -264,7 +132,7 @@ if __name__ == "__main__":
     print("\n==== Testing Show URL Finder ====")
     try:
         show_url = find_show_url(test_show_name, matched_showDate)
-        print_debug(f"Show URL for '{test_show_name}': {show_url}")
+        logger.debug("Show URL for '%s': %s", test_show_name, show_url)
     except ValueError as e:
         raise ValueError(str(e))
 
@@ -275,7 +143,7 @@ if __name__ == "__main__":
     show_soup = get_soup(show_url)
     try:
         agility_class, jumping_class = find_champ_classes(show_soup, height)
-        print_debug(f"Agility Class: {agility_class}")
-        print_debug(f"Jumping Class: {jumping_class}")
+        logger.debug("Agility Class: %s", agility_class)
+        logger.debug("Jumping Class: %s", jumping_class)
     except ValueError as e:
         raise ValueError(str(e))
\ No newline at end of file
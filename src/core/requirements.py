@@ -0,0 +1,137 @@
+"""What each pair needs in the second round of a championship to make the final, computed for all pairs at once."""
+import numpy as np
+import pandas as pd
+from .constants import FINAL_CUTOFF
+from .debug_logger import get_logger, TRACE
+
+logger = get_logger(__name__)
+
+REQUIREMENT_COLUMNS = [
+    "Name", "Rank_first", "Rank_second", "Points", "Best_Points", "Worst_Points",
+    "Position", "Required_Place", "Outlook",
+]
+
+def required_places(first_df, second_df=None, running_orders_df=None, second_eliminations=(), cutoff=FINAL_CUTOFF):
+    """
+    Work out, for every pair placed in the first (completed) round, where they stand for the final.
+
+    Combined points are the sum of a pair's places in the two rounds, lowest first, and
+    the best `cutoff` pairs make the final. Pairs placed in the second round so far are
+    the current standings. Every other pair of the first round is still to run, unless
+    they are eliminated in the second round, or withdrawn / missing from its running
+    order when one is given.
+
+    For a pair still to run, `Required_Place` is the lowest second round place that keeps
+    them within the cut-off against the standings so far: placing p moves every pair
+    currently placed p or lower down one place. Pairs on equal points are counted
+    against them, as faults and time would decide. 0 means even winning isn't enough,
+    one more than the places taken so far means any placing will do.
+
+    Best/worst points assume the pairs still to run all place below / above the pair.
+
+    Args:
+        first_df (DataFrame): Results of the completed round, with 'Name' and 'Rank'.
+        second_df (DataFrame, optional): Results of the round in progress so far.
+        running_orders_df (DataFrame, optional): Running order of the round in progress,
+            with 'Name' and 'Withdrawn'.
+        second_eliminations (list, optional): Names eliminated in the round in progress.
+        cutoff (int, optional): Number of pairs that make the final. Defaults to FINAL_CUTOFF.
+
+    Returns:
+        DataFrame: One row per pair still in contention, columns `REQUIREMENT_COLUMNS`.
+            'Outlook' is one of:
+            - 'safe': through whatever the pairs still to run do
+            - 'in': inside the cut-off now, but could still be pushed out
+            - 'needs place': still to run, needs `Required_Place` or better
+            - 'out': can no longer make the cut-off on points
+    """
+    first_names = first_df["Name"].to_numpy()
+    first_ranks = first_df["Rank"].to_numpy(dtype=np.int64)
+
+    if second_df is not None and len(second_df):
+        second_ranks = pd.Series(second_df["Rank"].to_numpy(dtype=np.int64), index=second_df["Name"])
+        second_ranks = second_ranks[~second_ranks.index.duplicated()]
+    else:
+        second_ranks = pd.Series(dtype=np.int64)
+    ran_second = pd.Index(second_ranks.index)
+
+    ran = ran_second.get_indexer(first_names) >= 0
+    out_of_round = np.isin(first_names, list(second_eliminations))
+    to_run = ~ran & ~out_of_round
+    to_come = None  # runners still to come in the second round, including pairs out of the final
+    if running_orders_df is not None and len(running_orders_df):
+        running = running_orders_df["Name"]
+        if "Withdrawn" in running_orders_df.columns:
+            running = running[running_orders_df["Withdrawn"] != "Yes"]
+        running = running.to_numpy()
+        to_run &= np.isin(first_names, running)
+        to_come = int((~np.isin(running, ran_second) & ~np.isin(running, list(second_eliminations))).sum())
+
+    # Current standings: pairs placed in both rounds
+    ran_names = first_names[ran]
+    ran_first = first_ranks[ran]
+    ran_second_ranks = second_ranks.reindex(ran_names).to_numpy(dtype=np.int64)
+    ran_points = ran_first + ran_second_ranks
+    remaining_first = first_ranks[to_run]
+    n_ran, n_remaining = len(ran_names), int(to_run.sum())
+    n_placed = len(second_ranks)  # places taken in the second round, also by pairs out of the final
+    if to_come is None:
+        to_come = n_remaining
+
+    sorted_points = np.sort(ran_points)
+    # Pairs with fewer points than each placed pair, i.e. its position in the standings
+    position = np.searchsorted(sorted_points, ran_points, side="left") + 1
+    # Worst case every runner still to come beats them in the second round
+    ran_worst = ran_points + to_come
+    threats = np.searchsorted(sorted_points, ran_worst, side="right") - 1  # others on or below the worst case
+    threats += np.searchsorted(np.sort(remaining_first), ran_worst - 1, side="right")  # pairs still to run that could reach it
+    ran_outlook = np.where(threats < cutoff, "safe", np.where(position <= cutoff, "in", "out"))
+
+    required = _required_places(remaining_first, ran_points, ran_second_ranks, n_placed, cutoff)
+    remaining_outlook = np.where(required > 0, "needs place", "out")
+
+    ran_rows = pd.DataFrame({
+        "Name": ran_names, "Rank_first": ran_first, "Rank_second": ran_second_ranks,
+        "Points": ran_points, "Best_Points": ran_points, "Worst_Points": ran_worst,
+        "Position": position, "Required_Place": pd.NA, "Outlook": ran_outlook,
+    })
+    remaining_rows = pd.DataFrame({
+        "Name": first_names[to_run], "Rank_first": remaining_first, "Rank_second": pd.NA,
+        "Points": pd.NA, "Best_Points": remaining_first + 1, "Worst_Points": remaining_first + n_placed + to_come,
+        "Position": pd.NA, "Required_Place": required, "Outlook": remaining_outlook,
+    })
+    frames = [df for df in (ran_rows, remaining_rows) if len(df)]
+    if not frames:
+        return pd.DataFrame(columns=REQUIREMENT_COLUMNS)
+    result = pd.concat(frames, ignore_index=True)
+    result = result.sort_values(["Best_Points", "Rank_first"], kind="stable").reset_index(drop=True)
+    logger.log(TRACE, "Requirements: %s placed, %s still to run, cut-off %s", n_ran, n_remaining, cutoff)
+    return result[REQUIREMENT_COLUMNS]
+
+def _required_places(remaining_first, ran_points, ran_second, n_placed, cutoff):
+    """
+    Lowest second round place that keeps each pair still to run within the cut-off.
+
+    For every possible place p (1 to `n_placed` + 1) the standings after inserting a pair at
+    p are `ran_points + (ran_second >= p)`. Their cumulative histogram gives, for any
+    points total, how many pairs are on or below it, so every pair and every place is
+    answered with one lookup into a (places x points) table.
+    """
+    if not len(remaining_first):
+        return np.zeros(0, dtype=np.int64)
+    places = np.arange(1, n_placed + 2)
+    max_points = int(remaining_first.max()) + len(places) + 1
+    if len(ran_points):
+        max_points = max(max_points, int(ran_points.max()) + 2)
+        shifted = ran_points[None, :] + (ran_second[None, :] >= places[:, None])
+        width = max_points + 1
+        cells = (np.arange(len(places))[:, None] * width + shifted).ravel()
+        counts = np.bincount(cells, minlength=len(places) * width).reshape(len(places), width)
+        at_or_below = np.cumsum(counts, axis=1)
+    else:
+        at_or_below = np.zeros((len(places), max_points + 1), dtype=np.int64)
+
+    totals = remaining_first[:, None] + places[None, :]  # points of each pair at each place
+    ahead = at_or_below[np.arange(len(places))[None, :], totals]
+    # Pairs ahead only grow with the place, so the qualifying places are a prefix
+    return (ahead < cutoff).sum(axis=1)
@@ -0,0 +1,59 @@
+"""Pairs still to run in a class in progress, from its running order and the results so far."""
+import numpy as np
+import pandas as pd
+from .constants import SECONDS_PER_RUN
+from .debug_logger import get_logger, TRACE
+
+logger = get_logger(__name__)
+
+QUEUE_COLUMNS = ["Name", "R/O", "Queue_Position", "ETA_Seconds"]
+
+def still_to_run(running_orders_df, results_df=None, eliminations=(), eta=None):
+    """
+    Work out which pairs of the running order are still to run, in the order they are expected to.
+
+    A pair has run once it is in the results or the eliminations; withdrawn pairs never run.
+    Pairs after the furthest running order number that has run come first, in running
+    order. Pairs before it that haven't run yet (e.g. clashing with another ring) are
+    expected at the end of the class, so they are queued last.
+
+    Args:
+        running_orders_df (DataFrame): Running order of the class, with 'R/O', 'Name' and 'Withdrawn'.
+        results_df (DataFrame, optional): Results of the class so far, with 'Name'.
+        eliminations (list, optional): Names eliminated in the class so far.
+        eta (callable, optional): Seconds until the runs at an array of queue positions
+            (1 = next) are expected, e.g. `RunRateEstimator.eta`. Defaults to
+            SECONDS_PER_RUN per position.
+
+    Returns:
+        DataFrame: One row per pair still to run, columns `QUEUE_COLUMNS`. 'ETA_Seconds' is
+            the expected time until the pair runs, from the latest results.
+    """
+    if running_orders_df is None or not len(running_orders_df):
+        return pd.DataFrame(columns=QUEUE_COLUMNS)
+
+    names = running_orders_df["Name"].to_numpy(dtype=object)
+    running_order = pd.to_numeric(running_orders_df["R/O"], errors="coerce").to_numpy()
+    running_order = np.where(np.isnan(running_order), np.arange(1, len(names) + 1), running_order).astype(np.int64)
+
+    ran_names = [] if results_df is None else results_df["Name"].tolist()
+    # A name can be listed twice, e.g. in both the results and the eliminations
+    ran = np.isin(names, np.asarray(ran_names + list(eliminations), dtype=object))
+    waiting = ~ran
+    if "Withdrawn" in running_orders_df.columns:
+        waiting &= (running_orders_df["Withdrawn"] != "Yes").to_numpy()
+
+    last_ran = running_order[ran].max() if ran.any() else 0
+    skipped = running_order <= last_ran
+    # Pairs after the last runner first, then the skipped ones, each in running order
+    order = np.lexsort((running_order, skipped))
+    order = order[waiting[order]]
+    positions = np.arange(1, len(order) + 1)
+
+    logger.log(TRACE, "%s of %s pairs still to run, %s skipped", len(order), len(names), int((waiting & skipped).sum()))
+    return pd.DataFrame({
+        "Name": names[order],
+        "R/O": running_order[order],
+        "Queue_Position": positions,
+        "ETA_Seconds": eta(positions) if eta is not None else positions * float(SECONDS_PER_RUN),
+    })
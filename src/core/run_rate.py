@@ -0,0 +1,138 @@
+"""Observed run rate of classes in progress, from the results that appear between refreshes."""
+import threading
+import time
+from collections import OrderedDict, deque
+import numpy as np
+from .constants import RUN_RATE_WINDOW, RUN_RATE_IDLE_TIMEOUT, SECONDS_PER_RUN
+from .debug_logger import get_logger, TRACE
+
+logger = get_logger(__name__)
+
+class RunRateEstimator:
+    """
+    Rolling runs-per-minute of one class.
+
+    Plaza only shows the standings, not when each run happened, so a run is timed by the
+    refresh in which its result (or elimination) first appears. The rate is taken over
+    the appearances of the last `window` seconds. The results already there at the first
+    observation only seed the names seen, their run times are unknown.
+    """
+    def __init__(self, window=RUN_RATE_WINDOW):
+        self.window = window
+        self.seen = set()  # names with a result or elimination so far
+        self.appearances = deque()  # (time.monotonic(), new runs) of each observation that found new runs
+        self.started = False
+
+    def observe(self, names, now=None):
+        """
+        Record the names with a result or elimination at this refresh.
+
+        Args:
+            names (iterable): Names in the results and eliminations of the class.
+            now (float, optional): time.monotonic() of the refresh.
+
+        Returns:
+            int: Number of runs that appeared since the previous observation.
+        """
+        now = time.monotonic() if now is None else now
+        new = set(names) - self.seen
+        self.seen |= new
+        if not self.started:
+            self.started = True
+            return 0
+        if new:
+            self.appearances.append((now, len(new)))
+        while len(self.appearances) > 2 and now - self.appearances[0][0] > self.window:
+            self.appearances.popleft()
+        return len(new)
+
+    @property
+    def last_run(self):
+        """time.monotonic() of the latest observation that found new runs, or None."""
+        return self.appearances[-1][0] if self.appearances else None
+
+    def runs_per_minute(self):
+        """Runs per minute over the window, or None until runs have appeared in two refreshes."""
+        if len(self.appearances) < 2:
+            return None
+        elapsed = self.appearances[-1][0] - self.appearances[0][0]
+        if elapsed <= 0:
+            return None
+        # Runs of the first appearance happened before the window started
+        runs = sum(count for _, count in self.appearances) - self.appearances[0][1]
+        return runs * 60 / elapsed
+
+    def seconds_per_run(self, default=SECONDS_PER_RUN):
+        """Average seconds between runs, `default` until a rate has been observed."""
+        rate = self.runs_per_minute()
+        return 60 / rate if rate else default
+
+    def next_run_in(self, now=None):
+        """Seconds until the next result is expected, 0 if it is already due, None before any run was timed."""
+        if self.last_run is None:
+            return None
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.last_run + self.seconds_per_run() - now)
+
+    def eta(self, positions, now=None):
+        """
+        Seconds until the runs `positions` places down the queue are expected, counted from the latest run.
+
+        Args:
+            positions (int | array): 1 for the next run; the number of pairs still to run
+                gives when the class is expected to finish.
+            now (float, optional): time.monotonic() to count from.
+
+        Returns:
+            float | ndarray: Seconds for each position, 0 if already due.
+        """
+        now = time.monotonic() if now is None else now
+        start = self.last_run if self.last_run is not None else now
+        return np.maximum(0.0, start + np.asarray(positions) * self.seconds_per_run() - now)
+
+class RunRates:
+    """
+    Run rate estimators of every class seen in progress, keyed by class ID.
+
+    Estimators of classes that haven't been refreshed for `idle_timeout` seconds (abandoned,
+    or their pair is no longer viewed) are dropped, as are those of completed classes.
+    """
+    def __init__(self, idle_timeout=RUN_RATE_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._estimators = OrderedDict()  # classID -> (estimator, time.monotonic() of last use), oldest use first
+        self._lock = threading.Lock()
+
+    def get(self, classID):
+        """Estimator of a class, created on first use."""
+        now = time.monotonic()
+        with self._lock:
+            while self._estimators:
+                oldest, (_, used) = next(iter(self._estimators.items()))
+                if now - used <= self.idle_timeout:
+                    break
+                del self._estimators[oldest]
+                logger.debug("Forgot the run rate of idle class %s", oldest)
+            estimator = self._estimators.pop(classID, (None, None))[0]
+            if estimator is None:
+                estimator = RunRateEstimator()
+            self._estimators[classID] = (estimator, now)
+            return estimator
+
+    def observe(self, classID, results_df, eliminations, now=None):
+        """Feed the parsed results of a class to its estimator, see `RunRateEstimator.observe`."""
+        names = list(eliminations)
+        if results_df is not None:
+            names += results_df["Name"].tolist()
+        new = self.get(classID).observe(names, now=now)
+        if new:
+            logger.log(TRACE, "%s new runs in class %s", new, classID)
+        return new
+
+    def discard(self, classID):
+        """Forget a class, e.g. once it is completed."""
+        with self._lock:
+            self._estimators.pop(classID, None)
+
+
+# Global run rates - shared by every request in the process
+run_rates = RunRates()
@@ -0,0 +1,124 @@
+"""Catalogue of every class on a Plaza show page, built in one pass over its links."""
+import re
+import lxml.html
+from .constants import PLAZA_BASE, HEIGHTS, HEIGHT_NAMES
+from .models import ClassInfo
+from .debug_logger import get_logger, TRACE
+
+logger = get_logger(__name__)
+
+# Class pages linked from a show page: results, or running orders before/while a class runs
+_CLASS_LINK = re.compile(r"/agilityClass/(\d+)/(results|running_orders)")
+_HEIGHTS = {height.lower(): height for height in HEIGHTS}
+_HEIGHT_ALIASES = {**_HEIGHTS, **{name.lower(): height for height, name in HEIGHT_NAMES.items()}}
+_CLASS_TYPES = ("Agility", "Jumping", "Final")
+
+def canonical_height(height):
+    """
+    The `HEIGHTS` spelling of a height in any case, e.g. "lge" or "Large" -> "Lge".
+
+    Raises:
+        ValueError: If it isn't a height.
+    """
+    canonical = _HEIGHT_ALIASES.get(str(height).strip().lower())
+    if canonical is None:
+        raise ValueError(f"Height must be one of these: {HEIGHTS}.")
+    return canonical
+
+def parse_class_name(text):
+    """
+    Split a class name as listed on a show page, e.g. "61a Lge Championship Agility".
+
+    Returns:
+        dict: 'number' ("61a"), 'height' ("Lge"), 'type' ("Agility", "Jumping", "Final") and
+            'grade' (the rest of the name, "Championship"). Parts that aren't in the name are None.
+    """
+    words = text.split()
+    number = words.pop(0) if words and words[0][0].isdigit() else None
+    height = next((_HEIGHTS[word.lower()] for word in words if word.lower() in _HEIGHTS), None)
+    class_type = next((word for word in words if word in _CLASS_TYPES), None)
+    grade = " ".join(word for word in words if word != height and word != class_type)
+    return {"number": number, "height": height, "type": class_type, "grade": grade or None}
+
+class ShowCatalogue:
+    """
+    Every class of one show, indexed by class ID and by height.
+
+    Each entry is a dict with the class 'id', listed 'name', the parts of
+    `parse_class_name`, and its 'results_url' / 'running_orders_url' (None until Plaza
+    links it).
+    """
+    def __init__(self, links):
+        """
+        Args:
+            links (iterable): (href, link text) of the links on the show page.
+        """
+        self.classes = {}  # class ID -> entry
+        for href, text in links:
+            match = _CLASS_LINK.search(href or "")
+            if match is None:
+                continue
+            classID, page = match.groups()
+            name = " ".join(text.split())
+            entry = self.classes.get(classID)
+            if entry is None:
+                entry = self.classes[classID] = {
+                    "id": classID, "name": name, **parse_class_name(name),
+                    "results_url": None, "running_orders_url": None,
+                }
+            entry[f"{page}_url"] = f"{PLAZA_BASE}/agilityClass/{classID}/{page}"
+
+        self.by_height = {}  # height -> entries, in page order
+        for entry in self.classes.values():
+            self.by_height.setdefault(entry["height"], []).append(entry)
+        logger.log(TRACE, "Catalogued %s classes", len(self.classes))
+
+    @classmethod
+    def from_html(cls, content):
+        """Catalogue of a show page's HTML."""
+        document = lxml.html.fromstring(content)
+        return cls((a.get("href"), a.text_content()) for a in document.iter("a"))
+
+    @classmethod
+    def from_soup(cls, soup):
+        """Catalogue of a show page already parsed with BeautifulSoup."""
+        return cls((a.get("href"), a.get_text(" ")) for a in soup.find_all("a", href=True))
+
+    def __len__(self):
+        return len(self.classes)
+
+    def champ_classes(self, height):
+        """
+        The championship agility and jumping classes of a height.
+
+        Args:
+            height (str): The height category, e.g. 'Lge', 'Int', 'Med', 'Sml'.
+
+        Returns:
+            tuple: A tuple containing two ClassInfo objects (agility_class, jumping_class),
+                with status and order set.
+
+        Raises:
+            ValueError: If the height isn't valid or the show has no championship class for it.
+        """
+        height = canonical_height(height)
+
+        agility_class = ClassInfo("agility")
+        jumping_class = ClassInfo("jumping")
+        found_classes = 0
+        for entry in self.by_height.get(height, []):
+            if entry["type"] not in ("Agility", "Jumping") or "Championship" not in (entry["grade"] or ""):
+                continue
+            show_class = agility_class if entry["type"] == "Agility" else jumping_class
+            show_class.class_number = entry["number"]
+            show_class.results_url = entry["results_url"]
+            show_class.running_orders_url = entry["running_orders_url"]
+            show_class.classID = entry["id"]
+            found_classes += 1
+
+        if found_classes == 0:
+            raise ValueError(f"No championship class found for height '{height}'.")
+        agility_class.update_status()
+        jumping_class.update_status()
+        agility_class.update_order(jumping_class)
+        return agility_class, jumping_class
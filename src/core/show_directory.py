@@ -0,0 +1,167 @@
+"""Persistent index of the shows listed on the agilityplaza.com results page of each year."""
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urljoin
+from .constants import PLAZA_RESULTS as base_url, CACHE_DIR, SHOW_INDEX_REFRESH, SHOW_INDEX_GRACE, SHOW_MATCH_THRESHOLD
+from .debug_logger import get_logger
+from .show_matcher import ShowMatcher, normalize
+
+logger = get_logger(__name__)
+
+MONTHS = ["January", "February", "March", "April", "May", "June", "July",
+          "August", "September", "October", "November", "December"]
+
+def _month_rows(thead):
+    """The show rows listed under a month heading, up to the next heading."""
+    rows = []
+    for sibling in thead.find_next_siblings():
+        if sibling.name == "thead":
+            break
+        if sibling.name == "tr":
+            rows.append(sibling)
+        elif sibling.name == "tbody":
+            rows.extend(sibling.find_all("tr"))
+    return rows
+
+def parse_year_page(soup):
+    """
+    Parse the results page of a year into {month name: [show entry]}.
+
+    Each show entry is a dict with the listed 'name', its normalised 'key', the 'date'
+    text of the row and the competition 'url'.
+    """
+    months = {}
+    for thead in soup.find_all("thead"):
+        heading = thead.get_text()
+        month = next((m for m in MONTHS if m in heading), None)
+        if month is None:
+            continue
+        entries = []
+        for row in _month_rows(thead):
+            columns = row.find_all("td")
+            link = row.get("data-href")
+            if len(columns) < 2 or not link:
+                continue
+            name = columns[1].get_text(strip=True)
+            entries.append({
+                "name": name,
+                "key": normalize(name),
+                "date": columns[0].get_text(strip=True),
+                "url": urljoin(base_url, link),
+            })
+        months[month] = entries
+    return months
+
+class ShowDirectory:
+    """
+    Index of one year's shows on Plaza: month -> shows, with an exact-match map of
+    normalised show names to competition URLs.
+
+    Built from one download of the year page and saved to `CACHE_DIR`, so shows that
+    are already indexed resolve without any upstream request. Months that ended more
+    than `SHOW_INDEX_GRACE` seconds ago never change; the others (shows late in a month
+    are often posted after it ends) are re-read from a fresh download at most every
+    `SHOW_INDEX_REFRESH` seconds when a show can't be found.
+    """
+    def __init__(self, year, cache_dir=CACHE_DIR):
+        self.year = int(year)
+        self.path = os.path.join(cache_dir, f"show_index_{self.year}.json")
+        self.months = {}  # month name -> list of show entries
+        self.fetched_at = 0.0  # time.time() of the last download
+        self._by_key = {}  # (month name, normalised name) -> url
+        self._matchers = {}  # month name -> ShowMatcher of the month's show names, built on first fuzzy lookup
+        self._lock = threading.Lock()
+        self.load()
+
+    def _reindex(self):
+        self._by_key = {(month, entry["key"]): entry["url"]
+                        for month, entries in self.months.items() for entry in entries}
+        self._matchers = {}
+
+    def load(self):
+        """Load the index saved on disk, if there is one."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        self.months = saved.get("months", {})
+        self.fetched_at = saved.get("fetched_at", 0.0)
+        self._reindex()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"year": self.year, "fetched_at": self.fetched_at, "months": self.months}, f)
+        os.replace(tmp_path, self.path)
+
+    def _open_months(self):
+        """Months whose listings can still change: those that ended less than `SHOW_INDEX_GRACE` seconds ago or later."""
+        since = datetime.now() - timedelta(seconds=SHOW_INDEX_GRACE)
+        return {month for number, month in enumerate(MONTHS, 1)
+                if datetime(self.year + number // 12, number % 12 + 1, 1) > since}
+
+    def needs_refresh(self, month):
+        """Whether downloading the year page again could find new shows in `month`, at most every `SHOW_INDEX_REFRESH` seconds."""
+        if not self.fetched_at:
+            return True
+        return month in self._open_months() and time.time() - self.fetched_at > SHOW_INDEX_REFRESH
+
+    def update(self, soup):
+        """Merge a freshly downloaded year page into the index and save it."""
+        with self._lock:
+            parsed = parse_year_page(soup)
+            open_months = self._open_months()
+            for month, entries in parsed.items():
+                # Months past the grace period are final, keep what is already indexed for them
+                if month in open_months or month not in self.months:
+                    self.months[month] = entries
+            self.fetched_at = time.time()
+            self._reindex()
+            self.save()
+            logger.debug("Indexed %s shows for %s", sum(len(e) for e in self.months.values()), self.year)
+
+    def find(self, show_name, month):
+        """
+        Look up the competition URL of a show in a month.
+
+        Exact (or abbreviation) matches are a dictionary lookup. Otherwise the best
+        `ShowMatcher` match of the month's shows is used, if it scores `SHOW_MATCH_THRESHOLD`.
+
+        Returns:
+            str | None: URL of the show, or None if it isn't indexed.
+
+        Raises:
+            KeyError: If the month isn't indexed at all.
+        """
+        entries = self.months[month]
+        url = self._by_key.get((month, normalize(show_name)))
+        if url:
+            logger.debug("Found exact/abbreviation match for: %s", show_name)
+            return url
+
+        matcher = self._matchers.get(month)
+        if matcher is None:
+            matcher = self._matchers[month] = ShowMatcher([entry["name"] for entry in entries])
+        match = matcher.best(show_name, threshold=SHOW_MATCH_THRESHOLD)
+        if match is None:
+            return None
+        index, name, score = match
+        logger.debug("Found close match: %s (score %.2f)", name, score)
+        return entries[index]["url"]
+
+_directories = {}  # year -> ShowDirectory
+_directories_lock = threading.Lock()
+
+def get_show_directory(year):
+    """Return the shared ShowDirectory of a year, loading it from disk on first use."""
+    year = int(year)
+    with _directories_lock:
+        directory = _directories.get(year)
+        if directory is None:
+            directory = _directories[year] = ShowDirectory(year)
+    return directory
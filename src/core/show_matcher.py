@@ -0,0 +1,130 @@
+"""Batched fuzzy matching of show names, e.g. Kennel Club calendar names against Plaza listings."""
+import re
+import numpy as np
+from .constants import REMOVED_WORDS, SHOW_ABBREVIATIONS
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_REMOVED = {token for word in REMOVED_WORDS for token in _TOKEN.findall(word.lower())}
+
+def normalize(name):
+    """Lower-case, stripped show name, with known long names replaced by their abbreviation."""
+    name = name.strip().lower()
+    return SHOW_ABBREVIATIONS.get(name, name)
+
+def tokens(name):
+    """Distinctive words of a show name: `normalize`d, punctuation dropped and `REMOVED_WORDS` stripped."""
+    return {token for token in _TOKEN.findall(normalize(name)) if token not in _REMOVED}
+
+def trigrams(name):
+    """Character trigrams of the `normalize`d name, padded so short names still have some."""
+    padded = f"  {normalize(name)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class _Postings:
+    """Inverted index of feature -> candidate indices, stored as two flat numpy arrays."""
+    def __init__(self, feature_sets):
+        self.vocab = {}
+        features, owners = [], []
+        for index, feature_set in enumerate(feature_sets):
+            for feature in feature_set:
+                features.append(self.vocab.setdefault(feature, len(self.vocab)))
+                owners.append(index)
+        features = np.asarray(features, dtype=np.int64)
+        order = np.argsort(features, kind="stable")
+        self.owners = np.asarray(owners, dtype=np.int64)[order]
+        self.starts = np.searchsorted(features[order], np.arange(len(self.vocab) + 1))
+        self.sizes = np.fromiter((len(s) for s in feature_sets), dtype=np.int64, count=len(feature_sets))
+
+    def overlap(self, feature_set, n):
+        """Number of features of `feature_set` shared with each of the `n` candidates."""
+        ids = [self.vocab[f] for f in feature_set if f in self.vocab]
+        if not ids:
+            return np.zeros(n, dtype=np.int64)
+        owners = np.concatenate([self.owners[self.starts[i]:self.starts[i + 1]] for i in ids])
+        return np.bincount(owners, minlength=n)
+
+class ShowMatcher:
+    """
+    Scores a show name against a fixed list of candidate names in one pass.
+
+    Candidates are normalised, tokenised and split into trigrams once, into inverted
+    indexes. Scoring a target then counts the shared trigrams and words of every
+    candidate with a `np.bincount`, instead of running `difflib` candidate by candidate.
+
+    Scores are between 0 and 1:
+        - 1.0 only for an exact or abbreviation match
+        - at least 0.9 when one lower-cased name contains the other
+        - otherwise the larger of the trigram Dice similarity of the names and the
+          Jaccard similarity of their distinctive words (see `tokens`), at most 0.99
+    """
+    SUBSTRING_SCORE = 0.9
+    MAX_FUZZY_SCORE = 0.99
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.keys = [normalize(name) for name in self.names]
+        self._lowered = [name.strip().lower() for name in self.names]
+        self._exact = {}
+        for index, key in enumerate(self.keys):
+            self._exact.setdefault(key, index)
+        self._trigrams = _Postings([trigrams(name) for name in self.names])
+        self._tokens = _Postings([tokens(name) for name in self.names])
+
+    def __len__(self):
+        return len(self.names)
+
+    def scores(self, target):
+        """
+        Similarity of `target` to every candidate.
+
+        Returns:
+            np.ndarray: float scores, in the order of the candidate names.
+        """
+        n = len(self.names)
+        if not n:
+            return np.zeros(0)
+        target_trigrams = trigrams(target)
+        shared = self._trigrams.overlap(target_trigrams, n)
+        scores = 2 * shared / (len(target_trigrams) + self._trigrams.sizes)
+
+        target_tokens = tokens(target)
+        if target_tokens:
+            shared = self._tokens.overlap(target_tokens, n)
+            union = len(target_tokens) + self._tokens.sizes - shared
+            np.maximum(scores, shared / np.maximum(union, 1), out=scores)
+
+        lowered = target.strip().lower()
+        if lowered:
+            contains = np.fromiter(((lowered in other) or (other in lowered) for other in self._lowered), dtype=bool, count=n)
+            scores[contains] = np.maximum(scores[contains], self.SUBSTRING_SCORE)
+        np.minimum(scores, self.MAX_FUZZY_SCORE, out=scores)
+        exact = self._exact.get(normalize(target))
+        if exact is not None:
+            scores[exact] = 1.0
+        return scores
+
+    def rank(self, target, threshold=0.0, limit=None):
+        """
+        Candidates ranked by similarity to `target`, best first.
+
+        Args:
+            target (str): Show name to look for.
+            threshold (float, optional): Minimum score to include. Defaults to 0.0.
+            limit (int, optional): Maximum number of matches to return. Defaults to all.
+
+        Returns:
+            list: (candidate index, candidate name, score) tuples. Equal scores keep candidate order.
+        """
+        scores = self.scores(target)
+        order = np.argsort(-scores, kind="stable")
+        order = order[scores[order] >= threshold][:limit]
+        return [(int(i), self.names[i], float(scores[i])) for i in order]
+
+    def best(self, target, threshold=0.7):
+        """The best (candidate index, candidate name, score) for `target`, or None if nothing scores `threshold`."""
+        ranked = self.rank(target, threshold=threshold, limit=1)
+        return ranked[0] if ranked else None
+
+def similarity(target, candidate):
+    """`ShowMatcher` score of a single pair of names."""
+    return float(ShowMatcher([candidate]).scores(target)[0])
@@ -0,0 +1,54 @@
+"""Fast extraction of the main table of a Plaza results or running orders page using lxml."""
+import lxml.html
+from .debug_logger import get_logger, TRACE
+
+logger = get_logger(__name__)
+
+# All cells of the full-width rows of a table, in document order
+_ROW_CELLS = ".//tr[count(td) = $width]/td"
+
+def extract_table(content):
+    """
+    Extract the first table of an HTML page into column arrays.
+
+    Rows are grouped by width: rows with the most cells are the data rows, and a narrower
+    last row (the "Eliminated : ..." row of a results table) is returned separately as the
+    footer. Any other narrower rows (e.g. the course time line in the table head) are skipped.
+
+    Args:
+        content (bytes | str): HTML of the page.
+
+    Returns:
+        tuple: (headers, columns, footer) containing:
+            - headers: list of the text of every `th` in the table
+            - columns: list of column arrays, one list of cell texts per column
+            - footer: list of cell texts of the narrower last row, or None if there isn't one
+
+    Raises:
+        ValueError: If the page has no table or the table has no data rows.
+    """
+    document = lxml.html.fromstring(content)
+    table = document.find(".//table")
+    if table is None:
+        raise ValueError("No HTML table found in the results page. "
+                         "The page structure may have changed or the URL may be incorrect.")
+
+    headers = [th.text_content().strip() for th in table.iter("th")]
+
+    rows = table.xpath(".//tr[td]")
+    if not rows:
+        raise ValueError("Table has no data rows (tr elements with td cells).")
+    widths = [len(row.findall("td")) for row in rows]
+    width = max(widths)
+
+    footer = None
+    if widths[-1] < width:
+        footer = [td.text_content().strip() for td in rows[-1].findall("td")]
+    skipped = sum(1 for w in widths[:-1] if w < width)
+    if skipped:
+        logger.log(TRACE, "Skipped %s narrower rows in table", skipped)
+
+    # One XPath call for every data cell, then slice the flat list into columns
+    cells = [td.text_content().strip() for td in table.xpath(_ROW_CELLS, width=width)]
+    columns = [cells[i::width] for i in range(width)]
+    return headers, columns, footer
@@ -0,0 +1,198 @@
+"""Persistent inverted index of handler and dog name tokens over the archived championship runs."""
+import os
+import time
+import pandas as pd
+from src.core.constants import CACHE_DIR, NAME_SEARCH_LIMIT
+from src.core.debug_logger import get_logger, TRACE
+from src.io.sqlite import sqlite_connection
+from src.core.name_tokens import name_tokens, pair_tokens, split_names
+from src.core.show_catalogue import canonical_height
+
+logger = get_logger(__name__)
+
+SEARCH_COLUMNS = ["Date", "Show", "Height", "Class_Type", "Class_ID", "Name", "Rank", "Entries", "Faults", "Time", "Eliminated"]
+FIELDS = ("handler", "dog")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    class_id TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    height TEXT NOT NULL,
+    show TEXT,
+    date TEXT NOT NULL,
+    class_type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    rank INTEGER,
+    entries INTEGER NOT NULL,
+    faults REAL,
+    time REAL,
+    eliminated INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_class ON runs (class_id);
+CREATE TABLE IF NOT EXISTS postings (
+    token TEXT NOT NULL,
+    field TEXT NOT NULL,
+    run_id INTEGER NOT NULL,
+    PRIMARY KEY (token, field, run_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS indexed_classes (
+    class_id TEXT PRIMARY KEY,
+    indexed_at REAL NOT NULL
+);
+"""
+
+def _prefix_range(token):
+    """(low, high) bounds of the tokens starting with `token`, for a range scan of the postings."""
+    return token, token + "\uffff"
+
+class NameIndex:
+    """
+    Handler and dog tokens of every archived run, each pointing to its postings: show,
+    class, rank, faults and time. Kept in one SQLite file under `CACHE_DIR`.
+
+    Postings are clustered by token, so a prefix query ("sus" for "Sushi") is a range scan
+    of the matching tokens, however many runs are indexed. Classes are added as they are
+    archived (`add_runs`), and `sync` catches up with classes archived before the index
+    existed. Every call opens its own connection, see `sqlite_connection`.
+    """
+    def __init__(self, path=None):
+        self.path = path or os.path.join(CACHE_DIR, "name_index.sqlite")
+
+    def _connect(self):
+        """Connection in a transaction, see `sqlite_connection`."""
+        return sqlite_connection(self.path, _SCHEMA)
+
+    def indexed_classes(self):
+        """Class IDs already in the index."""
+        with self._connect() as connection:
+            return {row[0] for row in connection.execute("SELECT class_id FROM indexed_classes")}
+
+    def add_runs(self, runs):
+        """
+        Index the runs of one or more archived classes, replacing any earlier postings of them.
+
+        Args:
+            runs (DataFrame): Every run of the classes, with the archive columns (see
+                `ResultsArchive.read` and `class_runs`).
+
+        Returns:
+            int: Number of runs indexed.
+        """
+        if runs.empty:
+            return 0
+        runs = runs.reset_index(drop=True)
+        classIDs = runs["class_id"].astype(str).unique().tolist()
+        entries = runs.groupby("class_id")["name"].transform("size")
+        tokens = pair_tokens(runs["name"], runs["kc_name"])
+        rank = runs["rank"].astype("float64")
+        rows = list(zip(
+            runs["class_id"].astype(str), runs["season"].astype(int), runs["height"], runs["show"],
+            pd.to_datetime(runs["date"]).dt.strftime("%Y-%m-%d"), runs["class_type"], runs["name"],
+            [None if pd.isna(r) else int(r) for r in rank], entries.astype(int),
+            [None if pd.isna(f) else float(f) for f in runs["faults"]],
+            [None if pd.isna(t) else float(t) for t in runs["time"]],
+            runs["eliminated"].astype(int),
+        ))
+        now = time.time()
+        with self._connect() as connection:
+            self._delete(connection, classIDs)
+            postings = []
+            for row, (handler, dog) in zip(rows, tokens):
+                run_id = connection.execute("INSERT INTO runs VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row).lastrowid
+                postings.extend((token, "handler", run_id) for token in handler)
+                postings.extend((token, "dog", run_id) for token in dog)
+            connection.executemany("INSERT OR IGNORE INTO postings VALUES (?, ?, ?)", postings)
+            connection.executemany("INSERT OR REPLACE INTO indexed_classes VALUES (?, ?)", [(c, now) for c in classIDs])
+        logger.debug("Indexed %s runs (%s postings) of %s classes", len(rows), len(postings), len(classIDs))
+        return len(rows)
+
+    def _delete(self, connection, classIDs):
+        marks = ",".join("?" * len(classIDs))
+        connection.execute(
+            f"DELETE FROM postings WHERE run_id IN (SELECT run_id FROM runs WHERE class_id IN ({marks}))", classIDs
+        )
+        connection.execute(f"DELETE FROM runs WHERE class_id IN ({marks})", classIDs)
+        connection.execute(f"DELETE FROM indexed_classes WHERE class_id IN ({marks})", classIDs)
+
+    def sync(self, archive):
+        """
+        Index the classes of a `ResultsArchive` that aren't in the index yet.
+
+        Returns:
+            int: Number of classes added.
+        """
+        missing = archive.class_ids() - self.indexed_classes()
+        if not missing:
+            return 0
+        runs = archive.read(class_ids=sorted(missing))
+        self.add_runs(runs)
+        logger.debug("Synced %s archived classes into the name index", len(missing))
+        return len(missing)
+
+    def search(self, query, season=None, height=None, field=None, limit=NAME_SEARCH_LIMIT):
+        """
+        Runs whose handler or dog matches every word of `query`, each word as a prefix.
+
+        e.g. "glover sus" matches "Max Glover & Sushi", and "soldaze" matches Sushi by her
+        registered name.
+
+        Args:
+            query (str): Words of the handler and / or dog name, in any order.
+            season (int, optional): Year of the shows.
+            height (str, optional): Height in any case, e.g. 'Lge' or 'lge'.
+            field (str, optional): Only match "handler" or "dog" tokens.
+            limit (int, optional): Most runs returned, newest first.
+
+        Returns:
+            DataFrame: Columns `SEARCH_COLUMNS`.
+
+        Raises:
+            ValueError: If the query has no searchable words, or `height` or `field` isn't valid.
+        """
+        words = name_tokens(query)
+        if not words:
+            raise ValueError("Search needs at least one letter or digit")
+        if field is not None and field not in FIELDS:
+            raise ValueError(f"field must be one of {list(FIELDS)}")
+
+        conditions, params = [], []
+        for word in dict.fromkeys(words):
+            low, high = _prefix_range(word)
+            field_clause = " AND field = ?" if field else ""
+            conditions.append(f"run_id IN (SELECT run_id FROM postings WHERE token >= ? AND token < ?{field_clause})")
+            params += [low, high] + ([field] if field else [])
+        if season is not None:
+            conditions.append("season = ?")
+            params.append(int(season))
+        if height is not None:
+            conditions.append("height = ?")
+            params.append(canonical_height(height))
+        sql = (
+            "SELECT date, show, height, class_type, class_id, name, rank, entries, faults, time, eliminated FROM runs "
+            f"WHERE {' AND '.join(conditions)} ORDER BY date DESC, class_type DESC, rank LIMIT ?"
+        )
+        start = time.perf_counter()
+        with self._connect() as connection:
+            rows = connection.execute(sql, params + [int(limit)]).fetchall()
+        logger.log(TRACE, "Name search %r: %s runs in %.1f ms", query, len(rows), (time.perf_counter() - start) * 1000)
+        results = pd.DataFrame(rows, columns=SEARCH_COLUMNS)
+        results["Rank"] = results["Rank"].astype("Int64")
+        results["Eliminated"] = results["Eliminated"].astype(bool)
+        return results
+
+    @staticmethod
+    def pairs(results):
+        """Distinct pairs of search results with their number of runs, most runs first."""
+        if results.empty:
+            return []
+        counts = results.groupby("Name", sort=False).size().sort_values(ascending=False, kind="stable")
+        parts = split_names(pd.Series(counts.index))
+        return [
+            {"name": name, "handler": handler, "dog": dog, "runs": int(runs)}
+            for name, handler, dog, runs in zip(counts.index, parts["Handler"], parts["Dog"], counts)
+        ]
+
+
+# Global name index - shared by every request in the process
+name_index = NameIndex()
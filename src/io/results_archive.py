@@ -0,0 +1,182 @@
+"""Parquet archive of completed championship classes, partitioned by season and height."""
+import glob
+import os
+import threading
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from src.core.constants import CACHE_DIR
+from src.core.debug_logger import get_logger, TRACE
+from src.core.show_catalogue import canonical_height
+
+logger = get_logger(__name__)
+
+# One row per run (or elimination) of an archived class; season and height are in the file path
+ARCHIVE_SCHEMA = pa.schema([
+    ("show", pa.string()),
+    ("date", pa.date32()),
+    ("class_id", pa.string()),
+    ("class_type", pa.string()),
+    ("results_url", pa.string()),
+    ("rank", pa.int32()),
+    ("name", pa.string()),
+    ("kc_name", pa.string()),
+    ("faults", pa.float64()),
+    ("time", pa.float64()),
+    ("eliminated", pa.bool_()),
+    ("archived_at", pa.timestamp("s")),
+])
+_PARTITIONING = ds.partitioning(pa.schema([("season", pa.int32()), ("height", pa.string())]), flavor="hive")
+ARCHIVE_COLUMNS = ["season", "height", *ARCHIVE_SCHEMA.names]
+
+def class_table(meta, results):
+    """
+    Rows of one completed class in the archive schema.
+
+    Args:
+        meta (dict): 'show', 'date', 'class_id', 'class_type' and 'results_url' of the class.
+        results (tuple): (results_df, eliminations, status) as returned by `import_results`.
+
+    Returns:
+        pyarrow.Table: Placed runs in rank order, then the eliminations (no rank, faults or time).
+    """
+    results_df, eliminations, _ = results
+    placed = len(results_df) if results_df is not None else 0
+    rows = placed + len(eliminations)
+    columns = {
+        "show": [meta["show"]] * rows,
+        "date": [pd.Timestamp(meta["date"]).date()] * rows,
+        "class_id": [str(meta["class_id"])] * rows,
+        "class_type": [meta["class_type"]] * rows,
+        "results_url": [meta.get("results_url")] * rows,
+        "rank": [None] * rows,
+        "name": list(eliminations),
+        "kc_name": [None] * rows,
+        "faults": [None] * rows,
+        "time": [None] * rows,
+        "eliminated": [False] * placed + [True] * len(eliminations),
+        "archived_at": [pd.Timestamp(time.time(), unit="s").floor("s")] * rows,
+    }
+    if placed:
+        columns["rank"] = results_df["Rank"].tolist() + [None] * len(eliminations)
+        columns["name"] = results_df["Name"].tolist() + list(eliminations)
+        columns["kc_name"] = results_df["KC names"].tolist() + [None] * len(eliminations)
+        columns["faults"] = results_df["Faults"].tolist() + [None] * len(eliminations)
+        columns["time"] = results_df["Time"].tolist() + [None] * len(eliminations)
+    return pa.Table.from_pydict(columns, schema=ARCHIVE_SCHEMA)
+
+def class_runs(meta, results):
+    """Rows of one completed class as a DataFrame with `ARCHIVE_COLUMNS`, as `ResultsArchive.read` returns them."""
+    runs = class_table(meta, results).to_pandas()
+    runs.insert(0, "season", pd.Timestamp(meta["date"]).year)
+    runs.insert(1, "height", canonical_height(meta["height"]))
+    runs["rank"] = runs["rank"].astype("Int64")
+    return runs[ARCHIVE_COLUMNS]
+
+class ResultsArchive:
+    """
+    Results of every completed championship class, kept as Parquet files under `CACHE_DIR/archive`.
+
+    Each class is one file, `season=<year>/height=<height>/<class ID>.parquet`, so a query
+    for a season and height only reads that partition. A class is written once; results
+    of a completed class don't change. Writes go to a temporary file first, so a reader
+    never sees half a class.
+    """
+    def __init__(self, root=None):
+        self.root = root or os.path.join(CACHE_DIR, "archive")
+        self._archived = None  # class IDs in the archive, listed on first use
+        self._lock = threading.Lock()
+
+    def _class_ids(self):
+        if self._archived is None:
+            paths = glob.glob(os.path.join(self.root, "season=*", "height=*", "*.parquet"))
+            self._archived = {os.path.splitext(os.path.basename(path))[0] for path in paths}
+        return self._archived
+
+    def has(self, classID):
+        """Whether a class is already archived."""
+        with self._lock:
+            return str(classID) in self._class_ids()
+
+    def class_ids(self):
+        """IDs of every archived class."""
+        with self._lock:
+            return set(self._class_ids())
+
+    def archive_class(self, meta, results):
+        """
+        Archive the results of a completed class, if it isn't archived yet.
+
+        Args:
+            meta (dict): 'show', 'date', 'height', 'class_id', 'class_type' and optionally
+                'results_url' of the class.
+            results (tuple): (results_df, eliminations, status) as returned by `import_results`.
+
+        Returns:
+            bool: True if the class was written, False if it was already archived.
+
+        Raises:
+            ValueError: If the class isn't completed.
+        """
+        if results[2] != "completed":
+            raise ValueError(f"Class {meta['class_id']} is {results[2]}, only completed classes are archived")
+        classID = str(meta["class_id"])
+        with self._lock:
+            if classID in self._class_ids():
+                return False
+            season = pd.Timestamp(meta["date"]).year
+            # Heights from callers or from state saved before they were made canonical can have any case
+            directory = os.path.join(self.root, f"season={season}", f"height={canonical_height(meta['height'])}")
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{classID}.parquet")
+            # Dot files are skipped by dataset discovery, see `read`
+            tmp_path = os.path.join(directory, f".{classID}.parquet.tmp")
+            pq.write_table(class_table(meta, results), tmp_path)
+            os.replace(tmp_path, path)
+            self._archived.add(classID)
+        logger.debug("Archived class %s (%s %s %s)", classID, meta["show"], canonical_height(meta["height"]), meta["class_type"])
+        return True
+
+    def read(self, season=None, height=None, show=None, class_type=None, class_ids=None):
+        """
+        Archived runs matching the filters, read from the matching partitions only.
+
+        Args:
+            season (int, optional): Year of the shows.
+            height (str, optional): Height in any case, e.g. 'Lge' or 'lge'.
+            show (str, optional): Show name, as matched from the calendar (case-insensitive).
+            class_type (str, optional): "Agility" or "Jumping".
+            class_ids (list, optional): Only these classes.
+
+        Returns:
+            DataFrame: Columns `ARCHIVE_COLUMNS`, one row per run or elimination.
+        """
+        if not os.path.isdir(self.root):
+            return pd.DataFrame(columns=ARCHIVE_COLUMNS)
+        dataset = ds.dataset(self.root, format="parquet", partitioning=_PARTITIONING,
+                             schema=pa.unify_schemas([ARCHIVE_SCHEMA, _PARTITIONING.schema]))
+        conditions = []
+        if season is not None:
+            conditions.append(ds.field("season") == int(season))
+        if height is not None:
+            conditions.append(ds.field("height") == canonical_height(height))
+        if show is not None:
+            conditions.append(ds.field("show") == show.strip().lower())
+        if class_type is not None:
+            conditions.append(ds.field("class_type") == class_type.capitalize())
+        if class_ids is not None:
+            conditions.append(ds.field("class_id").isin([str(classID) for classID in class_ids]))
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        table = dataset.to_table(filter=expression)
+        logger.log(TRACE, "Read %s archived runs (season=%s, height=%s, show=%s)", table.num_rows, season, height, show)
+        df = table.to_pandas()
+        df["rank"] = df["rank"].astype("Int64")
+        return df[ARCHIVE_COLUMNS]
+
+
+# Global results archive - shared by every request in the process
+results_archive = ResultsArchive()
@@ -0,0 +1,146 @@
+"""SQLite store of parsed class results and resolved class IDs, so a restarted app starts warm."""
+import json
+import os
+import time
+import pandas as pd
+from src.core.constants import CACHE_DIR, SNAPSHOT_MAX_AGE
+from src.core.debug_logger import get_logger, TRACE
+from src.io.sqlite import sqlite_connection
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS class_results (
+    class_id TEXT PRIMARY KEY,
+    results_url TEXT,
+    status TEXT NOT NULL,
+    eliminations TEXT NOT NULL,
+    results TEXT NOT NULL,
+    saved_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS class_ids (
+    show TEXT NOT NULL,
+    date TEXT NOT NULL,
+    height TEXT NOT NULL,
+    agility_id TEXT NOT NULL,
+    jumping_id TEXT NOT NULL,
+    saved_at REAL NOT NULL,
+    PRIMARY KEY (show, date, height)
+);
+"""
+
+def frame_to_json(df):
+    """Encode a results DataFrame with its dtypes, see `frame_from_json`."""
+    return json.dumps({
+        "columns": df.columns.tolist(),
+        "dtypes": [str(dtype) for dtype in df.dtypes],
+        "data": df.values.tolist(),
+    })
+
+def frame_from_json(text):
+    """Decode a DataFrame encoded by `frame_to_json`, with the same column dtypes."""
+    saved = json.loads(text)
+    df = pd.DataFrame(saved["data"], columns=saved["columns"])
+    return df.astype(dict(zip(saved["columns"], saved["dtypes"])))
+
+class SnapshotStore:
+    """
+    Parsed results of each class (results, eliminations, status) and the class IDs
+    resolved for each show and height, kept in one SQLite file under `CACHE_DIR`.
+
+    Every call opens its own connection, so the store can be used from worker threads.
+    The file is created on first use.
+    """
+    def __init__(self, path=None):
+        self.path = path or os.path.join(CACHE_DIR, "snapshots.sqlite")
+
+    def _connect(self):
+        """Connection in a transaction, see `sqlite_connection`."""
+        return sqlite_connection(self.path, _SCHEMA)
+
+    def save_results(self, classID, results, results_url=None):
+        """
+        Store the parsed results of a class, replacing the previous ones.
+
+        Args:
+            classID (str): Plaza class ID.
+            results (tuple): (results_df, eliminations, status) as returned by `import_results`.
+            results_url (str, optional): URL the results were fetched from.
+        """
+        results_df, eliminations, status = results
+        row = (classID, results_url, status, json.dumps(list(eliminations)), frame_to_json(results_df), time.time())
+        with self._connect() as connection:
+            connection.execute("INSERT OR REPLACE INTO class_results VALUES (?, ?, ?, ?, ?, ?)", row)
+        logger.log(TRACE, "Saved %s results of class %s", status, classID)
+
+    def load_results(self, max_age=SNAPSHOT_MAX_AGE):
+        """
+        Stored results saved within the last `max_age` seconds.
+
+        Returns:
+            dict: class ID -> (saved_at, (results_df, eliminations, status))
+        """
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT class_id, status, eliminations, results, saved_at FROM class_results WHERE saved_at >= ?",
+                (time.time() - max_age,),
+            ).fetchall()
+        loaded = {}
+        for classID, status, eliminations, results, saved_at in rows:
+            try:
+                loaded[classID] = (saved_at, (frame_from_json(results), json.loads(eliminations), status))
+            except (ValueError, TypeError, KeyError) as e:
+                logger.warning("Skipping unreadable stored results of class %s: %s", classID, e)
+        return loaded
+
+    def save_class_ids(self, show, date, height, agilityID, jumpingID):
+        """Store the championship class IDs found for a show and height."""
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO class_ids VALUES (?, ?, ?, ?, ?, ?)",
+                (show, str(date), height, agilityID, jumpingID, time.time()),
+            )
+
+    def class_ids(self, show, date, height):
+        """
+        Class IDs stored for a show and height.
+
+        Returns:
+            tuple | None: (agilityID, jumpingID), or None if they haven't been resolved yet.
+        """
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT agility_id, jumping_id FROM class_ids WHERE show = ? AND date = ? AND height = ?",
+                (show, str(date), height),
+            ).fetchone()
+        return row
+
+    def class_meta(self, classID):
+        """
+        Show, date and height a class ID was resolved for by `save_class_ids`.
+
+        Returns:
+            dict | None: 'show', 'date' (as stored), 'height' and 'class_type' ("Agility" or
+                "Jumping"), or None if the class wasn't looked up through a show.
+        """
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT show, date, height, agility_id FROM class_ids WHERE agility_id = ? OR jumping_id = ? "
+                "ORDER BY saved_at DESC LIMIT 1",
+                (classID, classID),
+            ).fetchone()
+        if row is None:
+            return None
+        show, date, height, agilityID = row
+        return {"show": show, "date": date, "height": height, "class_type": "Agility" if agilityID == classID else "Jumping"}
+
+    def prune(self, max_age=SNAPSHOT_MAX_AGE):
+        """Delete stored results older than `max_age` seconds."""
+        with self._connect() as connection:
+            deleted = connection.execute("DELETE FROM class_results WHERE saved_at < ?", (time.time() - max_age,)).rowcount
+        if deleted:
+            logger.debug("Pruned %s stored class results", deleted)
+
+
+# Global snapshot store - shared by every request in the process
+snapshot_store = SnapshotStore()
@@ -0,0 +1,32 @@
+"""Connections to the local SQLite stores, see `snapshot_store.py` and `name_index.py`."""
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+_ready = set()  # paths whose schema has been created in this process
+_ready_lock = threading.Lock()
+
+@contextmanager
+def sqlite_connection(path, schema):
+    """
+    Connection to the SQLite file at `path` in a transaction, committed on success and closed after.
+
+    The file and `schema` (CREATE ... IF NOT EXISTS statements) are created on first use
+    in the process. Every call opens its own connection, so it can be used from worker threads.
+    """
+    with _ready_lock:
+        if path not in _ready:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            connection = sqlite3.connect(path)
+            try:
+                connection.executescript(schema)
+            finally:
+                connection.close()
+            _ready.add(path)
+    connection = sqlite3.connect(path, timeout=5)
+    try:
+        with connection:
+            yield connection
+    finally:
+        connection.close()